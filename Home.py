@@ -1,6 +1,7 @@
 
+import io
+
 import streamlit as st
-from PIL import Image, ImageOps
 from sidebar import sidebar_menu
 
 
@@ -19,6 +20,23 @@ st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
 menu_choice = sidebar_menu()
 
+# Largura máxima da foto exibida (a coluna ocupa 1/3 da página)
+PROFILE_PHOTO_WIDTH = 900
+
+
+@st.cache_data
+def profile_photo(path=r"assets/perfil.jpg", width=PROFILE_PHOTO_WIDTH):
+    # A foto original tem ~3000 px: é girada (EXIF), reduzida e recomprimida
+    # uma única vez por processo, em vez de a cada visita
+    from PIL import Image, ImageOps
+
+    img = ImageOps.exif_transpose(Image.open(path))
+    img.thumbnail((width, width * 4))
+    buffer = io.BytesIO()
+    img.convert("RGB").save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
 def home_page():
     st.title("Bem-vindo(a) ao Meu Perfil Profissional!")
     st.markdown("---")
@@ -48,9 +66,7 @@ def home_page():
         """)
     
     with col2:
-        img = Image.open(r"assets/perfil.jpg")
-        img = ImageOps.exif_transpose(img)
-        st.image(img, use_container_width=True)
+        st.image(profile_photo(), use_container_width=True)
     
     st.markdown("---")
     
@@ -0,0 +1,3 @@
+"""
+Camada de dados e análises compartilhada pelas páginas do dashboard.
+"""
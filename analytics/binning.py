@@ -0,0 +1,124 @@
+"""
+Agregações no servidor para histogramas e box plots.
+
+Em vez de enviar todos os pontos para o navegador, os gráficos recebem apenas
+as contagens por faixa (histograma) ou os quartis, cercas e uma amostra
+limitada de outliers (box plot). O tamanho do gráfico passa a não depender do
+número de linhas. Gráficos de dispersão viram uma grade de densidade 2D sobre
+todos os pontos, com uma amostra estratificada e reprodutível por cima.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Máximo de outliers desenhados por caixa (amostra reprodutível)
+MAX_OUTLIERS = 200
+# Pontos desenhados sobre a grade de densidade
+SCATTER_SAMPLE = 1000
+
+
+@dataclass(frozen=True)
+class Histogram:
+    edges: np.ndarray
+    counts: np.ndarray
+
+
+@dataclass(frozen=True)
+class Density2D:
+    x_edges: np.ndarray
+    y_edges: np.ndarray
+    counts: np.ndarray  # (faixas de y, faixas de x), como o z de um heatmap
+    n: int
+
+
+@dataclass(frozen=True)
+class BoxStats:
+    q1: float
+    median: float
+    q3: float
+    mean: float
+    lowerfence: float
+    upperfence: float
+    outliers: np.ndarray
+    n: int
+    n_outliers: int
+
+
+def histogram(values, nbins=50):
+    counts, edges = np.histogram(np.asarray(values), bins=nbins)
+    return Histogram(edges, counts)
+
+
+def box_stats(values, max_outliers=MAX_OUTLIERS, seed=0):
+    """
+    Quartis (interpolação linear, como o Plotly), cercas de Tukey e amostra
+    de outliers
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return BoxStats(*([np.nan] * 6), outliers=np.empty(0), n=0, n_outliers=0)
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low_limit, high_limit = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = (values >= low_limit) & (values <= high_limit)
+    # As cercas são o menor/maior valor observado dentro dos limites
+    lowerfence = values[inside].min() if inside.any() else q1
+    upperfence = values[inside].max() if inside.any() else q3
+
+    outliers = values[~inside]
+    n_outliers = len(outliers)
+    if n_outliers > max_outliers:
+        rng = np.random.default_rng(seed)
+        outliers = rng.choice(outliers, max_outliers, replace=False)
+    return BoxStats(q1, median, q3, values.mean(), lowerfence, upperfence, outliers, len(values), n_outliers)
+
+
+def grouped_box_stats(df, group_col, value_col, max_outliers=MAX_OUTLIERS):
+    """
+    BoxStats por categoria, separando os grupos com uma única ordenação
+    """
+    codes, uniques = pd.factorize(df[group_col])
+    values = df[value_col].to_numpy()
+    # Linhas sem categoria (código -1) ficam de fora, como no groupby
+    valid = codes >= 0
+    codes, values = codes[valid], values[valid]
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.searchsorted(codes[order], np.arange(1, len(uniques)))
+    groups = np.split(values[order], boundaries)
+    return {label: box_stats(group, max_outliers) for label, group in zip(uniques, groups)}
+
+
+def density_grid(x, y, bins=(60, 40)):
+    """
+    Contagem de pontos por célula de uma grade regular sobre todos os pontos
+    (sem amostragem)
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return Density2D(x_edges, y_edges, counts.T.astype(np.int64), len(x))
+
+
+def stratified_sample(df, by, n=SCATTER_SAMPLE, seed=0):
+    """
+    Até `n` linhas com a mesma proporção de cada categoria de `by` (ao menos
+    uma por categoria presente), sempre as mesmas para os mesmos dados e
+    semente; as linhas mantêm a ordem original
+    """
+    if len(df) <= n:
+        return df
+    codes, uniques = pd.factorize(df[by])
+    valid = codes >= 0
+    counts = np.bincount(codes[valid], minlength=len(uniques))
+    quota = np.maximum(np.floor(counts * n / counts.sum()), counts > 0).astype(np.int64)
+
+    # Ordem aleatória dentro de cada categoria: fica a primeira `quota` de cada uma
+    rng = np.random.default_rng(seed)
+    positions = np.flatnonzero(valid)
+    order = np.lexsort((rng.random(len(positions)), codes[positions]))
+    grouped = codes[positions][order]
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(len(order)) - starts[grouped]
+    keep = np.sort(positions[order[rank < quota[grouped]]])
+    return df.iloc[keep]
@@ -0,0 +1,51 @@
+"""
+Tabelas de preço e duração por categoria (aba 3 da página de análise).
+"""
+import pandas as pd
+
+from analytics.parallel import run_tasks
+
+# Tabelas da aba 3: coluna de agrupamento -> inclui a antecedência média
+CATEGORY_TABLES = {"airline": True, "class": False, "stops": False}
+# Colunas com mediana nas tabelas (sketches por categoria, ver category_sketches)
+CATEGORY_MEDIAN_COLUMNS = ["price", "duration"]
+
+
+def _median(cube, sketches, col, by, index):
+    if sketches is None:
+        return cube.median(col, by)
+    by_label = sketches[(by, col)]
+    return pd.Series([float(by_label[label].quantile(0.5)) for label in index], index=index)
+
+
+def category_stats(cube, by, with_days_left=False, sketches=None):
+    """
+    Tabela de preço/duração por categoria a partir do cubo de agregados. As
+    medianas (aproximadas) saem dos t-digests por categoria em `sketches`
+    (resultado de category_sketches) ou, sem eles, do histograma do cubo
+    """
+    rolled = cube.rollup(by)
+    table = pd.DataFrame({
+        'Preço Médio': rolled['price_mean'],
+        'Preço Mediano': _median(cube, sketches, 'price', by, rolled.index),
+        'Preço DP': rolled['price_std'],
+        'Qtd Voos': rolled['count'],
+        'Duração Média': rolled['duration_mean'],
+        'Duração Mediana': _median(cube, sketches, 'duration', by, rolled.index),
+    })
+    if with_days_left:
+        table['Dias Antecedência'] = rolled['days_left_mean']
+    return table.round(2)
+
+
+def category_tables(cube, mode=None, sketches=None):
+    """
+    As tabelas da aba 3, calculadas em paralelo a partir do mesmo cubo
+    """
+    return run_tasks(
+        {
+            by: (category_stats, cube, by, with_days_left, sketches)
+            for by, with_days_left in CATEGORY_TABLES.items()
+        },
+        mode,
+    )
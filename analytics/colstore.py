@@ -0,0 +1,105 @@
+"""
+Armazenamento colunar mapeado em memória.
+
+Cada coluna do DataFrame é gravada como um arquivo .npy: as numéricas com o
+próprio dtype e as categóricas como códigos inteiros, com as categorias no
+manifesto. Ao abrir, os arquivos são mapeados com np.load(mmap_mode="r") e
+o DataFrame é montado sobre esses arrays sem cópia. Todas as sessões e todos
+os processos do mesmo host compartilham as mesmas páginas do cache do
+sistema operacional, e as colunas são somente leitura: qualquer tentativa de
+escrita levanta ValueError em vez de alterar os dados compartilhados.
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = "manifest.json"
+
+
+def source_key(path):
+    """
+    Identificação barata da versão do arquivo de origem (tamanho e mtime),
+    usada para nomear o diretório do armazenamento
+    """
+    stat = Path(path).stat()
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def _column_path(directory, position):
+    return Path(directory) / f"{position:03d}.npy"
+
+
+def write_store(df, directory, fingerprint):
+    """
+    Grava as colunas em `directory`. A gravação ocorre num diretório temporário
+    renomeado no final; se outro processo terminar primeiro, a cópia dele é
+    mantida
+    """
+    directory = Path(directory)
+    tmp_dir = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    entries = []
+    for position, col in enumerate(df.columns):
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            np.save(_column_path(tmp_dir, position), series.cat.codes.to_numpy())
+            entries.append({
+                "name": col,
+                "kind": "category",
+                "categories": series.cat.categories.tolist(),
+                "ordered": bool(series.cat.ordered),
+            })
+        else:
+            np.save(_column_path(tmp_dir, position), series.to_numpy())
+            entries.append({"name": col, "kind": "values"})
+    manifest = {"fingerprint": fingerprint, "rows": len(df), "columns": entries}
+    (tmp_dir / MANIFEST_FILE).write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        # Diretório já criado por outro processo com os mesmos dados
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def open_store(directory):
+    """
+    DataFrame somente leitura sobre os arquivos mapeados e o fingerprint
+    gravado no manifesto; None se o armazenamento não existir
+    """
+    directory = Path(directory)
+    try:
+        manifest = json.loads((directory / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    # Arquivos vazios não podem ser mapeados
+    mmap_mode = "r" if manifest["rows"] else None
+    columns = {}
+    for position, entry in enumerate(manifest["columns"]):
+        values = np.load(_column_path(directory, position), mmap_mode=mmap_mode)
+        if entry["kind"] == "category":
+            dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+            # Códigos gravados a partir de um Categorical válido: dispensa a validação
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        columns[entry["name"]] = values
+    return pd.DataFrame(columns, copy=False), manifest["fingerprint"]
+
+
+def remove_stale(parent, keep):
+    """
+    Remove versões antigas; processos que ainda as mapeiam continuam lendo
+    os arquivos já abertos
+    """
+    parent = Path(parent)
+    if not parent.exists():
+        return
+    for path in parent.iterdir():
+        if path.is_dir() and path.name != keep and not path.name.startswith("."):
+            shutil.rmtree(path, ignore_errors=True)
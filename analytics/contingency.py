@@ -0,0 +1,78 @@
+"""
+Tabelas de contingência de uma categoria contra faixas de um valor numérico.
+
+As faixas são obtidas com np.searchsorted sobre os limites e os pares
+(categoria, faixa) são contados com um único np.bincount sobre códigos
+combinados, sem copiar o DataFrame nem criar colunas temporárias.
+"""
+import numpy as np
+import pandas as pd
+
+from analytics.grouped import group_codes
+
+
+def bin_codes(values, edges):
+    """
+    Índice da faixa (a, b] de cada valor, como pd.cut; -1 fora dos limites
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    codes = np.searchsorted(edges, values, side="left") - 1
+    codes[(codes < 0) | (codes >= len(edges) - 1)] = -1
+    return codes
+
+
+def interval_labels(edges):
+    def fmt(x):
+        return "∞" if np.isinf(x) else f"{x:g}"
+    return [f"({fmt(a)}, {fmt(b)}]" for a, b in zip(edges[:-1], edges[1:])]
+
+
+def parse_edges(text):
+    """
+    Limites informados como texto ("0, 5000, 15000, inf"), estritamente crescentes
+    """
+    try:
+        edges = tuple(float(part) for part in text.replace(";", ",").split(",") if part.strip())
+    except ValueError:
+        raise ValueError("Use números separados por vírgula (ex.: 0, 5000, 15000, inf)")
+    if len(edges) < 3:
+        raise ValueError("Informe pelo menos três limites (duas faixas)")
+    # NaN passaria na comparação abaixo (toda comparação com NaN é falsa);
+    # infinitos só valem nas pontas: -inf no início, inf no fim
+    inner_finite = all(np.isfinite(edge) for edge in edges[1:-1])
+    if not (inner_finite and (np.isfinite(edges[0]) or edges[0] == -np.inf)
+            and (np.isfinite(edges[-1]) or edges[-1] == np.inf)):
+        raise ValueError("Limites inválidos: use números finitos, com -inf só no início e inf só no fim")
+    if any(b <= a for a, b in zip(edges[:-1], edges[1:])):
+        raise ValueError("Os limites devem ser estritamente crescentes")
+    return edges
+
+
+def contingency_table(df, row_col, value_col, edges, labels=None):
+    """
+    Contagem de linhas por categoria de `row_col` × faixa de `value_col`
+    """
+    row_codes, row_labels = group_codes(df, row_col)
+    col_codes = bin_codes(df[value_col].to_numpy(), edges)
+    n_cols = len(edges) - 1
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    counts = np.bincount(
+        row_codes[valid] * n_cols + col_codes[valid],
+        minlength=len(row_labels) * n_cols,
+    ).reshape(len(row_labels), n_cols)
+    columns = pd.Index(labels or interval_labels(edges), name=f"{value_col}_range")
+    return pd.DataFrame(counts, index=row_labels, columns=columns)
+
+
+def chi_square(table):
+    """
+    Qui-quadrado de independência; linhas e colunas vazias são descartadas
+    (frequência esperada zero invalidaria o teste)
+    """
+    table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+    if min(table.shape) < 2:
+        raise ValueError("São necessárias ao menos duas categorias e duas faixas com observações")
+    from scipy.stats import chi2_contingency
+
+    chi2_stat, p_value, dof, expected = chi2_contingency(table)
+    return table, chi2_stat, p_value, dof, expected
@@ -0,0 +1,411 @@
+"""
+Cubo de agregados pré-calculados para as tabelas e gráficos do dashboard.
+
+Cada célula do cubo corresponde a uma combinação de companhia × rota ×
+classe × paradas × horário de partida e guarda estatísticas suficientes
+(contagem, soma, soma dos quadrados, mínimo e máximo) de preço e duração,
+além das somas da antecedência. Visões filtradas são respondidas somando
+células, sem voltar às linhas brutas. Medianas e outros quantis são
+aproximados por um histograma esparso (balde × célula) em escala
+logarítmica, que também pode ser somado.
+
+A antecedência (days_left, ~50 valores) não é dimensão do cubo principal:
+multiplicaria as células por ~20 (quase uma célula por linha). O perfil de
+preço por antecedência sai de um cubo à parte, só com as colunas filtráveis
+(days_left_cube). Filtros de preço e duração cortam linhas dentro das
+células; nesse caso os agregados saem das próprias linhas filtradas
+(RowAggregates), sem montar um cubo para cada seleção.
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from analytics.filters import CATEGORY_FILTER_COLUMNS, FilterIndex, FlightFilters
+
+CUBE_DIMENSIONS = [
+    "airline", "source_city", "destination_city", "class",
+    "stops", "departure_time",
+]
+CUBE_MEASURES = ["price", "duration"]
+
+# Perfil por antecedência: só as dimensões que os filtros cortam
+DAYS_LEFT_DIMENSIONS = [*CATEGORY_FILTER_COLUMNS, "days_left"]
+
+# Colunas numéricas com somas por célula (antecedência média e correlação
+# com as medidas), sejam ou não dimensões do cubo
+NUMERIC_COLUMNS = ["days_left"]
+
+SKETCH_BINS = 256
+
+
+def _sketch_edges(values, bins):
+    low, high = float(values.min()), float(values.max())
+    if high <= low:
+        return np.array([low, low + 1.0])
+    if low > 0:
+        return np.geomspace(low, high, bins + 1)
+    return np.linspace(low, high, bins + 1)
+
+
+def _bin_of(values, edges):
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+class AggregateCube:
+    """
+    Estatísticas suficientes por célula e histogramas para quantis aproximados
+    """
+
+    def __init__(self, cells, sketches, edges, bounds, dimensions):
+        self.cells = cells
+        self.sketches = sketches
+        self.edges = edges
+        self.bounds = bounds
+        self.dimensions = dimensions
+
+    # Índices das células montados só quando usados (um cubo atualizado por
+    # merge pode nunca ser consultado antes da próxima atualização)
+    @property
+    def measures(self):
+        return list(self.bounds)
+
+    @cached_property
+    def _index(self):
+        return FilterIndex(
+            self.cells,
+            category_columns=[d for d in self.dimensions if d in CATEGORY_FILTER_COLUMNS],
+            range_columns=[],
+        )
+
+    @cached_property
+    def cell_keys(self):
+        return pd.MultiIndex.from_frame(self.cells[self.dimensions])
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES, bins=SKETCH_BINS,
+                   sketch_edges=None, quantiles=True):
+        """
+        Cubo das linhas de `df`; com quantiles=False, sem os histogramas
+        (quantile/median indisponíveis)
+        """
+        dimensions = [d for d in dimensions if d in df.columns]
+        numeric = [d for d in NUMERIC_COLUMNS if d in df.columns]
+
+        # Trabalha em float64 para que somas de quadrados não estourem int32/float32
+        values = {}
+        named_aggs = {}
+        for m in measures:
+            x = df[m].to_numpy(dtype=np.float64)
+            values[m] = x
+            values[f"{m}_sq"] = x * x
+            named_aggs.update({
+                f"{m}_sum": (m, "sum"),
+                f"{m}_sumsq": (f"{m}_sq", "sum"),
+                f"{m}_min": (m, "min"),
+                f"{m}_max": (m, "max"),
+            })
+            for d in numeric:
+                values[f"{d}_x_{m}"] = df[d].to_numpy(dtype=np.float64) * x
+                named_aggs[f"{d}_x_{m}_sum"] = (f"{d}_x_{m}", "sum")
+        for d in numeric:
+            # Nome próprio: a coluna pode também ser chave do agrupamento
+            x = df[d].to_numpy(dtype=np.float64)
+            values[f"{d}_value"] = x
+            values[f"{d}_value_sq"] = x * x
+            named_aggs[f"{d}_sum"] = (f"{d}_value", "sum")
+            named_aggs[f"{d}_sumsq"] = (f"{d}_value_sq", "sum")
+        values = pd.DataFrame(values, index=df.index)
+
+        grouped = values.groupby([df[d] for d in dimensions], observed=True, sort=False)
+        cells = grouped.agg(**named_aggs)
+        cells.insert(0, "count", grouped.size())
+        cells = cells.reset_index()
+
+        # Histograma esparso: (célula, balde) -> contagem
+        cell_ids = grouped.ngroup().to_numpy() if quantiles else None
+        sketches, edges, bounds = {}, {}, {}
+        for m in measures:
+            x = values[m].to_numpy()
+            bounds[m] = (x.min(), x.max()) if len(x) else (np.nan, np.nan)
+            if not quantiles:
+                continue
+            if sketch_edges is not None:
+                edges[m] = sketch_edges[m]
+            else:
+                edges[m] = _sketch_edges(x, bins) if len(x) else np.array([0.0, 1.0])
+            n_bins = len(edges[m]) - 1
+            keys, counts = np.unique(cell_ids * n_bins + _bin_of(x, edges[m]), return_counts=True)
+            sketches[m] = (keys // n_bins, keys % n_bins, counts)
+
+        return cls(cells, sketches, edges, bounds, dimensions)
+
+    def append(self, df):
+        """
+        Cubo com as linhas de `df` somadas: só as linhas novas são agregadas.
+        Os histogramas mantêm os baldes atuais; valores além deles caem nos
+        baldes das pontas, e os quantis seguem limitados pelo mínimo/máximo
+        """
+        if df.empty:
+            return self
+        delta = type(self).from_frame(
+            df, self.dimensions, self.measures, sketch_edges=self.edges, quantiles=bool(self.sketches),
+        )
+        return self.merge(delta)
+
+    def merge(self, other):
+        """
+        Soma dois cubos com as mesmas dimensões e baldes: células já existentes
+        são atualizadas e as novas vão para o final, sem reagrupar o cubo todo
+        """
+        if any(not np.array_equal(self.edges[m], other.edges[m]) for m in self.edges):
+            raise ValueError("Os cubos precisam usar os mesmos baldes para serem combinados")
+        dimensions = self.dimensions
+        left, right = self.cells, other.cells
+        keys = self.cell_keys
+        # Categorias novas (ex.: companhia que ainda não existia) são unidas
+        for d in dimensions:
+            if isinstance(left[d].dtype, pd.CategoricalDtype):
+                categories = left[d].cat.categories.union(right[d].cat.categories)
+                if len(categories) > len(left[d].cat.categories):
+                    left = left.assign(**{d: left[d].cat.set_categories(categories)})
+                    keys = None
+                if not right[d].cat.categories.equals(categories):
+                    right = right.assign(**{d: right[d].cat.set_categories(categories)})
+        if keys is None:
+            keys = pd.MultiIndex.from_frame(left[dimensions])
+
+        right_keys = pd.MultiIndex.from_frame(right[dimensions])
+        position = keys.get_indexer(right_keys)
+        new = position < 0
+        position[new] = len(left) + np.arange(new.sum())
+
+        # As células do outro cubo são únicas: indexação direta, sem ufunc.at
+        existing, target = ~new, position[~new]
+        columns = {}
+        for col in left.columns:
+            if col in dimensions:
+                columns[col] = pd.concat([left[col], right[col][new]], ignore_index=True)
+                continue
+            incoming = right[col].to_numpy()
+            values = np.concatenate([left[col].to_numpy(), incoming[new]])
+            if col.endswith("_min"):
+                values[target] = np.fmin(values[target], incoming[existing])
+            elif col.endswith("_max"):
+                values[target] = np.fmax(values[target], incoming[existing])
+            else:
+                values[target] += incoming[existing]
+            columns[col] = values
+        cells = pd.DataFrame(columns)
+
+        # Entradas repetidas (célula, balde) são somadas pelo bincount dos quantis
+        sketches = {}
+        for m in self.sketches:
+            a_cells, a_bins, a_counts = self.sketches[m]
+            b_cells, b_bins, b_counts = other.sketches[m]
+            sketches[m] = (
+                np.concatenate([a_cells, position[b_cells]]),
+                np.concatenate([a_bins, b_bins]),
+                np.concatenate([a_counts, b_counts]),
+            )
+
+        bounds = {
+            m: (np.fmin(self.bounds[m][0], other.bounds[m][0]), np.fmax(self.bounds[m][1], other.bounds[m][1]))
+            for m in self.bounds
+        }
+        merged = type(self)(cells, sketches, self.edges, bounds, dimensions)
+        merged.__dict__["cell_keys"] = keys.append(right_keys[new])
+        return merged
+
+    def covers(self, filters):
+        """
+        True se os filtros de intervalo não cortam nenhuma linha do cubo
+        (filtros de intervalo sobre medidas não podem ser aplicados às células)
+        """
+        for col, (low, high) in filters.ranges:
+            if col not in self.bounds:
+                return False
+            col_min, col_max = self.bounds[col]
+            if low > col_min or high < col_max:
+                return False
+        return True
+
+    def _cell_mask(self, filters):
+        if filters is None:
+            return None
+        if not self.covers(filters):
+            raise ValueError("Filtros de intervalo não podem ser respondidos pelo cubo")
+        # Os intervalos já foram validados por covers(); só as categorias cortam células
+        return self._index.mask(FlightFilters(categories=filters.categories))
+
+    def _selected_cells(self, filters):
+        mask = self._cell_mask(filters)
+        return self.cells if mask is None else self.cells[mask]
+
+    def rollup(self, by, filters=None):
+        """
+        Agrega as células pelas dimensões em `by`, retornando contagem, média,
+        desvio padrão, mínimo e máximo de cada medida
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        cells = self._selected_cells(filters)
+        sum_cols = [c for c in cells.columns if c == "count" or c.endswith(("_sum", "_sumsq"))]
+        if by:
+            grouped = cells.groupby(by, observed=True)
+            totals = grouped[sum_cols].sum()
+        else:
+            grouped = None
+            totals = cells[sum_cols].sum().to_frame().T
+
+        count = totals["count"].to_numpy(dtype=np.float64)
+        result = pd.DataFrame({"count": totals["count"].astype(np.int64)}, index=totals.index)
+        for m in self.measures:
+            s, ss = totals[f"{m}_sum"].to_numpy(), totals[f"{m}_sumsq"].to_numpy()
+            result[f"{m}_mean"] = s / count
+            with np.errstate(invalid="ignore", divide="ignore"):
+                var = np.where(count > 1, (ss - s * s / count) / (count - 1), np.nan)
+            result[f"{m}_std"] = np.sqrt(np.maximum(var, 0))
+            if grouped is not None:
+                result[f"{m}_min"] = grouped[f"{m}_min"].min()
+                result[f"{m}_max"] = grouped[f"{m}_max"].max()
+            else:
+                result[f"{m}_min"] = cells[f"{m}_min"].min()
+                result[f"{m}_max"] = cells[f"{m}_max"].max()
+        for d in NUMERIC_COLUMNS:
+            if f"{d}_sum" in totals:
+                result[f"{d}_mean"] = totals[f"{d}_sum"].to_numpy() / count
+        return result
+
+    def correlation(self, dimension, measure, filters=None):
+        """
+        Correlação de Pearson entre uma dimensão numérica e uma medida
+        """
+        totals = self._selected_cells(filters)[
+            ["count", f"{dimension}_sum", f"{dimension}_sumsq", f"{measure}_sum",
+             f"{measure}_sumsq", f"{dimension}_x_{measure}_sum"]
+        ].sum()
+        n = totals["count"]
+        if n < 2:
+            return np.nan
+        cov = totals[f"{dimension}_x_{measure}_sum"] - totals[f"{dimension}_sum"] * totals[f"{measure}_sum"] / n
+        var_d = totals[f"{dimension}_sumsq"] - totals[f"{dimension}_sum"] ** 2 / n
+        var_m = totals[f"{measure}_sumsq"] - totals[f"{measure}_sum"] ** 2 / n
+        if var_d <= 0 or var_m <= 0:
+            return np.nan
+        return cov / np.sqrt(var_d * var_m)
+
+    def quantile(self, measure, q, by, filters=None):
+        """
+        Quantil aproximado da medida por grupo, interpolado dentro do balde
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        cells = self._selected_cells(filters)
+        group_of_cell = np.full(len(self.cells), -1)
+        if by:
+            # ngroup numera os grupos na mesma ordem (ordenada) das agregações
+            grouped = cells.groupby(by, observed=True)
+            group_of_cell[cells.index.to_numpy()] = grouped.ngroup().to_numpy()
+            index = grouped.size().index
+            low_bounds = grouped[f"{measure}_min"].min().to_numpy()
+            high_bounds = grouped[f"{measure}_max"].max().to_numpy()
+        else:
+            group_of_cell[cells.index.to_numpy()] = 0
+            index = pd.RangeIndex(1)
+            low_bounds = np.array([cells[f"{measure}_min"].min()])
+            high_bounds = np.array([cells[f"{measure}_max"].max()])
+
+        n_groups = len(index)
+        edges = self.edges[measure]
+        n_bins = len(edges) - 1
+        sketch_cells, sketch_bins, sketch_counts = self.sketches[measure]
+        group = group_of_cell[sketch_cells]
+        keep = group >= 0
+        hist = np.bincount(
+            group[keep] * n_bins + sketch_bins[keep],
+            weights=sketch_counts[keep],
+            minlength=n_groups * n_bins,
+        ).reshape(n_groups, n_bins)
+
+        cumulative = hist.cumsum(axis=1)
+        target = q * cumulative[:, -1]
+        result = np.full(n_groups, np.nan)
+        for g in range(n_groups):
+            if cumulative[g, -1] == 0:
+                continue
+            b = int(np.searchsorted(cumulative[g], target[g], side="left"))
+            below = cumulative[g, b - 1] if b > 0 else 0.0
+            fraction = (target[g] - below) / hist[g, b] if hist[g, b] else 0.0
+            # Os limites do balde são restringidos ao mínimo/máximo reais do grupo
+            low = max(edges[b], low_bounds[g])
+            high = min(edges[b + 1], high_bounds[g])
+            result[g] = low + fraction * (high - low)
+        return pd.Series(result, index=index, name=f"{measure}_q{q:g}")
+
+    def median(self, measure, by, filters=None):
+        return self.quantile(measure, 0.5, by, filters)
+
+
+def days_left_cube(df, measures=CUBE_MEASURES):
+    """
+    Cubo do perfil por antecedência (colunas filtráveis × days_left), sem
+    histogramas de quantis
+    """
+    return AggregateCube.from_frame(df, DAYS_LEFT_DIMENSIONS, measures, quantiles=False)
+
+
+class RowAggregates:
+    """
+    Mesmas consultas do AggregateCube (rollup, correlation) calculadas sobre
+    linhas já filtradas, para seleções com filtros de intervalo que o cubo
+    não consegue responder
+    """
+
+    def __init__(self, df, measures=CUBE_MEASURES):
+        self.df = df
+        self.measures = [m for m in measures if m in df.columns]
+        self._numeric = [d for d in NUMERIC_COLUMNS if d in df.columns]
+        # Convertidas uma vez para float64, reaproveitadas por todos os rollups
+        self._values = pd.DataFrame(
+            {col: df[col].to_numpy(dtype=np.float64) for col in [*self.measures, *self._numeric]},
+            index=df.index,
+        )
+
+    def _check(self, filters):
+        if filters is not None:
+            raise ValueError("RowAggregates recebe as linhas já filtradas")
+
+    def rollup(self, by, filters=None):
+        self._check(filters)
+        by = [by] if isinstance(by, str) else list(by)
+        values = self._values
+        if by:
+            grouped = values.groupby([self.df[b] for b in by], observed=True)
+            means, stds = grouped.mean(), grouped.std()
+            mins, maxs = grouped[self.measures].min(), grouped[self.measures].max()
+            result = pd.DataFrame({"count": grouped.size().astype(np.int64)})
+            for m in self.measures:
+                result[f"{m}_mean"] = means[m]
+                result[f"{m}_std"] = stds[m]
+                result[f"{m}_min"] = mins[m]
+                result[f"{m}_max"] = maxs[m]
+            for d in self._numeric:
+                result[f"{d}_mean"] = means[d]
+            return result
+
+        row = {"count": np.int64(len(values))}
+        for m in self.measures:
+            x = values[m]
+            row.update({f"{m}_mean": x.mean(), f"{m}_std": x.std(), f"{m}_min": x.min(), f"{m}_max": x.max()})
+        for d in self._numeric:
+            row[f"{d}_mean"] = values[d].mean()
+        return pd.DataFrame([row])
+
+    def correlation(self, dimension, measure, filters=None):
+        self._check(filters)
+        if len(self.df) < 2:
+            return np.nan
+        x = self._values[dimension].to_numpy()
+        y = self._values[measure].to_numpy()
+        if x.std() == 0 or y.std() == 0:
+            return np.nan
+        return float(np.corrcoef(x, y)[0, 1])
@@ -0,0 +1,829 @@
+"""
+Carregamento do dataset de voos compartilhado entre as páginas.
+
+O CSV original é convertido para Parquet no primeiro uso, de modo que as
+próximas inicializações leiam um arquivo binário colunar em vez de reprocessar
+o CSV inteiro. As colunas recebem um esquema compacto (categorias e numéricos
+reduzidos) para diminuir a memória do DataFrame em cache.
+
+O DataFrame carregado é um único objeto somente leitura compartilhado por
+todas as sessões (st.cache_resource), em vez da cópia que o st.cache_data
+desserializa a cada chamada; DASHBOARD_SHARED_DATA=0 volta ao comportamento
+antigo.
+
+Com DASHBOARD_INGEST=incremental, coletas acrescentadas ao CSV (ou gravadas
+como partições na mesma pasta) são incorporadas a cada execução sem reler o
+arquivo inteiro; ver IncrementalFlights.
+
+Com DASHBOARD_STORAGE=partitioned, o dataset Parquet particionado por
+companhia e cidade de origem (ver analytics.partitioned) passa a ser a fonte
+das páginas: só o primeiro processo carrega o DataFrame para gravá-lo, os
+demais leem o fingerprint do disco e, a cada cálculo, apenas as colunas e
+linhas usadas (os filtros da aba 4 são aplicados na leitura).
+
+Com DASHBOARD_MMAP=1, as colunas são gravadas uma vez em arquivos .npy e
+mapeadas em memória: sessões e processos do mesmo host compartilham as mesmas
+páginas e recebem um DataFrame somente leitura (ver analytics.colstore).
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics.binning import (
+    SCATTER_SAMPLE, box_stats, density_grid, grouped_box_stats, histogram, stratified_sample,
+)
+from analytics.categories import CATEGORY_MEDIAN_COLUMNS, CATEGORY_TABLES, category_tables
+from analytics.colstore import open_store, remove_stale, source_key, write_store
+from analytics.cube import AggregateCube, RowAggregates, days_left_cube
+from analytics.descriptive import column_modes, variable_types
+from analytics.export import ExportCache, export_bytes
+from analytics.filters import CATEGORY_FILTER_COLUMNS, RANGE_FILTER_COLUMNS, FilterIndex
+from analytics.hypothesis import SIGNIFICANCE_LEVEL, chi_square_test, run_hypothesis_tests
+from analytics.ingest import (
+    ColumnBuffers, IngestState, SourceRewritten, read_complete_lines, read_new_rows, read_snapshot, state_at_end,
+)
+from analytics.moments import CoMoments, Moments, select_values
+from analytics.outliers import OUTLIER_METHODS, iqr_outliers
+from analytics.result_cache import DEFAULT_MAX_MB, DEFAULT_TTL, code_version, open_result_cache
+from analytics.selection import summarize_selection
+from analytics.sketches import TDigest, category_sketches, merge_category_sketches
+
+logger = logging.getLogger(__name__)
+
+CSV_PATH = Path("data") / "airlines_flights_data.csv"
+PARQUET_PATH = CSV_PATH.with_suffix(".parquet")
+
+# "1" (padrão): um DataFrame somente leitura para todas as sessões;
+# "0": cópia por chamada do st.cache_data
+SHARED_DATA_ENV = "DASHBOARD_SHARED_DATA"
+
+# "full" (padrão): o CSV é lido uma vez; "incremental": novas coletas são
+# incorporadas sem recarregar o dataset
+INGEST_ENV = "DASHBOARD_INGEST"
+# Partições com novas coletas, ao lado do CSV principal
+PARTITION_PATTERN = "airlines_flights_data_*.csv"
+# Colunas cujos momentos e sketches de quantis acompanham o cache dos dados
+INCREMENTAL_MOMENT_COLUMNS = ["duration", "days_left", "price"]
+# Versões publicadas que continuam acessíveis pelo fingerprint (a atual e a
+# anterior, para a sessão que leu o fingerprint antes de uma atualização)
+RETAINED_SNAPSHOTS = 2
+
+# "memory" (padrão): filtros da aba 4 aplicados ao DataFrame em memória;
+# "partitioned": linhas lidas do dataset particionado com os filtros na leitura
+STORAGE_ENV = "DASHBOARD_STORAGE"
+DATASET_DIR = CSV_PATH.parent / "flights_dataset"
+
+# Colunas mapeadas em memória (DASHBOARD_MMAP=1), uma pasta por versão do CSV
+MMAP_ENV = "DASHBOARD_MMAP"
+COLUMN_STORE_DIR = CSV_PATH.parent / "columns"
+
+# Cache de resultados compartilhado entre processos e réplicas: "sqlite"
+# (padrão, arquivo em data/), "sqlite:///caminho", "redis://host:porta/db" ou "off"
+RESULT_CACHE_ENV = "DASHBOARD_RESULT_CACHE"
+RESULT_CACHE_TTL_ENV = "DASHBOARD_RESULT_CACHE_TTL"
+RESULT_CACHE_MB_ENV = "DASHBOARD_RESULT_CACHE_MB"
+RESULT_CACHE_PATH = CSV_PATH.parent / "result_cache.sqlite"
+
+# Total dos arquivos de exportação guardados em memória por processo
+EXPORT_CACHE_MB = 64
+
+# Código que produz valores do cache compartilhado (análises, e as figuras
+# montadas pelas páginas e componentes): editar qualquer um invalida o cache
+APP_ROOT = Path(__file__).resolve().parent.parent
+RESULT_CACHE_SOURCES = ["analytics/*.py", "pages/*.py", "components.py"]
+
+
+# Colunas textuais de baixa cardinalidade viram categorias
+CATEGORICAL_COLUMNS = [
+    "airline", "flight", "source_city", "departure_time",
+    "stops", "arrival_time", "destination_city", "class",
+]
+
+FLIGHTS_SCHEMA = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    "days_left": "int8",
+    "duration": "float32",
+    "price": "int32",
+}
+
+# Tipos inferidos pelo read_csv, usados como referência no relatório de memória
+_CSV_DTYPES = {
+    **{col: "object" for col in CATEGORICAL_COLUMNS},
+    "days_left": "int64",
+    "duration": "float64",
+    "price": "int64",
+}
+
+
+def _fits(series, dtype):
+    # Evita overflow silencioso ao reduzir inteiros (ex.: days_left > 127)
+    if not pd.api.types.is_integer_dtype(dtype):
+        return True
+    if series.isna().any():
+        return False
+    info = np.iinfo(dtype)
+    return series.empty or (series.min() >= info.min and series.max() <= info.max)
+
+
+def apply_schema(df):
+    """
+    Converte as colunas conhecidas para o esquema compacto
+    """
+    schema = {}
+    for col, dtype in FLIGHTS_SCHEMA.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if _fits(df[col], dtype):
+            schema[col] = dtype
+        else:
+            logger.warning("Coluna %s fora do intervalo de %s; mantendo %s", col, dtype, df[col].dtype)
+    return df.astype(schema) if schema else df
+
+
+def memory_report(df):
+    """
+    Compara a memória de cada coluna no esquema compacto com os tipos que o
+    read_csv inferiria (object/int64/float64)
+    """
+    legacy = df.astype({col: dtype for col, dtype in _CSV_DTYPES.items() if col in df.columns})
+    report = pd.DataFrame({
+        "Tipo Original": legacy.dtypes.astype(str),
+        "Tipo Atual": df.dtypes.astype(str),
+        "Antes (MB)": legacy.memory_usage(deep=True, index=False) / 1024**2,
+        "Depois (MB)": df.memory_usage(deep=True, index=False) / 1024**2,
+    })
+    report.loc["Total"] = ["", "", report["Antes (MB)"].sum(), report["Depois (MB)"].sum()]
+    report["Redução (%)"] = (1 - report["Depois (MB)"] / report["Antes (MB)"]) * 100
+    return report.round(2)
+
+
+def _parquet_is_fresh(csv_path, parquet_path):
+    # O cache só vale se for mais novo que o CSV de origem
+    if not parquet_path.exists():
+        return False
+    if not csv_path.exists():
+        return True
+    return parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+
+
+def _write_parquet(df, parquet_path):
+    # Escreve em um arquivo temporário e renomeia, para que outro processo
+    # nunca leia um Parquet pela metade
+    tmp_path = parquet_path.with_name(f".{parquet_path.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+    except ImportError:
+        # pyarrow é opcional: sem ele seguimos apenas com o CSV
+        logger.warning("pyarrow não instalado; cache Parquet desativado")
+    except OSError as exc:
+        logger.warning("Não foi possível gravar o cache Parquet: %s", exc)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def read_flights(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """
+    Lê o dataset de voos, usando o cache Parquet quando ele estiver atualizado
+    """
+    csv_path, parquet_path = Path(csv_path), Path(parquet_path)
+
+    if _parquet_is_fresh(csv_path, parquet_path):
+        try:
+            return apply_schema(pd.read_parquet(parquet_path))
+        except (ImportError, OSError, ValueError) as exc:
+            logger.warning("Cache Parquet ignorado (%s); relendo o CSV", exc)
+
+    # Só linhas completas, como a ingestão incremental (ver read_complete_lines)
+    df, _, _ = read_complete_lines(csv_path)
+    before = df.memory_usage(deep=True).sum()
+    df = apply_schema(df)
+    after = df.memory_usage(deep=True).sum()
+    logger.info(
+        "Dataset carregado: %d linhas, memória %.1f MB -> %.1f MB",
+        len(df), before / 1024**2, after / 1024**2,
+    )
+
+    _write_parquet(df, parquet_path)
+    return df
+
+
+def read_only_frame(df):
+    """
+    Cópia do DataFrame com cada coluna em um array somente leitura: uma
+    escrita nos valores levanta ValueError (ou, com Copy-on-Write, copia a
+    coluna antes). Criar, remover ou renomear colunas altera o próprio
+    objeto, por isso as sessões recebem cópias rasas (ver load_data)
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy().copy()
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=series.dtype, validate=False)
+        else:
+            values = series.to_numpy().copy()
+            values.flags.writeable = False
+            columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def dataset_fingerprint(df):
+    """
+    Hash do conteúdo do DataFrame, usado como chave dos resultados em cache
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(",".join(df.columns).encode())
+    return digest.hexdigest()[:16]
+
+
+def column_sketches(df, columns=INCREMENTAL_MOMENT_COLUMNS):
+    return {col: TDigest.from_values(df[col].to_numpy()) for col in columns if col in df.columns}
+
+
+def table_sketches(df):
+    # Sketches por categoria das medianas das tabelas da aba 3
+    return category_sketches(df, list(CATEGORY_TABLES), CATEGORY_MEDIAN_COLUMNS)
+
+
+def incremental_ingest():
+    return os.environ.get(INGEST_ENV, "full") == "incremental"
+
+
+def shared_data():
+    return os.environ.get(SHARED_DATA_ENV, "1") != "0"
+
+
+def mapped_columns():
+    # No modo incremental o DataFrame muda a cada coleta e fica em memória
+    return os.environ.get(MMAP_ENV) == "1" and not incremental_ingest()
+
+
+def partitioned_storage():
+    if os.environ.get(STORAGE_ENV, "memory") != "partitioned":
+        return False
+    # pyarrow.dataset só é importado quando o modo particionado está ativo
+    from analytics.partitioned import pyarrow_available
+
+    if not pyarrow_available():
+        logger.warning("pyarrow não instalado; filtros aplicados em memória")
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class FlightsSnapshot:
+    """
+    Versão imutável do dataset: linhas, cubos, índice dos filtros, momentos,
+    sketches de quantis (por coluna e por categoria) e posição da ingestão
+    """
+    df: pd.DataFrame
+    cube: AggregateCube
+    days_cube: AggregateCube
+    filter_index: FilterIndex
+    moments: dict
+    sketches: dict
+    category_sketches: dict
+    fingerprint: str
+    state: IngestState
+
+
+class SnapshotExpired(LookupError):
+    """
+    A versão do dataset pedida já foi substituída e não está mais em memória
+    """
+
+
+class IncrementalFlights:
+    """
+    Dataset que acompanha as novas coletas. refresh() lê só as linhas novas,
+    copia-as para a folga das colunas (ColumnBuffers) e soma seus agregados
+    ao cubo, ao índice dos filtros e aos momentos; cada
+    atualização publica um novo FlightsSnapshot, então quem ainda usa o
+    anterior continua vendo uma versão consistente. As últimas versões
+    publicadas continuam acessíveis pelo fingerprint (snapshot_for)
+    """
+
+    def __init__(self, csv_path=CSV_PATH, parquet_path=PARQUET_PATH,
+                 partition_dir=CSV_PATH.parent, pattern=PARTITION_PATTERN):
+        self.csv_path = Path(csv_path)
+        self.parquet_path = Path(parquet_path)
+        self.partition_dir = partition_dir
+        self.pattern = pattern
+        self._lock = threading.Lock()
+        self._retained = OrderedDict()
+        self.snapshot = self._load_csv()
+        self._retain(self.snapshot)
+        # Partições existentes entram pelo mesmo caminho das coletas novas
+        self.refresh()
+
+    def _load_csv(self):
+        df = None
+        if _parquet_is_fresh(self.csv_path, self.parquet_path):
+            # Parquet gravado depois da última alteração do CSV: cobre as linhas
+            # completas do arquivo, as mesmas que state_at_end considera lidas
+            df = read_flights(self.csv_path, self.parquet_path)
+            state = state_at_end(self.csv_path, len(df))
+            if not _parquet_is_fresh(self.csv_path, self.parquet_path):
+                df = None  # o CSV mudou durante a leitura
+        if df is None:
+            raw, state = read_snapshot(self.csv_path)
+            df = apply_schema(raw)
+            _write_parquet(df, self.parquet_path)
+        self._columns = ColumnBuffers(df)
+        df = self._columns.frame()
+        moments = {
+            col: Moments.from_values(df[col].to_numpy())
+            for col in INCREMENTAL_MOMENT_COLUMNS if col in df.columns
+        }
+        return FlightsSnapshot(
+            df, AggregateCube.from_frame(df), days_left_cube(df), FilterIndex(df), moments,
+            column_sketches(df), table_sketches(df), dataset_fingerprint(df), state,
+        )
+
+    def _append(self, snapshot, delta, state):
+        delta = apply_schema(delta)
+        df = self._columns.append(delta)
+        delta = delta[list(snapshot.df.columns)]
+        # A versão nova é derivada da anterior: o hash só percorre as linhas novas
+        fingerprint = hashlib.sha1(
+            f"{snapshot.fingerprint}:{dataset_fingerprint(delta)}".encode()
+        ).hexdigest()[:16]
+        moments = {
+            col: m.merge(Moments.from_values(delta[col].to_numpy()))
+            for col, m in snapshot.moments.items()
+        }
+        sketches = {
+            col: sketch.merge(TDigest.from_values(delta[col].to_numpy()))
+            for col, sketch in snapshot.sketches.items()
+        }
+        return FlightsSnapshot(
+            df, snapshot.cube.append(delta), snapshot.days_cube.append(delta), snapshot.filter_index.append(df),
+            moments, sketches, merge_category_sketches(snapshot.category_sketches, table_sketches(delta)),
+            fingerprint, state,
+        )
+
+    def refresh(self):
+        """
+        Incorpora as coletas novas, se houver, e devolve o snapshot atual
+        """
+        with self._lock:
+            snapshot = self.snapshot
+            try:
+                delta, state = read_new_rows(self.csv_path, snapshot.state, self.partition_dir, self.pattern)
+            except SourceRewritten:
+                logger.warning("CSV alterado fora do final do arquivo; recarregando o dataset inteiro")
+                snapshot = self._load_csv()
+                delta, state = read_new_rows(self.csv_path, snapshot.state, self.partition_dir, self.pattern)
+            if delta is not None:
+                snapshot = self._append(snapshot, delta, state)
+                logger.info("Ingestão incremental: +%d linhas (total %d)", len(delta), len(snapshot.df))
+            elif state != snapshot.state:
+                snapshot = replace(snapshot, state=state)
+            self.snapshot = snapshot
+            self._retain(snapshot)
+            return snapshot
+
+    def _retain(self, snapshot):
+        self._retained[snapshot.fingerprint] = snapshot
+        self._retained.move_to_end(snapshot.fingerprint)
+        while len(self._retained) > RETAINED_SNAPSHOTS:
+            self._retained.popitem(last=False)
+
+    def snapshot_for(self, fingerprint):
+        """
+        Snapshot publicado com este fingerprint; SnapshotExpired se ele já
+        saiu da janela de versões mantidas
+        """
+        snapshot = self._retained.get(fingerprint)
+        if snapshot is None:
+            raise SnapshotExpired(f"Versão {fingerprint} do dataset não está mais disponível")
+        return snapshot
+
+
+# Função para carregar os dados (uma única entrada de cache para todas as páginas)
+@st.cache_resource
+def load_shared_data():
+    return read_only_frame(read_flights())
+
+
+# Modo antigo: cada chamada desserializa uma cópia nova
+@st.cache_data
+def _load_data_copy():
+    return read_flights()
+
+
+@st.cache_resource
+def load_store():
+    return IncrementalFlights()
+
+
+@st.cache_resource
+def load_mapped_data():
+    """
+    DataFrame somente leitura sobre as colunas mapeadas e seu fingerprint; o
+    primeiro processo grava as colunas, os demais apenas as mapeiam
+    """
+    source = CSV_PATH if CSV_PATH.exists() else PARQUET_PATH
+    directory = COLUMN_STORE_DIR / source_key(source)
+    opened = open_store(directory)
+    if opened is None:
+        df = read_flights()
+        write_store(df, directory, dataset_fingerprint(df))
+        remove_stale(COLUMN_STORE_DIR, keep=directory.name)
+        opened = open_store(directory)
+    return opened
+
+
+def load_data():
+    """
+    Cópia rasa do dataset atual (no modo incremental, incorpora antes as
+    coletas novas): colunas criadas, removidas ou renomeadas por uma sessão
+    ficam na sua cópia, sem copiar os dados
+    """
+    if incremental_ingest():
+        return load_store().refresh().df.copy(deep=False)
+    return current_data().copy(deep=False)
+
+
+def refresh_fingerprint():
+    """
+    Fingerprint da versão atual, lido no início de cada execução das páginas
+    (no modo incremental, depois de incorporar as coletas novas)
+    """
+    if incremental_ingest():
+        return load_store().refresh().fingerprint
+    return load_fingerprint()
+
+
+def current_data():
+    # Usado dentro dos loaders: não dispara outra ingestão no meio da execução
+    if incremental_ingest():
+        return load_store().snapshot.df
+    if mapped_columns():
+        return load_mapped_data()[0]
+    if shared_data():
+        return load_shared_data()
+    return _load_data_copy()
+
+
+def _snapshot_for(fingerprint):
+    # Snapshot incremental da versão pedida (None fora do modo incremental)
+    if not incremental_ingest():
+        return None
+    return load_store().snapshot_for(fingerprint)
+
+
+def data_for(fingerprint, columns=None):
+    """
+    Linhas da versão `fingerprint` do dataset, nunca as de uma versão mais
+    nova publicada entre a leitura do fingerprint e o cálculo; os loaders em
+    cache por fingerprint calculam sempre sobre ela. `columns` lista as
+    colunas usadas pelo cálculo: no modo particionado só elas são lidas do
+    disco (nos demais modos o DataFrame inteiro já está em memória)
+    """
+    snapshot = _snapshot_for(fingerprint)
+    if snapshot is not None:
+        return snapshot.df
+    if partitioned_storage():
+        from analytics.partitioned import read_columns
+        return apply_schema(read_columns(load_dataset(fingerprint), columns))
+    # Fora do modo incremental a versão só muda com um novo processo
+    if load_fingerprint() != fingerprint:
+        raise SnapshotExpired(f"Versão {fingerprint} do dataset não está mais disponível")
+    return current_data()
+
+
+@st.cache_resource
+def _load_full_fingerprint():
+    return dataset_fingerprint(current_data())
+
+
+@st.cache_resource
+def _load_dataset_fingerprint():
+    """
+    Versão gravada a partir do arquivo de origem atual; só quem não a
+    encontra em disco carrega o DataFrame, para gravá-la
+    """
+    from analytics.partitioned import find_version, write_dataset
+
+    source = source_key(CSV_PATH if CSV_PATH.exists() else PARQUET_PATH)
+    fingerprint = find_version(DATASET_DIR, source)
+    if fingerprint is None:
+        df = read_flights()
+        fingerprint = dataset_fingerprint(df)
+        write_dataset(df, DATASET_DIR, fingerprint, source=source)
+    return fingerprint
+
+
+def load_fingerprint():
+    """
+    Versão do dataset, chave dos resultados em cache
+    """
+    if incremental_ingest():
+        return load_store().snapshot.fingerprint
+    if partitioned_storage():
+        return _load_dataset_fingerprint()
+    if mapped_columns():
+        return load_mapped_data()[1]
+    return _load_full_fingerprint()
+
+
+@st.cache_resource
+def result_cache():
+    return open_result_cache(
+        os.environ.get(RESULT_CACHE_ENV),
+        RESULT_CACHE_PATH,
+        ttl=float(os.environ.get(RESULT_CACHE_TTL_ENV, DEFAULT_TTL)),
+        max_mb=float(os.environ.get(RESULT_CACHE_MB_ENV, DEFAULT_MAX_MB)),
+        version=code_version(path for pattern in RESULT_CACHE_SOURCES for path in APP_ROOT.glob(pattern)),
+    )
+
+
+def shared_result(fn):
+    """
+    Camada abaixo do st.cache_data: o resultado é procurado no cache
+    compartilhado (chave = nome da função, versão do dataset e parâmetros já
+    com os valores padrão) antes de ser calculado
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = tuple(bound.arguments.items())
+        return result_cache().get_or_compute(fn.__name__, params, lambda: fn(*args, **kwargs))
+    return wrapper
+
+
+@st.cache_data(max_entries=2)
+@shared_result
+def load_memory_report(fingerprint):
+    return memory_report(data_for(fingerprint))
+
+
+# O índice é somente leitura: cache_resource evita copiá-lo a cada rerun
+@st.cache_resource(max_entries=2)
+def load_filter_index(fingerprint):
+    snapshot = _snapshot_for(fingerprint)
+    if snapshot is not None:
+        return snapshot.filter_index
+    return FilterIndex(data_for(fingerprint))
+
+
+@st.cache_resource(max_entries=2)
+def load_cube(fingerprint):
+    snapshot = _snapshot_for(fingerprint)
+    if snapshot is not None:
+        return snapshot.cube
+    return AggregateCube.from_frame(data_for(fingerprint))
+
+
+@st.cache_resource(max_entries=2)
+def load_days_cube(fingerprint):
+    snapshot = _snapshot_for(fingerprint)
+    if snapshot is not None:
+        return snapshot.days_cube
+    return days_left_cube(data_for(fingerprint))
+
+
+@st.cache_resource(max_entries=2)
+def load_dataset(fingerprint):
+    """
+    Dataset particionado em disco, gravado uma vez por versão do dataset (no
+    modo incremental, a partir do snapshot da versão)
+    """
+    from analytics.partitioned import dataset_dir, dataset_fingerprint_on_disk, open_dataset, write_dataset
+
+    directory = dataset_dir(DATASET_DIR, fingerprint)
+    if dataset_fingerprint_on_disk(directory) != fingerprint:
+        snapshot = _snapshot_for(fingerprint)
+        if snapshot is None:
+            raise SnapshotExpired(f"Versão {fingerprint} do dataset não está mais em disco")
+        directory = write_dataset(snapshot.df, DATASET_DIR, fingerprint)
+    return open_dataset(directory)
+
+
+@dataclass(frozen=True)
+class DatasetOverview:
+    rows: int
+    columns: int
+    days_left: tuple
+
+
+# Números do topo da aba 1; no modo particionado, dos metadados do Parquet
+@st.cache_data(max_entries=2)
+def load_overview(fingerprint):
+    if partitioned_storage():
+        from analytics.partitioned import column_bounds, data_columns
+        dataset = load_dataset(fingerprint)
+        low, high = column_bounds(dataset, "days_left")
+        return DatasetOverview(dataset.count_rows(), len(data_columns(dataset)), (int(low), int(high)))
+    df = data_for(fingerprint)
+    return DatasetOverview(len(df), df.shape[1], (int(df["days_left"].min()), int(df["days_left"].max())))
+
+
+# Opções e limites dos filtros: do índice em memória ou dos metadados do
+# dataset particionado (mesma interface values/bounds)
+@st.cache_resource(max_entries=2)
+def load_filter_options(fingerprint):
+    if partitioned_storage():
+        from analytics.partitioned import DatasetOptions
+        return DatasetOptions(load_dataset(fingerprint), CATEGORY_FILTER_COLUMNS, RANGE_FILTER_COLUMNS)
+    return load_filter_index(fingerprint)
+
+
+@st.cache_resource(max_entries=4)
+def load_partition_rows(fingerprint, filters):
+    from analytics.partitioned import read_filtered
+    return apply_schema(read_filtered(load_dataset(fingerprint), filters))
+
+
+def load_filtered(fingerprint, filters):
+    """
+    Linhas que atendem aos filtros da aba 4
+    """
+    if partitioned_storage():
+        return load_partition_rows(fingerprint, filters)
+    return load_filter_index(fingerprint).apply(data_for(fingerprint), filters)
+
+
+# Tabelas descritivas por versão do dataset (colunas passadas como tupla)
+@st.cache_data
+@shared_result
+def load_variable_types(fingerprint):
+    return variable_types(data_for(fingerprint))
+
+
+@st.cache_data
+@shared_result
+def load_describe(fingerprint, columns):
+    return data_for(fingerprint, columns)[list(columns)].describe()
+
+
+@st.cache_data
+@shared_result
+def load_correlation_matrix(fingerprint, columns):
+    return data_for(fingerprint, columns)[list(columns)].corr()
+
+
+@st.cache_data
+@shared_result
+def load_modes(fingerprint, columns):
+    return column_modes(data_for(fingerprint, columns), columns)
+
+
+# Sketches de quantis por coluna: mantidos pela ingestão incremental ou
+# construídos uma vez por versão do dataset
+@st.cache_resource(max_entries=2)
+def load_sketches(fingerprint):
+    snapshot = _snapshot_for(fingerprint)
+    if snapshot is not None:
+        return snapshot.sketches
+    return column_sketches(data_for(fingerprint, INCREMENTAL_MOMENT_COLUMNS))
+
+
+@st.cache_data
+@shared_result
+def load_outliers(fingerprint, columns, method="exact"):
+    _, approximate, exact_counts = OUTLIER_METHODS[method]
+    sketches = load_sketches(fingerprint) if approximate else None
+    return iqr_outliers(data_for(fingerprint, columns), columns, sketches=sketches, exact_counts=exact_counts)
+
+
+@st.cache_resource(max_entries=2)
+def load_category_sketches(fingerprint):
+    snapshot = _snapshot_for(fingerprint)
+    if snapshot is not None:
+        return snapshot.category_sketches
+    return table_sketches(data_for(fingerprint, [*CATEGORY_TABLES, *CATEGORY_MEDIAN_COLUMNS]))
+
+
+@st.cache_data
+@shared_result
+def load_category_tables(fingerprint):
+    return category_tables(load_cube(fingerprint), sketches=load_category_sketches(fingerprint))
+
+
+@st.cache_data(max_entries=32)
+@shared_result
+def load_selection_summary(fingerprint, filters):
+    cube = load_cube(fingerprint)
+    if cube.covers(filters):
+        return summarize_selection(cube, filters, load_days_cube(fingerprint))
+    # Preço/duração cortam linhas dentro das células: agregados das linhas
+    return summarize_selection(RowAggregates(load_filtered(fingerprint, filters)), None)
+
+
+@st.cache_data
+@shared_result
+def load_hypothesis_results(fingerprint, alpha=SIGNIFICANCE_LEVEL):
+    """
+    Bateria de testes em cache por versão do dataset e nível de significância
+    """
+    return run_hypothesis_tests(data_for(fingerprint), alpha)
+
+
+# Qui-quadrado com categoria e limites de faixa escolhidos na página
+@st.cache_data(max_entries=16)
+@shared_result
+def load_chi_square(fingerprint, row_col, edges, value_col="price"):
+    return chi_square_test(data_for(fingerprint), row_col, value_col, edges)
+
+
+def _where_columns(column, where):
+    return (column,) if where is None else (column, where[0])
+
+
+# Momentos por (coluna, filtro): uma passada por coluna, reaproveitada por
+# métricas, gráficos, intervalos de confiança e resumo
+@st.cache_data
+def load_moments(fingerprint, column, where=None):
+    snapshot = _snapshot_for(fingerprint)
+    if where is None and snapshot is not None and column in snapshot.moments:
+        return snapshot.moments[column]
+    return Moments.from_values(select_values(data_for(fingerprint, _where_columns(column, where)), column, where))
+
+
+@st.cache_data
+@shared_result
+def load_comoments(fingerprint, x, y):
+    df = data_for(fingerprint, (x, y))
+    return CoMoments.from_values(df[x].to_numpy(), df[y].to_numpy())
+
+
+@st.cache_data
+@shared_result
+def load_median(fingerprint, column, where=None, approximate=False):
+    if approximate and where is None:
+        return float(load_sketches(fingerprint)[column].quantile(0.5))
+    return float(np.median(select_values(data_for(fingerprint, _where_columns(column, where)), column, where)))
+
+
+# Agregados dos histogramas e box plots (o navegador recebe só estes valores)
+@st.cache_data
+@shared_result
+def load_histogram(fingerprint, column, nbins=50):
+    return histogram(data_for(fingerprint, (column,))[column].to_numpy(), nbins)
+
+
+@st.cache_data
+@shared_result
+def load_box_stats(fingerprint, column):
+    return box_stats(data_for(fingerprint, (column,))[column].to_numpy())
+
+
+@st.cache_data(max_entries=32)
+@shared_result
+def load_grouped_box_stats(fingerprint, filters, group_col, value_col):
+    return grouped_box_stats(load_filtered(fingerprint, filters), group_col, value_col)
+
+
+def _rows_for(fingerprint, filters, columns):
+    # filters=None: dataset inteiro
+    return data_for(fingerprint, columns) if filters is None else load_filtered(fingerprint, filters)
+
+
+# Dispersão: grade de densidade sobre todas as linhas e amostra estratificada
+# com semente fixa, em cache por seleção de filtros (estável entre reruns)
+@st.cache_data(max_entries=32)
+@shared_result
+def load_density(fingerprint, filters, x, y, bins=(60, 40)):
+    df = _rows_for(fingerprint, filters, (x, y))
+    return density_grid(df[x].to_numpy(), df[y].to_numpy(), bins)
+
+
+@st.cache_data(max_entries=32)
+@shared_result
+def load_scatter_sample(fingerprint, filters, by, columns, n=SCATTER_SAMPLE):
+    return stratified_sample(_rows_for(fingerprint, filters, (by, *columns)), by, n)[list(columns)]
+
+
+# Arquivos de exportação: um só cache por processo, limitado em bytes, que
+# devolve os mesmos bytes a todas as sessões (o st.cache_data copiaria o
+# arquivo inteiro a cada acerto)
+@st.cache_resource
+def export_cache():
+    return ExportCache(EXPORT_CACHE_MB * 1024**2)
+
+
+def load_export(fingerprint, filters, fmt):
+    """
+    Arquivo de exportação gerado só sob demanda e reaproveitado por seleção
+    """
+    return export_cache().get_or_build(
+        (fingerprint, filters, fmt), lambda: export_bytes(load_filtered(fingerprint, filters), fmt),
+    )
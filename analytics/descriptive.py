@@ -0,0 +1,115 @@
+"""
+Estatísticas descritivas das abas 1 e 2 da página de análise de dados.
+
+As funções devolvem DataFrames e dicionários com valores numéricos; a
+formatação (casas decimais, porcentagens) fica a cargo da página.
+"""
+import pandas as pd
+
+# Colunas de horário têm ordem natural (madrugada -> noite)
+ORDINAL_COLUMNS = ["departure_time", "arrival_time"]
+
+# Abaixo deste número de valores distintos uma coluna numérica é tratada como discreta
+DISCRETE_MAX_UNIQUE = 10
+
+
+def variable_type(series, unique_count):
+    # Categorias e textos são qualitativos; inteiros/floats de qualquer largura são numéricos
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype):
+        return "Categórica Ordinal" if series.name in ORDINAL_COLUMNS else "Categórica Nominal"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "Numérica Discreta" if unique_count < DISCRETE_MAX_UNIQUE else "Numérica Contínua"
+    return "Outro"
+
+
+def variable_types(df):
+    """
+    Tipo estatístico, tipo de dados, valores únicos e ausentes de cada coluna
+    """
+    rows = []
+    for col in df.columns:
+        unique_count = df[col].nunique()
+        rows.append({
+            'Variável': col,
+            'Tipo': variable_type(df[col], unique_count),
+            'Tipo de Dados': str(df[col].dtype),
+            'Valores Únicos': unique_count,
+            'Valores Ausentes': df[col].isnull().sum(),
+        })
+    return pd.DataFrame(rows)
+
+
+def column_modes(df, columns):
+    """
+    Moda de cada coluna (None quando a coluna está vazia)
+    """
+    modes = {}
+    for col in columns:
+        mode = df[col].mode()
+        modes[col] = mode.iloc[0] if len(mode) > 0 else None
+    return modes
+
+
+def skewness_label(skew):
+    if skew > 0.5:
+        return "Distribuição assimétrica à direita"
+    if skew < -0.5:
+        return "Distribuição assimétrica à esquerda"
+    return "Distribuição aproximadamente simétrica"
+
+
+def kurtosis_label(kurtosis):
+    return "Mais pontiaguda que a normal" if kurtosis > 0 else "Mais achatada que a normal"
+
+
+def variability_label(cv):
+    if cv > 30:
+        return "Alta variabilidade"
+    if cv > 15:
+        return "Variabilidade moderada"
+    return "Baixa variabilidade"
+
+
+def dispersion_table(moments):
+    """
+    Desvio padrão, variância e coeficiente de variação a partir dos momentos
+    de cada coluna ({coluna: Moments})
+    """
+    return pd.DataFrame([
+        {
+            'Variável': col,
+            'Desvio Padrão': m.std,
+            'Variância': m.var,
+            'Coef. Variação (%)': m.cv,
+            'Interpretação': variability_label(m.cv),
+        }
+        for col, m in moments.items()
+    ])
+
+
+def correlation_strength(r):
+    if abs(r) > 0.7:
+        return "forte"
+    if abs(r) > 0.3:
+        return "moderada"
+    return "fraca"
+
+
+def correlation_pairs(correlation_matrix):
+    """
+    Cada par de variáveis da matriz com coeficiente, força e direção
+    """
+    columns = list(correlation_matrix.columns)
+    pairs = []
+    for i in range(len(columns)):
+        for j in range(i + 1, len(columns)):
+            r = correlation_matrix.iloc[i, j]
+            pairs.append({
+                "x": columns[i],
+                "y": columns[j],
+                "r": r,
+                "strength": correlation_strength(r),
+                "direction": "positiva" if r > 0 else "negativa",
+            })
+    return pairs
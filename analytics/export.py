@@ -0,0 +1,87 @@
+"""
+Exportação dos dados filtrados em CSV, CSV compactado (gzip) ou Parquet.
+
+O CSV é gerado em pedaços de linhas e escrito direto no destino (e no gzip,
+quando for o caso), sem montar a string do CSV inteiro. O arquivo pronto,
+porém, fica inteiro em memória: o st.download_button só aceita os bytes
+completos. ExportCache guarda os últimos arquivos gerados até um limite de
+bytes.
+"""
+import gzip
+import io
+import threading
+from collections import OrderedDict
+
+# formato -> (rótulo, MIME, extensão)
+EXPORT_FORMATS = {
+    "csv": ("CSV", "text/csv", ".csv"),
+    "csv.gz": ("CSV compactado (gzip)", "application/gzip", ".csv.gz"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", ".parquet"),
+}
+
+CHUNK_ROWS = 50_000
+
+
+def iter_csv_chunks(df, chunk_rows=CHUNK_ROWS):
+    """
+    Gera o CSV em pedaços de bytes; o cabeçalho vai só no primeiro pedaço
+    """
+    if df.empty:
+        yield df.to_csv(index=False).encode()
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode()
+
+
+def write_export(df, fmt, fileobj):
+    if fmt == "csv":
+        for chunk in iter_csv_chunks(df):
+            fileobj.write(chunk)
+    elif fmt == "csv.gz":
+        # mtime=0 deixa o arquivo determinístico para a mesma seleção
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6, mtime=0) as gz:
+            for chunk in iter_csv_chunks(df):
+                gz.write(chunk)
+    elif fmt == "parquet":
+        df.to_parquet(fileobj, index=False)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+
+def export_bytes(df, fmt):
+    buffer = io.BytesIO()
+    write_export(df, fmt, buffer)
+    return buffer.getvalue()
+
+
+class ExportCache:
+    """
+    Arquivos gerados mais recentemente, até `max_bytes` no total (o menos
+    usado sai primeiro). Os bytes são imutáveis: o mesmo objeto é devolvido
+    a todas as sessões, sem cópia. Um arquivo maior que o limite não é guardado
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            data = self._files.get(key)
+            if data is not None:
+                self._files.move_to_end(key)
+                return data
+        data = build()
+        if len(data) > self.max_bytes:
+            return data
+        with self._lock:
+            if key not in self._files:
+                self._files[key] = data
+                self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._files.popitem(last=False)
+                self.size -= len(evicted)
+        return data
@@ -0,0 +1,105 @@
+"""
+Cache de figuras do Plotly compartilhado entre execuções e sessões.
+
+Cada figura é guardada pela chave (gráfico, versão do dataset, assinatura
+normalizada dos filtros e opções do gráfico) junto com o tamanho do seu JSON,
+medido uma única vez na inserção. O cache é um LRU limitado tanto pelo número
+de figuras quanto pela soma dos tamanhos serializados: ao passar de qualquer
+um dos limites, as figuras usadas há mais tempo são descartadas.
+
+Guarda-se a figura montada, e não o JSON em si: o st.plotly_chart valida de
+novo um dicionário recebido (tão caro quanto montar a figura), enquanto uma
+Figure já validada só é serializada. As figuras em cache não devem ser
+alteradas depois de inseridas.
+
+Com um cache de resultados compartilhado (analytics.result_cache), o JSON de
+cada figura montada também é gravado lá; outro processo ou réplica que ainda
+não tem a figura em memória a reconstrói desse JSON em vez de recalculá-la.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Limite do cache em MB de JSON serializado
+FIGURE_CACHE_ENV = "DASHBOARD_FIGURE_CACHE_MB"
+DEFAULT_MAX_MB = 64
+DEFAULT_MAX_ENTRIES = 512
+
+
+@dataclass(frozen=True)
+class CachedFigure:
+    figure: object
+    nbytes: int
+
+
+class FigureCache:
+    """
+    LRU de figuras limitado por quantidade e por bytes de JSON
+    """
+
+    def __init__(self, max_bytes, max_entries=DEFAULT_MAX_ENTRIES, store=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.store = store
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, store=None):
+        max_mb = float(os.environ.get(FIGURE_CACHE_ENV, DEFAULT_MAX_MB))
+        return cls(int(max_mb * 1024**2), store=store)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, figure, share=True):
+        serialized = figure.to_json()
+        if share and self.store is not None:
+            self.store.set_bytes("figure", key, serialized.encode())
+        entry = CachedFigure(figure, len(serialized))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            # Figura maior que o cache inteiro: devolvida sem ser guardada
+            if entry.nbytes <= self.max_bytes:
+                self._entries[key] = entry
+                self._bytes += entry.nbytes
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return entry
+
+    def get_or_build(self, key, build):
+        """
+        Figura em cache ou montada por `build()` (fora do lock: duas sessões
+        podem montar a mesma figura ao mesmo tempo, e a última prevalece)
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        shared = self.store.get_bytes("figure", key) if self.store is not None else None
+        if shared is not None:
+            import plotly.io as pio
+            return self.put(key, pio.from_json(shared.decode()), share=False)
+        return self.put(key, build())
+
+    def stats(self):
+        with self._lock:
+            return {"figures": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,98 @@
+"""
+Figuras do Plotly montadas a partir de agregados calculados no servidor.
+"""
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def histogram_figure(hist, title, x_title, y_title="Frequência"):
+    """
+    Histograma desenhado como barras a partir das contagens por faixa
+    """
+    centers = (hist.edges[:-1] + hist.edges[1:]) / 2
+    fig = go.Figure(go.Bar(
+        x=centers,
+        y=hist.counts,
+        width=np.diff(hist.edges),
+        marker_line_width=0,
+        customdata=np.column_stack([hist.edges[:-1], hist.edges[1:]]),
+        hovertemplate="%{customdata[0]:,.0f} – %{customdata[1]:,.0f}<br>%{y:,}<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, bargap=0)
+    return fig
+
+
+def box_figure(stats_by_label, title, y_title, x_title=None, color=False):
+    """
+    Box plots com quartis e cercas pré-calculados; outliers vêm de uma amostra
+    limitada e são desenhados como pontos
+    """
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, (label, box) in enumerate(stats_by_label.items()):
+        trace_color = palette[i % len(palette)] if color else palette[0]
+        label = str(label)
+        fig.add_trace(go.Box(
+            x=[label],
+            q1=[box.q1],
+            median=[box.median],
+            q3=[box.q3],
+            mean=[box.mean],
+            lowerfence=[box.lowerfence],
+            upperfence=[box.upperfence],
+            name=label,
+            marker_color=trace_color,
+            boxpoints=False,
+            showlegend=color,
+        ))
+        if len(box.outliers):
+            fig.add_trace(go.Scatter(
+                x=[label] * len(box.outliers),
+                y=box.outliers,
+                mode="markers",
+                marker=dict(color=trace_color, size=4),
+                name=label,
+                legendgroup=label,
+                showlegend=False,
+                hovertemplate=f"{label}: %{{y:,.0f}}<extra>outlier ({box.n_outliers:,} no total)</extra>",
+            ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, boxmode="overlay")
+    return fig
+
+
+def density_figure(grid, title, x_title, y_title, sample=None, x=None, y=None, color=None, hover=()):
+    """
+    Grade de densidade (escala log) com a amostra de pontos sobreposta,
+    colorida por `color` quando informado
+    """
+    counts = grid.counts.astype(np.float64)
+    counts[counts == 0] = np.nan  # células vazias ficam transparentes
+    fig = go.Figure(go.Heatmap(
+        x=(grid.x_edges[:-1] + grid.x_edges[1:]) / 2,
+        y=(grid.y_edges[:-1] + grid.y_edges[1:]) / 2,
+        z=np.round(np.log10(counts), 3),
+        customdata=grid.counts,
+        colorscale="Blues",
+        colorbar=dict(title="Voos", tickvals=[0, 1, 2, 3, 4, 5], ticktext=["1", "10", "100", "1k", "10k", "100k"]),
+        hovertemplate=f"{x_title}: %{{x:,.1f}}<br>{y_title}: %{{y:,.0f}}<br>%{{customdata:,}} voos<extra></extra>",
+        name="Densidade",
+    ))
+    if sample is not None and len(sample):
+        palette = px.colors.qualitative.Plotly
+        groups = sample.groupby(color, observed=True, sort=True) if color else [(None, sample)]
+        hover_lines = "".join(f"<br>{col}: %{{customdata[{i}]}}" for i, col in enumerate(hover))
+        for i, (label, part) in enumerate(groups):
+            fig.add_trace(go.Scatter(
+                x=part[x],
+                y=part[y],
+                mode="markers",
+                marker=dict(color=palette[i % len(palette)], size=4, opacity=0.7),
+                name="Amostra" if label is None else str(label),
+                customdata=part[list(hover)].astype(str).to_numpy() if hover else None,
+                hovertemplate=f"{x_title}: %{{x:,.2f}}<br>{y_title}: %{{y:,.0f}}{hover_lines}"
+                              f"<extra>{'' if label is None else label}</extra>",
+                showlegend=label is not None,
+            ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title)
+    return fig
@@ -0,0 +1,230 @@
+"""
+Índice de bitmaps para os filtros da aba de visualizações interativas.
+
+Cada valor das colunas categóricas filtráveis guarda um bitmap empacotado
+(1 bit por linha) e as colunas de intervalo guardam a ordem de classificação
+dos valores, com bitmaps de prefixo a cada balde de posições ordenadas. Uma
+mudança de filtro vira alguns OR/AND de bitmaps e duas buscas binárias por
+coluna numérica, sem varrer as colunas do DataFrame.
+
+Na ingestão incremental, append() estende o índice só com as linhas novas:
+os bitmaps ficam em buffers com folga no final e as linhas novas das colunas
+de intervalo são comparadas diretamente até somarem 1/TAIL_RATIO das linhas
+ordenadas, quando a ordenação é refeita.
+"""
+import copy
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_FILTER_COLUMNS = ["airline", "source_city", "destination_city", "class", "stops"]
+RANGE_FILTER_COLUMNS = ["price", "duration"]
+
+# Número de baldes dos bitmaps de prefixo das colunas de intervalo
+RANGE_BUCKETS = 64
+# Linhas acrescentadas fora da ordenação, no máximo 1/TAIL_RATIO das ordenadas
+TAIL_RATIO = 8
+
+
+def _nbytes(n_rows):
+    return (n_rows + 7) // 8
+
+
+@dataclass(frozen=True)
+class FlightFilters:
+    """
+    Seleção normalizada dos filtros; serve como chave de cache estável
+    """
+    categories: tuple = ()
+    ranges: tuple = ()
+
+    @classmethod
+    def build(cls, categories=None, ranges=None):
+        # Ordena valores e colunas para que a mesma seleção gere sempre a mesma chave
+        categories = categories or {}
+        ranges = ranges or {}
+        return cls(
+            categories=tuple(sorted(
+                (col, tuple(sorted(values, key=str))) for col, values in categories.items()
+            )),
+            ranges=tuple(sorted(
+                (col, (bounds[0], bounds[1])) for col, bounds in ranges.items()
+            )),
+        )
+
+    def signature(self):
+        return hashlib.sha1(repr((self.categories, self.ranges)).encode()).hexdigest()[:16]
+
+
+class FilterIndex:
+    """
+    Bitmaps por categoria e índices ordenados por coluna numérica
+    """
+
+    def __init__(self, df, category_columns=CATEGORY_FILTER_COLUMNS, range_columns=RANGE_FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self._values = {}
+        self._bitmaps = {}
+
+        for col in category_columns:
+            # Valores na ordem em que aparecem, como no df[col].unique() original
+            codes, uniques = pd.factorize(df[col])
+            self._values[col] = list(uniques)
+            self._bitmaps[col] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+        # Linhas já gravadas nos buffers dos bitmaps, comum aos índices derivados
+        # deste por append
+        self._written = [self.n_rows]
+        self._sort_ranges(df, range_columns)
+
+    def _sort_ranges(self, df, range_columns):
+        self._sorted = {}
+        self._sorted_rows = self.n_rows
+        self._tail = {}
+        # Posições em int32 quando possível: metade da memória e das leituras
+        position_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self._bucket_size = max(1, -(-self.n_rows // RANGE_BUCKETS))
+        self._prefix_bits = {}
+        for col in range_columns:
+            values = df[col].to_numpy()
+            order = np.argsort(values, kind="stable").astype(position_dtype, copy=False)
+            self._sorted[col] = (values[order], order)
+            self._tail[col] = values[self.n_rows:]
+
+            # prefix[k] marca as linhas com posição ordenada < k * bucket_size
+            rank_mask = np.zeros(self.n_rows, dtype=bool)
+            prefix = [np.packbits(rank_mask)]
+            for start in range(0, self.n_rows, self._bucket_size):
+                rank_mask[order[start:start + self._bucket_size]] = True
+                prefix.append(np.packbits(rank_mask))
+            self._prefix_bits[col] = prefix
+
+    def append(self, df):
+        """
+        Índice de `df`, cujas primeiras n_rows linhas são as já indexadas: só
+        as linhas seguintes são lidas. O índice atual não muda (os bytes
+        gravados além do seu fim não entram nas suas máscaras)
+        """
+        start, n_rows = self.n_rows, len(df)
+        index = copy.copy(self)
+        index.n_rows = n_rows
+        # Os buffers só são compartilhados se ninguém gravou além deste índice;
+        # um segundo append sobre o mesmo índice copia os bitmaps
+        shared = self._written[0] == start
+        index._written = self._written if shared else [start]
+        index._written[0] = n_rows
+        nbytes = _nbytes(n_rows)
+        # Bits das linhas novas alinhados ao byte da primeira delas; os bits
+        # desse byte a partir de `offset` são zerados antes
+        first_byte, offset = start // 8, start % 8
+        keep = np.uint8((0xFF << (8 - offset)) & 0xFF)
+        index._values, index._bitmaps = {}, {}
+        for col, bitmaps in self._bitmaps.items():
+            codes, uniques = pd.factorize(df[col].iloc[start:])
+            values = list(self._values[col])
+            buffers = {}
+            for value, bitmap in bitmaps.items():
+                buffer = bitmap.base if bitmap.base is not None else bitmap
+                if not shared or len(buffer) < nbytes:
+                    # Folga de 25% além do necessário: os próximos append não realocam
+                    grown = np.zeros(nbytes + nbytes // 4, dtype=np.uint8)
+                    grown[:len(bitmap)] = bitmap
+                    buffer = grown
+                if offset:
+                    buffer[first_byte] &= keep
+                buffers[value] = buffer
+            for code, value in enumerate(uniques):
+                if value not in buffers:
+                    values.append(value)
+                    buffers[value] = np.zeros(nbytes + nbytes // 4, dtype=np.uint8)
+                bits = np.packbits(np.concatenate([np.zeros(offset, dtype=bool), codes == code]))
+                target = buffers[value][first_byte:first_byte + len(bits)]
+                np.bitwise_or(target, bits, out=target)
+            index._values[col] = values
+            index._bitmaps[col] = {value: buffer[:nbytes] for value, buffer in buffers.items()}
+
+        if n_rows - self._sorted_rows > self._sorted_rows // TAIL_RATIO:
+            index._sort_ranges(df, list(self._sorted))
+        else:
+            index._tail = {col: df[col].to_numpy()[self._sorted_rows:n_rows] for col in self._sorted}
+        return index
+
+    def values(self, col):
+        return list(self._values[col])
+
+    def bounds(self, col):
+        sorted_values, _ = self._sorted[col]
+        low, high = sorted_values[0], sorted_values[-1]
+        tail = self._tail[col]
+        if len(tail):
+            low, high = min(low, tail.min()), max(high, tail.max())
+        return low, high
+
+    def _category_bits(self, col, selected):
+        bitmaps = self._bitmaps[col]
+        selected = [value for value in selected if value in bitmaps]
+        # Todos os valores selecionados: o filtro não restringe nada
+        if len(selected) == len(bitmaps):
+            return None
+        bits = np.zeros(_nbytes(self.n_rows), dtype=np.uint8)
+        for value in selected:
+            np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+    def _set_bits(self, bits, positions):
+        np.bitwise_or.at(bits, positions >> 3, (128 >> (positions & 7)).astype(np.uint8))
+
+    def _range_bits(self, col, low, high):
+        sorted_values, order = self._sorted[col]
+        # Converte os limites para o dtype da coluna; do contrário o searchsorted
+        # promove o vetor inteiro para int64/float64 a cada consulta
+        low, high = sorted_values.dtype.type(low), sorted_values.dtype.type(high)
+        start = int(np.searchsorted(sorted_values, low, side="left"))
+        stop = int(np.searchsorted(sorted_values, high, side="right"))
+        tail = self._tail[col]
+        tail_hits = np.flatnonzero((tail >= low) & (tail <= high)) + self._sorted_rows
+        if start == 0 and stop == self._sorted_rows and len(tail_hits) == len(tail):
+            return None
+
+        bits = np.zeros(_nbytes(self.n_rows), dtype=np.uint8)
+        self._set_bits(bits, tail_hits)
+        # Baldes inteiros saem de dois bitmaps de prefixo; só as bordas
+        # (no máximo dois baldes parciais) são marcadas linha a linha
+        size = self._bucket_size
+        first, last = -(-start // size), stop // size
+        if first >= last:
+            self._set_bits(bits, order[start:stop])
+            return bits
+
+        prefix = self._prefix_bits[col]
+        sorted_bytes = len(prefix[last])
+        bits[:sorted_bytes] |= np.bitwise_and(prefix[last], np.invert(prefix[first]))
+        self._set_bits(bits, order[start:first * size])
+        self._set_bits(bits, order[last * size:stop])
+        return bits
+
+    def mask(self, filters):
+        """
+        Máscara booleana das linhas que atendem aos filtros (None = todas)
+        """
+        bits = None
+        parts = [self._category_bits(col, values) for col, values in filters.categories]
+        parts += [self._range_bits(col, low, high) for col, (low, high) in filters.ranges]
+        for part in parts:
+            if part is None:
+                continue
+            if bits is None:
+                bits = part
+            else:
+                np.bitwise_and(bits, part, out=bits)
+
+        if bits is None:
+            return None
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+    def apply(self, df, filters):
+        mask = self.mask(filters)
+        return df if mask is None else df[mask]
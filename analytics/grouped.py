@@ -0,0 +1,150 @@
+"""
+Testes de comparação entre grupos a partir de códigos inteiros de categoria.
+
+Em vez de montar uma máscara e copiar uma Series por grupo, cada linha recebe
+o código do seu grupo e contagens, somas e somas de quadrados saem de
+np.bincount sobre o array inteiro. ANOVA, ANOVA de Welch e Kruskal-Wallis são
+calculados desses totais, para qualquer coluna (ou combinação de colunas) de
+agrupamento.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+def group_codes(df, by):
+    """
+    Códigos 0..k-1 por linha e rótulos dos grupos observados, na mesma ordem
+    de um groupby(observed=True); linhas sem grupo ficam com -1
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    codes = np.zeros(len(df), dtype=np.int64)
+    levels = []
+    missing = np.zeros(len(df), dtype=bool)
+    for col in by:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            col_codes, col_levels = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            col_codes, col_levels = pd.factorize(series, sort=True)
+        missing |= col_codes < 0
+        codes = codes * len(col_levels) + col_codes
+        levels.append(col_levels)
+
+    # Compacta as combinações observadas para 0..k-1 (ordenadas como no groupby)
+    observed, codes_valid = np.unique(codes[~missing], return_inverse=True)
+    codes = np.full(len(df), -1, dtype=np.int64)
+    codes[~missing] = codes_valid
+
+    if len(by) == 1:
+        labels = pd.Index(levels[0][observed], name=by[0])
+    else:
+        sizes = [len(level) for level in levels]
+        positions = np.unravel_index(observed, sizes)
+        labels = pd.MultiIndex.from_arrays(
+            [level[pos] for level, pos in zip(levels, positions)], names=by,
+        )
+    return codes, labels
+
+
+@dataclass(frozen=True)
+class GroupedMoments:
+    """
+    Contagem, média e soma dos quadrados dos desvios de cada grupo
+    """
+    labels: pd.Index
+    n: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def from_codes(cls, codes, values, labels):
+        valid = codes >= 0
+        codes = codes[valid]
+        values = np.asarray(values, dtype=np.float64)[valid]
+        k = len(labels)
+        n = np.bincount(codes, minlength=k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(codes, weights=values, minlength=k) / n
+        # Segunda passada vetorizada sobre os desvios: estável mesmo com médias altas
+        deviations = values - mean[codes]
+        m2 = np.bincount(codes, weights=deviations * deviations, minlength=k)
+        return cls(labels, n, mean, m2)
+
+    @classmethod
+    def from_frame(cls, df, by, value_col):
+        codes, labels = group_codes(df, by)
+        return cls.from_codes(codes, df[value_col].to_numpy(), labels)
+
+    @property
+    def var(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 1, self.m2 / (self.n - 1), np.nan)
+
+    def summary(self):
+        """
+        count/mean/std por grupo, como groupby().agg(["count", "mean", "std"])
+        """
+        return pd.DataFrame(
+            {"count": self.n, "mean": self.mean, "std": np.sqrt(self.var)},
+            index=self.labels,
+        )
+
+
+def anova_oneway(groups):
+    """
+    ANOVA de um fator (mesmo resultado de scipy.stats.f_oneway)
+    """
+    # Importado aqui: a página 4 usa os agrupamentos sem precisar do scipy
+    from scipy import stats
+
+    n, mean = groups.n, groups.mean
+    total = n.sum()
+    k = len(n)
+    grand_mean = (n * mean).sum() / total
+    ss_between = (n * (mean - grand_mean) ** 2).sum()
+    ss_within = groups.m2.sum()
+    df_between, df_within = k - 1, total - k
+    f_stat = (ss_between / df_between) / (ss_within / df_within)
+    return f_stat, stats.f.sf(f_stat, df_between, df_within)
+
+
+def welch_anova(groups):
+    """
+    ANOVA de Welch (variâncias desiguais): estatística F, p e graus de liberdade
+    """
+    from scipy import stats
+
+    n, mean, var = groups.n.astype(np.float64), groups.mean, groups.var
+    k = len(n)
+    weights = n / var
+    total_weight = weights.sum()
+    weighted_mean = (weights * mean).sum() / total_weight
+    between = (weights * (mean - weighted_mean) ** 2).sum() / (k - 1)
+    correction = ((1 - weights / total_weight) ** 2 / (n - 1)).sum()
+    f_stat = between / (1 + 2 * (k - 2) / (k * k - 1) * correction)
+    df_denominator = (k * k - 1) / (3 * correction)
+    return f_stat, stats.f.sf(f_stat, k - 1, df_denominator), (k - 1, df_denominator)
+
+
+def kruskal_wallis(codes, values, k):
+    """
+    Kruskal-Wallis com correção de empates (mesmo resultado de scipy.stats.kruskal)
+    """
+    from scipy import stats
+
+    valid = codes >= 0
+    codes = codes[valid]
+    values = np.asarray(values)[valid]
+    total = len(values)
+    ranks = stats.rankdata(values)
+    n = np.bincount(codes, minlength=k)
+    rank_sums = np.bincount(codes, weights=ranks, minlength=k)
+    observed = n > 0
+    h_stat = 12.0 / (total * (total + 1)) * (rank_sums[observed] ** 2 / n[observed]).sum() - 3 * (total + 1)
+    _, ties = np.unique(values, return_counts=True)
+    # Em float64: ties ** 3 estoura o int64 a partir de ~2,1 milhões de empates
+    ties = ties.astype(np.float64)
+    h_stat /= 1 - (ties ** 3 - ties).sum() / (total ** 3 - total)
+    return h_stat, stats.chi2.sf(h_stat, observed.sum() - 1)
@@ -0,0 +1,156 @@
+"""
+Bateria de testes de hipótese sobre o preço dos voos.
+
+Todos os testes da página de análise estatística são calculados de uma vez e
+devolvidos em um único objeto de resultados, que pode ser guardado em cache e
+lido tanto pela aba de testes quanto pela aba de resumo.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.contingency import chi_square, contingency_table
+from analytics.grouped import GroupedMoments, anova_oneway, group_codes, kruskal_wallis, welch_anova
+from analytics.moments import CoMoments, Moments, pearson_test, select_values, ttest_from_moments
+from analytics.parallel import run_tasks
+
+SIGNIFICANCE_LEVEL = 0.05
+
+PRICE_RANGE_BINS = [0, 5000, 15000, 50000, float("inf")]
+PRICE_RANGE_LABELS = ["Baixo", "Médio", "Alto", "Premium"]
+
+
+@dataclass
+class AnovaResult:
+    f_stat: float
+    p_value: float
+    group_stats: pd.DataFrame
+    welch_f: float
+    welch_p: float
+    kruskal_h: float
+    kruskal_p: float
+
+
+@dataclass
+class TTestResult:
+    levene_stat: float
+    levene_p: float
+    equal_var: bool
+    t_stat: float
+    p_value: float
+    direct_stats: dict
+    indirect_stats: dict
+
+
+@dataclass
+class ChiSquareResult:
+    contingency_table: pd.DataFrame
+    chi2_stat: float
+    p_value: float
+    dof: int
+    expected: np.ndarray
+
+
+@dataclass
+class CorrelationResult:
+    r: float
+    t_stat: float
+    p_value: float
+    n: int
+
+
+@dataclass
+class HypothesisResults:
+    alpha: float
+    anova: AnovaResult
+    ttest: TTestResult
+    chi2: ChiSquareResult
+    correlation: CorrelationResult
+
+    def rejects(self, p_value):
+        return p_value < self.alpha
+
+
+def anova_test(df, group_col="airline", value_col="price"):
+    """
+    ANOVA de um fator: diferença de médias entre os grupos, com as
+    alternativas de Welch (variâncias desiguais) e Kruskal-Wallis (postos).
+    `group_col` pode ser qualquer coluna ou lista de colunas (ex.: rota)
+    """
+    codes, labels = group_codes(df, group_col)
+    values = df[value_col].to_numpy()
+    groups = GroupedMoments.from_codes(codes, values, labels)
+    f_stat, p_value = anova_oneway(groups)
+    welch_f, welch_p, _ = welch_anova(groups)
+    kruskal_h, kruskal_p = kruskal_wallis(codes, values, len(labels))
+    return AnovaResult(
+        f_stat, p_value, groups.summary().round(2),
+        welch_f, welch_p, kruskal_h, kruskal_p,
+    )
+
+
+def _describe(moments):
+    return {"mean": moments.mean, "std": moments.std, "n": moments.n}
+
+
+def direct_vs_stops_test(df, alpha=SIGNIFICANCE_LEVEL):
+    """
+    Teste t entre voos diretos e com paradas, escolhendo a variante (Student
+    ou Welch) pelo teste de Levene
+    """
+    direct_prices = select_values(df, "price", ("stops", "==", "zero"))
+    indirect_prices = select_values(df, "price", ("stops", "!=", "zero"))
+
+    from scipy import stats
+
+    # Teste de igualdade de variâncias (usa desvios da mediana, precisa dos dados)
+    levene_stat, levene_p = stats.levene(direct_prices, indirect_prices)
+    equal_var = levene_p > alpha
+
+    # Teste t a partir dos momentos de cada grupo
+    direct, indirect = Moments.from_values(direct_prices), Moments.from_values(indirect_prices)
+    t_stat, p_value = ttest_from_moments(direct, indirect, equal_var=equal_var)
+    return TTestResult(
+        levene_stat, levene_p, equal_var, t_stat, p_value,
+        _describe(direct), _describe(indirect),
+    )
+
+
+def chi_square_test(df, row_col="class", value_col="price", edges=PRICE_RANGE_BINS, labels=None):
+    """
+    Qui-quadrado de independência entre uma categoria e faixas de um valor
+    numérico (limites (a, b], como pd.cut)
+    """
+    table = contingency_table(df, row_col, value_col, edges, labels)
+    return ChiSquareResult(*chi_square(table))
+
+
+def class_vs_price_range_test(df):
+    """
+    Qui-quadrado de independência entre classe e faixa de preço
+    """
+    return chi_square_test(df, "class", "price", PRICE_RANGE_BINS, PRICE_RANGE_LABELS)
+
+
+def correlation_test(df, x="duration", y="price"):
+    """
+    Significância da correlação de Pearson pelo teste t com n - 2 graus de liberdade
+    """
+    comoments = CoMoments.from_values(df[x].to_numpy(), df[y].to_numpy())
+    r, t_stat, p_value = pearson_test(comoments)
+    return CorrelationResult(r, t_stat, p_value, comoments.n)
+
+
+def run_hypothesis_tests(df, alpha=SIGNIFICANCE_LEVEL, mode=None):
+    """
+    Executa os quatro testes da página de análise estatística; como são
+    independentes, rodam em paralelo (ver analytics.parallel)
+    """
+    results = run_tasks({
+        "anova": (anova_test, df),
+        "ttest": (direct_vs_stops_test, df, alpha),
+        "chi2": (class_vs_price_range_test, df),
+        "correlation": (correlation_test, df),
+    }, mode)
+    return HypothesisResults(alpha=alpha, **results)
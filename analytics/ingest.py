@@ -0,0 +1,238 @@
+"""
+Ingestão incremental do dataset de voos.
+
+Novas coletas chegam de duas formas: linhas acrescentadas ao final do CSV
+principal ou arquivos de partição na mesma pasta
+(airlines_flights_data_<identificador>.csv). O estado da ingestão guarda até
+que byte do CSV já foi lido e quais partições já foram carregadas; cada
+atualização lê só o trecho novo e as partições novas, de modo que o custo
+acompanha o tamanho das novas coletas e não o do dataset inteiro.
+
+Partições são tratadas como imutáveis: um arquivo já carregado não é relido.
+Se o CSV encolher ou o trecho já lido mudar, SourceRewritten sinaliza que é
+preciso recarregar tudo.
+"""
+import hashlib
+import io
+import os
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Bytes finais do trecho já lido usados para detectar reescrita do arquivo
+TAIL_BYTES = 4096
+
+
+class SourceRewritten(Exception):
+    """
+    O CSV foi truncado ou reescrito desde a última leitura
+    """
+
+
+@dataclass(frozen=True)
+class IngestState:
+    """
+    Posição já consumida do CSV e partições já carregadas
+    """
+    csv_bytes: int = 0
+    csv_rows: int = 0
+    tail_hash: str = ""
+    partitions: tuple = ()
+
+
+def partition_paths(directory, pattern):
+    if directory is None:
+        return []
+    return sorted(Path(directory).glob(pattern))
+
+
+def _tail_hash(fh, end):
+    start = max(0, end - TAIL_BYTES)
+    fh.seek(start)
+    return hashlib.sha1(fh.read(end - start)).hexdigest()
+
+
+def _complete_end(fh, size):
+    # Posição logo após a última quebra de linha: uma linha ainda sendo
+    # escrita fica para a próxima atualização
+    end = size
+    while end > 0:
+        start = max(0, end - TAIL_BYTES)
+        fh.seek(start)
+        newline = fh.read(end - start).rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        end = start
+    return 0
+
+
+def _read_partitions(paths):
+    return [pd.read_csv(path) for path in paths]
+
+
+def read_complete_lines(csv_path):
+    """
+    Linhas completas do CSV (a última, se ainda não terminou de ser escrita,
+    fica de fora), a posição logo após elas e o hash do trecho final. É a
+    mesma regra de state_at_end e read_new_rows, então um DataFrame lido
+    daqui (ou do cache Parquet gravado a partir dele) nunca repete nem perde
+    a linha que estava sendo escrita
+    """
+    with open(csv_path, "rb") as fh:
+        end = _complete_end(fh, os.fstat(fh.fileno()).st_size)
+        fh.seek(0)
+        df = pd.read_csv(io.BytesIO(fh.read(end)))
+        tail_hash = _tail_hash(fh, end)
+    return df, end, tail_hash
+
+
+def read_snapshot(csv_path, partition_dir=None, pattern="*.csv"):
+    """
+    Leitura completa: linhas completas do CSV mais todas as partições, com o
+    estado correspondente
+    """
+    df, end, tail_hash = read_complete_lines(csv_path)
+    state = IngestState(csv_bytes=end, csv_rows=len(df), tail_hash=tail_hash)
+    paths = partition_paths(partition_dir, pattern)
+    if paths:
+        df = pd.concat([df, *_read_partitions(paths)], ignore_index=True)
+    return df, replace(state, partitions=tuple(p.name for p in paths))
+
+
+def state_at_end(csv_path, rows, partition_dir=None, pattern="*.csv"):
+    """
+    Estado de um dataset já carregado por inteiro (ex.: vindo do cache Parquet)
+    """
+    with open(csv_path, "rb") as fh:
+        end = _complete_end(fh, os.fstat(fh.fileno()).st_size)
+        tail_hash = _tail_hash(fh, end)
+    partitions = tuple(p.name for p in partition_paths(partition_dir, pattern))
+    return IngestState(csv_bytes=end, csv_rows=rows, tail_hash=tail_hash, partitions=partitions)
+
+
+def read_new_rows(csv_path, state, partition_dir=None, pattern="*.csv"):
+    """
+    Linhas ainda não carregadas (trecho novo do CSV e partições novas) e o
+    estado atualizado; None quando não há nada novo
+    """
+    frames = []
+    csv_bytes, csv_rows, tail_hash = state.csv_bytes, state.csv_rows, state.tail_hash
+    with open(csv_path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < csv_bytes or _tail_hash(fh, csv_bytes) != tail_hash:
+            raise SourceRewritten(csv_path)
+        end = _complete_end(fh, size) if size > csv_bytes else csv_bytes
+        if end > csv_bytes:
+            # O trecho novo não tem cabeçalho: reaproveita o da primeira linha
+            fh.seek(0)
+            header = fh.readline()
+            fh.seek(csv_bytes)
+            chunk = pd.read_csv(io.BytesIO(header + fh.read(end - csv_bytes)))
+            frames.append(chunk)
+            csv_bytes, csv_rows = end, csv_rows + len(chunk)
+            tail_hash = _tail_hash(fh, end)
+
+    loaded = set(state.partitions)
+    new_paths = [p for p in partition_paths(partition_dir, pattern) if p.name not in loaded]
+    frames += _read_partitions(new_paths)
+
+    new_state = IngestState(
+        csv_bytes=csv_bytes,
+        csv_rows=csv_rows,
+        tail_hash=tail_hash,
+        partitions=state.partitions + tuple(p.name for p in new_paths),
+    )
+    if not frames:
+        return None, new_state
+    return pd.concat(frames, ignore_index=True), new_state
+
+
+class ColumnBuffers:
+    """
+    Colunas do dataset incremental em arrays com folga no final. append()
+    copia só as linhas novas para a folga (que cresce 25% quando acaba) e
+    devolve um DataFrame sobre as primeiras linhas dos arrays, sem copiá-las.
+    Linhas já publicadas nunca são reescritas, então os DataFrames devolvidos
+    antes continuam válidos. Um valor novo numa coluna categórica (ou um tipo
+    mais largo numa numérica) realoca a coluna inteira, o único caso que
+    percorre as linhas antigas
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.n_rows = len(df)
+        self._categories = {}
+        self._arrays = {}
+        for col in self.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                self._categories[col] = series.dtype
+                values = series.cat.codes.to_numpy()
+            else:
+                values = series.to_numpy()
+            self._arrays[col] = self._grow(values, max(self.n_rows, 1))
+
+    def _grow(self, values, capacity, dtype=None):
+        array = np.empty(capacity, dtype=values.dtype if dtype is None else dtype)
+        array[:len(values)] = values
+        return array
+
+    def frame(self):
+        """
+        DataFrame somente leitura sobre as linhas já acrescentadas
+        """
+        columns = {}
+        for col in self.columns:
+            values = self._arrays[col][:self.n_rows]
+            values.flags.writeable = False
+            if col in self._categories:
+                values = pd.Categorical.from_codes(values, dtype=self._categories[col], validate=False)
+            columns[col] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def _codes(self, col, new):
+        # Códigos das linhas novas; um valor que ainda não existia é unido (em
+        # ordem) às categorias e os códigos antigos são traduzidos
+        dtype = self._categories[col]
+        values = new.cat.categories if isinstance(new.dtype, pd.CategoricalDtype) else pd.Index(new.dropna().unique())
+        new_values = values.difference(dtype.categories)
+        codes_dtype = pd.Categorical([], dtype=dtype).codes.dtype
+        if len(new_values):
+            old_categories = dtype.categories
+            dtype = self._categories[col] = pd.CategoricalDtype(old_categories.union(new_values))
+            codes_dtype = pd.Categorical([], dtype=dtype).codes.dtype
+            # -1 (valor ausente) continua -1: é o último item do mapa
+            recode = np.append(dtype.categories.get_indexer(old_categories), -1)
+            old = recode[self._arrays[col][:self.n_rows]].astype(codes_dtype)
+            self._arrays[col] = self._grow(old, len(self._arrays[col]))
+        # Códigos pela posição nas categorias, não por astype: o pandas considera
+        # iguais dtypes não ordenados com as mesmas categorias em outra ordem e
+        # não recodifica
+        if isinstance(new.dtype, pd.CategoricalDtype):
+            recode = np.append(dtype.categories.get_indexer(new.cat.categories), -1)
+            return recode[new.cat.codes.to_numpy()].astype(codes_dtype)
+        return dtype.categories.get_indexer(new.to_numpy()).astype(codes_dtype)
+
+    def append(self, delta):
+        """
+        Acrescenta as linhas de `delta` (mesmas colunas, em qualquer ordem) e
+        devolve o DataFrame com todas as linhas
+        """
+        missing = pd.Index(self.columns).difference(delta.columns)
+        if len(missing):
+            raise ValueError(f"Colunas ausentes nas linhas novas: {', '.join(missing)}")
+        start, stop = self.n_rows, self.n_rows + len(delta)
+        for col in self.columns:
+            if col in self._categories:
+                values = self._codes(col, delta[col])
+            else:
+                values = delta[col].to_numpy()
+            array = self._arrays[col]
+            dtype = np.result_type(array.dtype, values.dtype)
+            if stop > len(array) or dtype != array.dtype:
+                array = self._arrays[col] = self._grow(array[:start], max(len(array), stop + stop // 4), dtype)
+            array[start:stop] = values
+        self.n_rows = stop
+        return self.frame()
@@ -0,0 +1,216 @@
+"""
+Motor de estatísticas suficientes para intervalos de confiança e testes.
+
+Os momentos (n, média, somas centradas de ordem 2 a 4, mínimo e máximo) são
+calculados em uma única passada vetorizada por blocos: cada bloco é resumido
+com NumPy (soma pairwise) e os resumos são combinados pelas fórmulas de
+Chan/Pébay. Média, desvio padrão, assimetria, curtose, intervalos e testes t
+derivam desses momentos sem voltar aos dados brutos.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# Tamanho dos blocos: cabe no cache da CPU e mantém a soma pairwise precisa
+BLOCK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class Moments:
+    """
+    Momentos centrais acumulados de uma coluna (combináveis com merge)
+    """
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    m3: float = 0.0
+    m4: float = 0.0
+    min: float = np.inf
+    max: float = -np.inf
+
+    @classmethod
+    def from_values(cls, values, block_size=BLOCK_SIZE):
+        values = np.asarray(values)
+        result = cls()
+        for start in range(0, len(values), block_size):
+            block = values[start:start + block_size].astype(np.float64, copy=False)
+            mean = block.mean()
+            d = block - mean
+            d2 = d * d
+            result = result.merge(cls(
+                n=len(block),
+                mean=mean,
+                m2=d2.sum(),
+                m3=(d2 * d).sum(),
+                m4=(d2 * d2).sum(),
+                min=block.min(),
+                max=block.max(),
+            ))
+        return result
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        mean = self.mean + delta_n * nb
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (
+            self.m3 + other.m3
+            + delta * delta_n ** 2 * na * nb * (na - nb)
+            + 3 * delta_n * (na * other.m2 - nb * self.m2)
+        )
+        m4 = (
+            self.m4 + other.m4
+            + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+            + 6 * delta_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+            + 4 * delta_n * (na * other.m3 - nb * self.m3)
+        )
+        return Moments(n, mean, m2, m3, m4, min(self.min, other.min), max(self.max, other.max))
+
+    @property
+    def var(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    @property
+    def cv(self):
+        return self.std / self.mean * 100
+
+    @property
+    def skew(self):
+        # Mesmo estimador (viesado) de scipy.stats.skew
+        return np.sqrt(self.n) * self.m3 / self.m2 ** 1.5 if self.m2 > 0 else np.nan
+
+    @property
+    def kurtosis(self):
+        # Curtose em excesso (Fisher), como scipy.stats.kurtosis
+        return self.n * self.m4 / self.m2 ** 2 - 3 if self.m2 > 0 else np.nan
+
+
+@dataclass(frozen=True)
+class CoMoments:
+    """
+    Momentos conjuntos de duas colunas para a correlação de Pearson
+    """
+    n: int = 0
+    mean_x: float = 0.0
+    mean_y: float = 0.0
+    m2_x: float = 0.0
+    m2_y: float = 0.0
+    c_xy: float = 0.0
+
+    @classmethod
+    def from_values(cls, x, y, block_size=BLOCK_SIZE):
+        x, y = np.asarray(x), np.asarray(y)
+        result = cls()
+        for start in range(0, len(x), block_size):
+            bx = x[start:start + block_size].astype(np.float64, copy=False)
+            by = y[start:start + block_size].astype(np.float64, copy=False)
+            mx, my = bx.mean(), by.mean()
+            dx, dy = bx - mx, by - my
+            result = result.merge(cls(len(bx), mx, my, (dx * dx).sum(), (dy * dy).sum(), (dx * dy).sum()))
+        return result
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        na, nb = self.n, other.n
+        n = na + nb
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        factor = na * nb / n
+        return CoMoments(
+            n,
+            self.mean_x + dx * nb / n,
+            self.mean_y + dy * nb / n,
+            self.m2_x + other.m2_x + dx * dx * factor,
+            self.m2_y + other.m2_y + dy * dy * factor,
+            self.c_xy + other.c_xy + dx * dy * factor,
+        )
+
+    @property
+    def r(self):
+        return self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+
+
+@dataclass(frozen=True)
+class Interval:
+    estimate: float
+    se: float
+    critical: float
+    margin: float
+    lower: float
+    upper: float
+
+
+def z_interval(moments, confidence):
+    """
+    Intervalo de confiança (normal) para a média
+    """
+    # scipy.stats leva ~0,5 s para importar: só quando um intervalo é pedido
+    from scipy import stats
+
+    se = moments.std / np.sqrt(moments.n)
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    margin = z * se
+    return Interval(moments.mean, se, z, margin, moments.mean - margin, moments.mean + margin)
+
+
+def proportion_interval(successes, n, confidence):
+    """
+    Intervalo de confiança (Wald) para uma proporção
+    """
+    from scipy import stats
+
+    p = successes / n
+    se = np.sqrt(p * (1 - p) / n)
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    margin = z * se
+    return Interval(p, se, z, margin, p - margin, p + margin)
+
+
+def ttest_from_moments(a, b, equal_var=True):
+    """
+    Teste t de duas amostras independentes a partir dos momentos de cada grupo
+    """
+    from scipy import stats
+
+    return stats.ttest_ind_from_stats(a.mean, a.std, a.n, b.mean, b.std, b.n, equal_var=equal_var)
+
+
+def pearson_test(comoments):
+    """
+    Coeficiente de Pearson e teste t com n - 2 graus de liberdade
+    """
+    from scipy import stats
+
+    r, n = comoments.r, comoments.n
+    t_stat = r * np.sqrt((n - 2) / (1 - r**2))
+    p_value = 2 * (1 - stats.t.cdf(abs(t_stat), n - 2))
+    return r, t_stat, p_value
+
+
+def select_values(df, column, where=None):
+    """
+    Valores de `column`, opcionalmente restritos por `where` = (coluna, op, valor)
+    com op em {"==", "!="}
+    """
+    values = df[column].to_numpy()
+    if where is None:
+        return values
+    where_col, op, value = where
+    mask = (df[where_col] == value).to_numpy()
+    if op == "!=":
+        mask = ~mask
+    elif op != "==":
+        raise ValueError(f"Operador não suportado: {op}")
+    return values[mask]
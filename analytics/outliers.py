@@ -0,0 +1,52 @@
+"""
+Identificação de outliers pela regra do intervalo interquartil (IQR).
+"""
+import numpy as np
+import pandas as pd
+
+IQR_FACTOR = 1.5
+
+# Formas de cálculo oferecidas na aba 3: (rótulo, quartis do sketch, contagem
+# exata); a primeira é a padrão da página, exata como a tabela do describe()
+OUTLIER_METHODS = {
+    "exact": ("Exato (percentis e contagem)", False, True),
+    "sketch_exact": ("t-digest + contagem exata (quartis aproximados)", True, True),
+    "sketch": ("t-digest (aproximado)", True, False),
+}
+
+
+def iqr_outliers(df, columns, factor=IQR_FACTOR, sketches=None, exact_counts=True):
+    """
+    Quartis, limites de Tukey e quantidade/percentual de outliers por coluna
+    (conta os valores fora dos limites sem materializar as linhas).
+
+    Com `sketches` ({coluna: TDigest}), os quartis saem dos sketches e as
+    contagens também, a menos que `exact_counts` peça a contagem exata sobre
+    a coluna com np.count_nonzero
+    """
+    rows = []
+    for col in columns:
+        values = df[col].to_numpy()
+        sketch = sketches.get(col) if sketches else None
+        if sketch is None:
+            # Interpolação linear, como Series.quantile
+            q1, q3 = np.percentile(values, [25, 75])
+        else:
+            q1, q3 = sketch.quantile([0.25, 0.75])
+        iqr = q3 - q1
+        lower, upper = q1 - factor * iqr, q3 + factor * iqr
+        if sketch is None or exact_counts:
+            count = int(np.count_nonzero((values < lower) | (values > upper)))
+        else:
+            count = int(round(sketch.count_outside(lower, upper)))
+        rows.append({
+            'Variável': col,
+            'Q1': q1,
+            'Q3': q3,
+            'IQR': iqr,
+            'Limite Inferior': lower,
+            'Limite Superior': upper,
+            'Outliers': count,
+            'Percentual': count / len(values) * 100 if len(values) else 0.0,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,62 @@
+"""
+Execução concorrente de cálculos independentes.
+
+Os testes de hipótese e as tabelas por categoria não dependem uns dos outros;
+em vez de rodarem em sequência na thread do script, são enviados a um pool e
+juntados antes da renderização. O modo é escolhido por DASHBOARD_EXECUTOR:
+
+- "thread" (padrão): NumPy/SciPy liberam o GIL nos laços internos;
+- "process": para cálculos pesados em Python puro (os argumentos são
+  serializados para os processos, então vale só quando o cálculo domina);
+- "serial": executa na própria thread, sem pool.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+EXECUTOR_ENV = "DASHBOARD_EXECUTOR"
+EXECUTOR_MODES = ("thread", "process", "serial")
+
+
+def available_cpus():
+    # Respeita a afinidade do processo (limites de CPU do container)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+MAX_WORKERS = min(4, available_cpus())
+
+
+def executor_mode(mode=None):
+    mode = mode or os.environ.get(EXECUTOR_ENV, "thread")
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(f"Modo de execução desconhecido: {mode}")
+    # Com um único núcleo o pool só acrescenta custo
+    return "serial" if MAX_WORKERS == 1 else mode
+
+
+@lru_cache(maxsize=None)
+def get_executor(mode, max_workers=MAX_WORKERS):
+    """
+    Pool reaproveitado entre execuções (criar processos a cada rerun custaria
+    mais que os próprios cálculos)
+    """
+    if mode == "process":
+        # spawn: não herda as threads do servidor do Streamlit, como o fork faria
+        return ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers, thread_name_prefix="analytics")
+
+
+def run_tasks(tasks, mode=None):
+    """
+    Executa {nome: (função, *args)} e devolve {nome: resultado} na mesma ordem;
+    exceções das tarefas são propagadas
+    """
+    mode = executor_mode(mode)
+    if mode == "serial" or len(tasks) <= 1:
+        return {name: fn(*args) for name, (fn, *args) in tasks.items()}
+    executor = get_executor(mode)
+    futures = {name: executor.submit(fn, *args) for name, (fn, *args) in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
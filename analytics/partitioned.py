@@ -0,0 +1,239 @@
+"""
+Dataset Parquet particionado (estilo Hive) para os filtros da aba 4.
+
+As linhas são gravadas em data/flights_dataset/<versão>/airline=<...>/source_city=<...>/
+e, dentro de cada arquivo, ordenadas por preço em grupos de linhas pequenos.
+Cada versão do dataset tem o seu diretório, que nunca é regravado: quem ainda
+lê uma versão anterior não vê os arquivos trocados no meio da leitura. O
+diretório guarda também a identificação do arquivo de origem de que foi
+gravado (find_version), de modo que os outros processos descobrem a versão
+atual sem carregar o DataFrame.
+Uma seleção da barra lateral vira uma expressão do pyarrow.dataset: os filtros
+de companhia e cidade de origem descartam diretórios inteiros, e os de preço e
+duração descartam grupos de linhas pelas estatísticas (mínimo/máximo) gravadas
+no Parquet. Só o que sobra é lido e convertido para pandas, na ordem
+original das linhas.
+"""
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow é opcional: sem ele o dashboard filtra em memória
+    pa = ds = None
+
+PARTITION_COLUMNS = ["airline", "source_city"]
+# Coluna usada para ordenar as linhas de cada arquivo (estatísticas mais seletivas)
+SORT_COLUMN = "price"
+ROW_GROUP_ROWS = 4096
+# Posição da linha no DataFrame original, para devolver as linhas na mesma ordem
+ROW_COLUMN = "__row__"
+# Versão do dataset gravada junto aos arquivos
+FINGERPRINT_FILE = "_fingerprint"
+# Identificação (tamanho e mtime) do arquivo de origem desta versão
+SOURCE_FILE = "_source"
+# Versões mantidas em disco (a atual e a anterior, ainda em uso por sessões
+# que leram o fingerprint antes da atualização)
+KEEP_VERSIONS = 2
+
+
+def pyarrow_available():
+    return ds is not None
+
+
+def dataset_dir(root, fingerprint):
+    return Path(root) / fingerprint
+
+
+def dataset_fingerprint_on_disk(directory):
+    try:
+        return (Path(directory) / FINGERPRINT_FILE).read_text().strip()
+    except OSError:
+        return None
+
+
+def find_version(root, source):
+    """
+    Fingerprint da versão gravada a partir do arquivo de origem `source`
+    (ver colstore.source_key), ou None se ela ainda não foi gravada
+    """
+    if not Path(root).is_dir():
+        return None
+    for directory in Path(root).iterdir():
+        if directory.name.startswith("."):
+            continue
+        try:
+            if (directory / SOURCE_FILE).read_text().strip() != source:
+                continue
+        except OSError:
+            continue
+        return dataset_fingerprint_on_disk(directory)
+    return None
+
+
+def write_dataset(df, root, fingerprint, partition_cols=PARTITION_COLUMNS, source=None):
+    """
+    Grava o DataFrame particionado em `root/<fingerprint>` e devolve esse
+    diretório. A gravação ocorre num diretório temporário renomeado no final;
+    se outro processo gravar a mesma versão primeiro, a cópia dele é mantida.
+    `source` identifica o arquivo de origem para find_version
+    """
+    directory = dataset_dir(root, fingerprint)
+    # Sessões do Streamlit são threads do mesmo processo: o nome inclui as duas
+    tmp_root = directory.with_name(f".{fingerprint}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.rmtree(tmp_root, ignore_errors=True)
+
+    order = np.argsort(df[SORT_COLUMN].to_numpy(), kind="stable")
+    table = pa.Table.from_pandas(df.iloc[order], preserve_index=False)
+    table = table.append_column(ROW_COLUMN, pa.array(order, type=pa.int64()))
+    # Os valores das partições vão nos nomes dos diretórios, como texto
+    for col in partition_cols:
+        position = table.schema.get_field_index(col)
+        table = table.set_column(position, col, table[col].cast(pa.string()))
+    ds.write_dataset(
+        table,
+        tmp_root,
+        format="parquet",
+        partitioning=ds.partitioning(table.select(partition_cols).schema, flavor="hive"),
+        max_rows_per_group=ROW_GROUP_ROWS,
+        min_rows_per_group=min(ROW_GROUP_ROWS, 1024),
+    )
+    (tmp_root / FINGERPRINT_FILE).write_text(fingerprint)
+    if source is not None:
+        (tmp_root / SOURCE_FILE).write_text(source)
+
+    try:
+        os.replace(tmp_root, directory)
+    except OSError:
+        # Versão já gravada por outro processo (diretório não vazio), ou a
+        # partir de outro arquivo de origem com o mesmo conteúdo
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        if source is not None:
+            (directory / SOURCE_FILE).write_text(source)
+    remove_old_versions(root, keep=directory.name)
+    return directory
+
+
+def remove_old_versions(root, keep, keep_versions=KEEP_VERSIONS):
+    """
+    Remove as versões mais antigas (pela data de gravação), mantendo `keep`
+    e as mais recentes até somar `keep_versions`
+    """
+    versions = [
+        path for path in Path(root).iterdir()
+        if path.is_dir() and path.name != keep and not path.name.startswith(".")
+    ]
+    versions.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in versions[keep_versions - 1:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def open_dataset(root):
+    return ds.dataset(
+        root,
+        format="parquet",
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+        exclude_invalid_files=True,
+        ignore_prefixes=[".", "_"],
+    )
+
+
+def filter_expression(dataset, filters):
+    """
+    Expressão equivalente a FlightFilters; os limites dos intervalos usam o
+    tipo da coluna (float32 da duração), como FilterIndex
+    """
+    expression = None
+    # Nenhum valor selecionado não deixa linha alguma (como em FilterIndex)
+    parts = [
+        ds.field(col).isin(list(values)) if values else ds.scalar(False)
+        for col, values in filters.categories
+    ]
+    for col, (low, high) in filters.ranges:
+        column_type = dataset.schema.field(col).type
+        parts.append(
+            (ds.field(col) >= pa.scalar(low).cast(column_type))
+            & (ds.field(col) <= pa.scalar(high).cast(column_type))
+        )
+    for part in parts:
+        expression = part if expression is None else expression & part
+    return expression
+
+
+def read_filtered(dataset, filters, columns=None):
+    """
+    Linhas que atendem aos filtros, lendo só partições e grupos de linhas
+    que podem conter alguma delas
+    """
+    return read_columns(dataset, columns, filter_expression(dataset, filters))
+
+
+def read_columns(dataset, columns=None, expression=None):
+    """
+    Colunas `columns` (todas, se None) das linhas que atendem a `expression`,
+    na ordem original das linhas
+    """
+    # Sem repetir colunas pedidas duas vezes (ex.: agrupamento e eixo)
+    columns = data_columns(dataset) if columns is None else list(dict.fromkeys(columns))
+    table = dataset.to_table(columns=[*columns, ROW_COLUMN], filter=expression)
+    table = table.sort_by(ROW_COLUMN).drop_columns([ROW_COLUMN])
+    # As colunas de partição voltam como dicionário na ordem das pastas: em
+    # texto, o esquema do chamador recria as categorias como no DataFrame original
+    for position, field in enumerate(table.schema):
+        if field.name in PARTITION_COLUMNS and pa.types.is_dictionary(field.type):
+            table = table.set_column(position, field.name, table[field.name].cast(pa.string()))
+    return table.to_pandas()
+
+
+def column_bounds(dataset, col):
+    """
+    Mínimo e máximo de `col` pelas estatísticas dos grupos de linhas (sem ler dados)
+    """
+    low = high = None
+    for fragment in dataset.get_fragments():
+        for row_group in fragment.row_groups:
+            stats = row_group.statistics.get(col)
+            if stats is None:
+                continue
+            low = stats["min"] if low is None else min(low, stats["min"])
+            high = stats["max"] if high is None else max(high, stats["max"])
+    return low, high
+
+
+class DatasetOptions:
+    """
+    Valores e limites das colunas filtráveis a partir do dataset em disco,
+    com a mesma interface de FilterIndex (values/bounds)
+    """
+
+    def __init__(self, dataset, category_columns, range_columns):
+        # Valores na ordem da primeira linha em que aparecem no DataFrame
+        # original, como FilterIndex (pd.factorize)
+        self._values = {}
+        table = dataset.to_table(columns=[*category_columns, ROW_COLUMN])
+        for col in category_columns:
+            first_rows = table.group_by(col).aggregate([(ROW_COLUMN, "min")])
+            first_rows = first_rows.sort_by(f"{ROW_COLUMN}_min")
+            self._values[col] = [value for value in first_rows[col].to_pylist() if value is not None]
+
+        self._bounds = {col: column_bounds(dataset, col) for col in range_columns}
+
+    def values(self, col):
+        return list(self._values[col])
+
+    def bounds(self, col):
+        return self._bounds[col]
+
+
+def data_columns(dataset):
+    # Ordem original das colunas (as de partição vêm por último no esquema)
+    metadata = dataset.schema.pandas_metadata
+    if metadata:
+        return [col["name"] for col in metadata["columns"] if col["name"] in dataset.schema.names]
+    return [name for name in dataset.schema.names if name != ROW_COLUMN]
+
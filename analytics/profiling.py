@@ -0,0 +1,92 @@
+"""
+Medição do custo de cada execução (rerun) das páginas.
+
+Cada trecho da página é envolvido por `Profiler.section`, que registra o tempo
+de parede, o número de linhas processadas e, para gráficos, o tamanho do JSON
+enviado ao navegador. Os registros podem ser exportados como JSON lines para
+acompanhar regressões ao longo do tempo.
+"""
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+# Arquivo opcional onde cada execução medida é acrescentada (JSON lines)
+PROFILE_LOG_ENV = "DASHBOARD_PROFILE_LOG"
+
+
+@dataclass
+class Timing:
+    section: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    payload_bytes: Optional[int] = None
+    enabled: bool = field(default=True, repr=False)
+
+    def record_figure(self, fig):
+        # Serializar de novo custa tempo, então só é feito com a medição ligada
+        if self.enabled:
+            self.payload_bytes = len(fig.to_json())
+
+
+class Profiler:
+    """
+    Coleta os tempos das seções de uma execução; desligado, não registra nada
+    """
+
+    def __init__(self, page, enabled=True):
+        self.page = page
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.timings = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def section(self, name, rows=None):
+        timing = Timing(name, rows=rows, enabled=self.enabled)
+        if not self.enabled:
+            yield timing
+            return
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - start
+            self.timings.append(timing)
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def records(self):
+        return [
+            {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "page": self.page,
+                "section": t.section,
+                "ms": round(t.seconds * 1000, 3),
+                "rows": t.rows,
+                "payload_bytes": t.payload_bytes,
+            }
+            for t in self.timings
+        ]
+
+
+def to_jsonl(records):
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def append_log(records, path=None):
+    """
+    Acrescenta os registros ao arquivo indicado em DASHBOARD_PROFILE_LOG, se houver
+    """
+    path = path or os.environ.get(PROFILE_LOG_ENV)
+    if not path or not records:
+        return
+    with open(path, "a", encoding="utf-8") as log:
+        log.write(to_jsonl(records))
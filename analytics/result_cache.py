@@ -0,0 +1,337 @@
+"""
+Cache de resultados compartilhado entre processos, réplicas e reinícios.
+
+O st.cache_data vive na memória de um único processo: cada réplica e cada
+reinício do contêiner recalculam tudo. Este cache guarda os resultados das
+análises (tabelas por categoria, testes, figuras em JSON) fora do processo,
+em um de dois backends:
+
+- SQLiteBackend: um arquivo SQLite local (padrão), compartilhado pelos
+  processos do mesmo host ou por um volume montado pelas réplicas;
+- RedisBackend: qualquer servidor que fale o protocolo do Redis (RESP), por
+  exemplo um Redis/Valkey local ao lado do contêiner.
+
+As chaves são hashes do conteúdo: nome do resultado, versão do código das
+análises, versão do dataset e parâmetros. Os valores expiram após um TTL e o
+backend SQLite descarta os menos usados quando passa do limite de tamanho (no
+Redis, o limite é o maxmemory do servidor). Falhas do backend nunca quebram a
+página: a leitura vira uma falta e a gravação é ignorada.
+
+Os valores são serializados com pickle, e desserializar um pickle executa
+código: o backend precisa ser tão confiável quanto o próprio código do
+dashboard. O arquivo SQLite deve ficar em um diretório que só o dashboard
+grava, e o servidor Redis em uma rede privada, com senha, sem outros
+clientes que possam escrever nas chaves "dashboard:*".
+"""
+import hashlib
+import logging
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_MB = 256
+# Resultados maiores que isto não são compartilhados (ex.: linhas filtradas)
+MAX_VALUE_BYTES = 16 * 1024**2
+KEY_PREFIX = "dashboard:"
+# Após uma falha do backend, segundos sem tentar de novo (evita esperar o
+# timeout da conexão a cada resultado)
+RETRY_AFTER = 30
+# Último acesso (para o LRU do SQLite) gravado em lote: a cada N leituras ou
+# após alguns segundos, em vez de uma escrita por leitura
+ACCESS_BATCH = 64
+ACCESS_FLUSH_SECONDS = 5.0
+
+
+def code_version(paths=None):
+    """
+    Hash do código que produz os valores em cache (por padrão, o pacote
+    analytics): resultados gravados por outra versão do código não são
+    reaproveitados
+    """
+    if paths is None:
+        paths = Path(__file__).parent.glob("*.py")
+    digest = hashlib.sha1()
+    for path in sorted(Path(path) for path in paths):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def result_key(name, version, params):
+    # repr é determinístico para os parâmetros usados (tuplas, números,
+    # textos e FlightFilters normalizados)
+    return hashlib.sha256(repr((name, version, params)).encode()).hexdigest()
+
+
+class SQLiteBackend:
+    """
+    Tabela chave → valor com expiração e último acesso (para o LRU)
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_MB * 1024**2):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._flushed_at = time.monotonic()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= ACCESS_BATCH or time.monotonic() - self._flushed_at > ACCESS_FLUSH_SECONDS:
+                self._flush_access()
+        return row[0]
+
+    def _flush_access(self):
+        # Uma transação para todos os acessos pendentes
+        if self._touched:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "UPDATE results SET accessed = ? WHERE key = ?",
+                    [(accessed, key) for key, accessed in self._touched.items()],
+                )
+            self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._touched.pop(key, None)
+            self._flush_access()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + ttl, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        # Expirados primeiro; depois os menos usados até caber no limite
+        self._conn.execute("DELETE FROM results WHERE expires < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running "
+            "FROM results) WHERE running > ?)",
+            (self.max_bytes,),
+        )
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": count, "bytes": size}
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM results")
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisBackend:
+    """
+    Cliente mínimo do protocolo RESP (GET/SET com EX), sem dependências
+    """
+
+    def __init__(self, url, timeout=2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock = None
+        self._reader = None
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        try:
+            if self.password:
+                self._command("AUTH", self.password)
+            if self.db:
+                self._command("SELECT", self.db)
+        except Exception:
+            # Conexão sem autenticação ou no banco errado não é reaproveitada
+            self._close()
+            raise
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._reader = None
+
+    def _command(self, *args):
+        parts = [arg if isinstance(arg, bytes) else str(arg).encode() for arg in args]
+        payload = b"".join([f"*{len(parts)}\r\n".encode()] + [
+            b"$%d\r\n%s\r\n" % (len(part), part) for part in parts
+        ])
+        self._sock.sendall(payload)
+        return self._reply()
+
+    def _reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Conexão encerrada pelo servidor")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RedisError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            # Leitura curta: a conexão caiu no meio do valor
+            if len(data) < length + 2:
+                raise ConnectionError("Conexão encerrada no meio da resposta")
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._reply() for _ in range(length)]
+        raise RedisError(f"Resposta RESP inesperada: {line!r}")
+
+    def _call(self, *args):
+        with self._lock:
+            # Uma reconexão por chamada se o servidor fechou a conexão
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._command(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt:
+                        raise
+
+    def get(self, key):
+        return self._call("GET", KEY_PREFIX + key)
+
+    def set(self, key, value, ttl):
+        self._call("SET", KEY_PREFIX + key, value, "EX", max(1, int(ttl)))
+
+    def stats(self):
+        return {"server": f"{self.host}:{self.port}/{self.db}"}
+
+    def clear(self):
+        # Remove só as chaves do dashboard
+        cursor = b"0"
+        while True:
+            cursor, keys = self._call("SCAN", cursor, "MATCH", KEY_PREFIX + "*", "COUNT", 500)
+            if keys:
+                self._call("DEL", *keys)
+            if cursor == b"0":
+                break
+
+
+class ResultCache:
+    """
+    Resultados serializados com pickle em um backend; `backend=None` desliga
+    o cache (tudo é recalculado). Só use backends confiáveis: um valor
+    adulterado no backend executa código ao ser lido
+    """
+
+    def __init__(self, backend, ttl=DEFAULT_TTL, version=None, max_value_bytes=MAX_VALUE_BYTES):
+        self.backend = backend
+        self.ttl = ttl
+        self.version = code_version() if version is None else version
+        self.max_value_bytes = max_value_bytes
+        self._retry_at = 0.0
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def get_or_compute(self, name, params, compute):
+        if self.backend is None:
+            return compute()
+        key = result_key(name, self.version, params)
+        value = self._get(key)
+        if value is not None:
+            try:
+                return pickle.loads(value)
+            except Exception:
+                logger.warning("Resultado em cache ilegível para %s; recalculando", name)
+        result = compute()
+        self.put_bytes(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    def get_bytes(self, name, params):
+        if self.backend is None:
+            return None
+        return self._get(result_key(name, self.version, params))
+
+    def set_bytes(self, name, params, value):
+        if self.backend is not None:
+            self.put_bytes(result_key(name, self.version, params), value)
+
+    def _get(self, key):
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            return self.backend.get(key)
+        except Exception as exc:
+            self._retry_at = time.monotonic() + RETRY_AFTER
+            logger.warning("Falha ao ler o cache de resultados: %s", exc)
+            return None
+
+    def put_bytes(self, key, value):
+        if len(value) > self.max_value_bytes or time.monotonic() < self._retry_at:
+            return
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as exc:
+            self._retry_at = time.monotonic() + RETRY_AFTER
+            logger.warning("Falha ao gravar no cache de resultados: %s", exc)
+
+
+def open_result_cache(spec, default_path, ttl=DEFAULT_TTL, max_mb=DEFAULT_MAX_MB, version=None):
+    """
+    Cache a partir da configuração: "off", "sqlite" (arquivo padrão),
+    "sqlite:///caminho/arquivo.sqlite" ou "redis://[:senha@]host:porta/db"
+    """
+    spec = (spec or "sqlite").strip()
+    if spec == "off":
+        return ResultCache(None)
+    if spec.startswith("redis://"):
+        return ResultCache(RedisBackend(spec), ttl=ttl, version=version)
+    if spec == "sqlite":
+        path = default_path
+    elif spec.startswith("sqlite:///"):
+        path = spec[len("sqlite:///"):]
+    else:
+        raise ValueError(f"Cache de resultados desconhecido: {spec}")
+    try:
+        return ResultCache(SQLiteBackend(path, int(max_mb * 1024**2)), ttl=ttl, version=version)
+    except (OSError, sqlite3.Error) as exc:
+        # Disco somente leitura, por exemplo: segue sem o cache compartilhado
+        logger.warning("Cache de resultados desativado (%s): %s", path, exc)
+        return ResultCache(None)
@@ -0,0 +1,25 @@
+"""
+Estatísticas por rota (origem -> destino).
+"""
+ROUTE_DIMENSIONS = ['source_city', 'destination_city']
+
+
+def route_stats(cube, filters=None):
+    """
+    Quantidade de voos, preço e duração médios por rota, com o rótulo da rota
+    """
+    summary = cube.rollup(ROUTE_DIMENSIONS, filters)
+    routes = summary[['count', 'price_mean', 'duration_mean']].reset_index()
+    routes.insert(
+        0, 'route',
+        routes['source_city'].astype(str) + ' → ' + routes['destination_city'].astype(str),
+    )
+    return routes
+
+
+def most_popular_route(routes):
+    """
+    (origem, destino) da rota com mais voos
+    """
+    top = routes.loc[routes['count'].idxmax()]
+    return top['source_city'], top['destination_city']
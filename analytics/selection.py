@@ -0,0 +1,81 @@
+"""
+Resumo e insights da seleção de filtros da aba de visualizações interativas.
+
+Tudo sai do cubo de agregados (ou, quando os filtros de preço e duração cortam
+linhas, das próprias linhas filtradas, com a mesma interface): métricas
+gerais, agregados por companhia, rota, horário, paradas e antecedência, e as
+recomendações exibidas na página.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from analytics.routes import most_popular_route, route_stats
+
+# |r| abaixo deste valor: preço considerado estável em relação à antecedência
+PRICE_TREND_THRESHOLD = 0.1
+
+
+@dataclass
+class SelectionSummary:
+    overall: pd.Series
+    airlines: pd.DataFrame
+    routes: pd.DataFrame
+    departures: pd.DataFrame
+    stops: pd.DataFrame
+    days_left: pd.DataFrame
+    days_price_correlation: float
+
+
+@dataclass
+class SelectionInsights:
+    most_expensive_airline: str
+    most_expensive_price: float
+    popular_route: tuple
+    best_departure_time: str
+    best_departure_price: float
+    price_trend: str
+    direct_cheaper: bool
+
+
+def summarize_selection(cube, filters, days_cube=None):
+    """
+    Agregados da seleção usados pelas métricas, gráficos e insights; o perfil
+    por antecedência vem de `days_cube` quando informado
+    """
+    days_cube = cube if days_cube is None else days_cube
+    return SelectionSummary(
+        overall=cube.rollup([], filters).iloc[0],
+        airlines=cube.rollup('airline', filters),
+        routes=route_stats(cube, filters),
+        departures=cube.rollup('departure_time', filters),
+        stops=cube.rollup('stops', filters),
+        days_left=days_cube.rollup('days_left', filters),
+        days_price_correlation=cube.correlation('days_left', 'price', filters),
+    )
+
+
+def price_trend(correlation, threshold=PRICE_TREND_THRESHOLD):
+    """
+    "sobe" se o preço cresce com a antecedência, "cai" se diminui, senão "estável"
+    """
+    if correlation > threshold:
+        return "sobe"
+    if correlation < -threshold:
+        return "cai"
+    return "estável"
+
+
+def selection_insights(summary):
+    airline_prices = summary.airlines['price_mean']
+    departure_prices = summary.departures['price_mean']
+    stops_prices = summary.stops['price_mean']
+    return SelectionInsights(
+        most_expensive_airline=airline_prices.idxmax(),
+        most_expensive_price=airline_prices.max(),
+        popular_route=most_popular_route(summary.routes),
+        best_departure_time=departure_prices.idxmin(),
+        best_departure_price=departure_prices.min(),
+        price_trend=price_trend(summary.days_price_correlation),
+        direct_cheaper=stops_prices.get('zero', float('nan')) < stops_prices.get('one', 0),
+    )
@@ -0,0 +1,173 @@
+"""
+Sketches de quantis (t-digest) combináveis.
+
+Um t-digest resume uma coluna em algumas centenas de centróides (média e
+peso), pequenos nas caudas e maiores no meio da distribuição, segundo a
+função de escala k1 = δ/2π · asen(2q − 1). Quartis, mediana, limites de
+outliers e contagens abaixo/acima de um valor saem dos centróides por
+interpolação, sem voltar às linhas. Dois sketches são combinados juntando e
+recomprimindo os centróides, o que permite mantê-los junto ao cache dos dados
+(inclusive na ingestão incremental) e por categoria (category_sketches).
+
+A construção é vetorizada: os valores são ordenados uma vez (por grupo) e os
+centróides saem de um np.bincount sobre o índice k de cada ponto.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from analytics.grouped import group_codes
+
+COMPRESSION = 500
+
+
+def _scale(q, compression):
+    # Índice k1 deslocado para começar em zero: 0 <= k <= δ/2
+    return np.floor(compression / (2 * np.pi) * np.arcsin(2 * q - 1) + compression / 4)
+
+
+@dataclass(frozen=True)
+class TDigest:
+    """
+    Centróides ordenados por média, mínimo e máximo da coluna
+    """
+    means: np.ndarray
+    weights: np.ndarray
+    min: float = np.inf
+    max: float = -np.inf
+    compression: float = COMPRESSION
+
+    @property
+    def n(self):
+        return float(self.weights.sum())
+
+    @classmethod
+    def from_values(cls, values, compression=COMPRESSION):
+        values = np.asarray(values)
+        sketches = cls.grouped(np.zeros(len(values), dtype=np.int64), values, 1, compression)
+        return sketches[0]
+
+    @classmethod
+    def grouped(cls, codes, values, k, compression=COMPRESSION):
+        """
+        Um sketch por grupo 0..k-1 (códigos como os de group_codes; -1 e NaN
+        são ignorados)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[valid], values[valid]
+        order = np.lexsort((values, codes))
+        codes, values = codes[order], values[order]
+
+        counts = np.bincount(codes, minlength=k)
+        starts = np.cumsum(counts) - counts
+        rank = np.arange(len(values)) - starts[codes]
+        q = (rank + 0.5) / counts[codes]
+        # Chave (grupo, k): pontos consecutivos com o mesmo k formam um centróide
+        stride = int(compression // 2) + 2
+        keys, inverse = np.unique(codes * stride + _scale(q, compression).astype(np.int64), return_inverse=True)
+        weights = np.bincount(inverse).astype(np.float64)
+        means = np.bincount(inverse, weights=values) / weights
+        bounds = np.searchsorted(keys // stride, np.arange(k + 1))
+
+        sketches = []
+        for g in range(k):
+            lo, hi = bounds[g], bounds[g + 1]
+            if counts[g] == 0:
+                sketches.append(cls(np.empty(0), np.empty(0), compression=compression))
+                continue
+            sketches.append(cls(
+                means[lo:hi], weights[lo:hi],
+                values[starts[g]], values[starts[g] + counts[g] - 1], compression,
+            ))
+        return sketches
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        means = np.concatenate([self.means, other.means])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        # Recomprime com a mesma escala, agora sobre os pesos dos centróides
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        _, inverse = np.unique(_scale(q, self.compression), return_inverse=True)
+        new_weights = np.bincount(inverse, weights=weights)
+        new_means = np.bincount(inverse, weights=means * weights) / new_weights
+        return TDigest(
+            new_means, new_weights, min(self.min, other.min), max(self.max, other.max), self.compression,
+        )
+
+    def _knots(self, means=None, weights=None):
+        # Posição (em linhas) do centro de cada centróide, ladeada por min e max
+        means = self.means if means is None else means
+        weights = self.weights if weights is None else weights
+        centers = np.cumsum(weights) - weights / 2
+        positions = np.concatenate([[0.0], centers, [self.n]])
+        values = np.concatenate([[self.min], means, [self.max]])
+        return positions, values
+
+    def quantile(self, q):
+        """
+        Quantil(is) aproximado(s), interpolado(s) entre os centróides
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        positions, values = self._knots()
+        return np.interp(np.asarray(q, dtype=np.float64) * self.n, positions, values)
+
+    def rank(self, x):
+        """
+        Número aproximado de valores abaixo de `x`
+        """
+        if self.n == 0:
+            return 0.0
+        if x <= self.min:
+            return 0.0
+        if x > self.max:
+            return self.n
+        # Em colunas discretas vários centróides têm a mesma média; o np.interp
+        # exige valores crescentes, então eles viram um só (pesos somados) e um
+        # valor igual a essa média conta metade dos empates
+        means, first = np.unique(self.means, return_index=True)
+        positions, values = self._knots(means, np.add.reduceat(self.weights, first))
+        # min/max iguais à primeira/última média: fica só o ponto do centróide
+        keep = np.concatenate([[values[0] < values[1]], np.ones(len(means), dtype=bool), [values[-2] < values[-1]]])
+        return float(np.interp(x, values[keep], positions[keep], left=0.0, right=self.n))
+
+    def count_outside(self, lower, upper):
+        """
+        Quantidade aproximada de valores < lower ou > upper
+        """
+        return self.rank(lower) + (self.n - self.rank(upper))
+
+
+def category_sketches(df, by_columns, columns, compression=COMPRESSION):
+    """
+    {(agrupamento, coluna): {categoria: TDigest}}, com os sketches de todas as
+    categorias de um agrupamento construídos numa só ordenação (TDigest.grouped)
+    """
+    result = {}
+    for by in by_columns:
+        codes, labels = group_codes(df, by)
+        for col in columns:
+            sketches = TDigest.grouped(codes, df[col].to_numpy(), len(labels), compression)
+            result[(by, col)] = dict(zip(labels, sketches))
+    return result
+
+
+def merge_category_sketches(left, right):
+    """
+    Combina dois resultados de category_sketches (ex.: dataset e linhas novas)
+    """
+    merged = {}
+    for key, sketches in left.items():
+        combined = dict(sketches)
+        for label, sketch in right.get(key, {}).items():
+            combined[label] = combined[label].merge(sketch) if label in combined else sketch
+        merged[key] = combined
+    return merged
@@ -0,0 +1,3 @@
+"""
+Benchmarks das páginas de análise com datasets sintéticos.
+"""
@@ -0,0 +1,160 @@
+"""
+Relatório de tempo de importação das páginas (python -X importtime).
+
+Para cada página, as importações do topo do arquivo são executadas em um
+processo novo com -X importtime, depois de `import streamlit` (que o
+servidor já carregou antes de executar qualquer página): o relatório mostra
+o custo que a página acrescenta e os pacotes mais pesados. Em seguida, outro
+processo novo executa a página uma vez (streamlit.testing.AppTest), o que
+aproxima o tempo até a primeira renderização após o início do contêiner.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --pages Home.py --top 5
+    python -m benchmarks.imports --compare benchmarks/results/<anterior>_imports.json
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.run import RESULTS_DIR, git_commit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (página, item do menu lateral)
+PAGES = [
+    ("Home.py", "Home"),
+    ("pages/2_Formacao_e_experiencia.py", "Certificados"),
+    ("pages/3_Skills.py", "Minhas Skills"),
+    ("pages/4_Analise_de_dados.py", "Análise de Dados"),
+    ("pages/5_Analise_Estatistica.py", "Dashboard"),
+]
+
+FIRST_RUN_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=600)
+at.session_state["menu_choice"] = {menu!r}
+at.run()
+done = time.perf_counter()
+print(imported - start, done - imported, len(at.exception))
+"""
+
+
+def top_level_imports(page):
+    """
+    Instruções import do topo do arquivo (as que rodam a cada execução da página)
+    """
+    source = (ROOT / page).read_text(encoding="utf-8")
+    return "\n".join(
+        ast.get_source_segment(source, node)
+        for node in ast.parse(source).body if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def parse_importtime(stderr):
+    """
+    Linhas do -X importtime como (módulo, profundidade, próprio µs, acumulado µs)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        # Nome precedido de um espaço e de dois espaços por nível de importação
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(own), int(cumulative)))
+    return rows
+
+
+def import_report(page, top):
+    code = f"import streamlit\n{top_level_imports(page)}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT, check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    # Tudo o que vem depois do `import streamlit` de nível zero é da página
+    boundary = next(i for i, row in enumerate(rows) if row[0] == "streamlit" and row[1] == 0) + 1
+    page_rows = rows[boundary:]
+    total_us = sum(cumulative for _, depth, _, cumulative in page_rows if depth == 0)
+    packages = {}
+    for name, depth, own, _ in page_rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + own
+    heaviest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    return {
+        "import_ms": total_us / 1000,
+        "modules": len(page_rows),
+        "heaviest": [{"package": package, "ms": us / 1000} for package, us in heaviest],
+    }
+
+
+def first_run(page, menu_choice):
+    script = FIRST_RUN_SCRIPT.format(page=page, menu=menu_choice)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT, check=True,
+    )
+    import_s, run_s, exceptions = result.stdout.split()
+    return {"streamlit_import_ms": float(import_s) * 1000, "first_run_ms": float(run_s) * 1000,
+            "exceptions": int(exceptions)}
+
+
+def compare(results, previous_path):
+    previous = json.loads(Path(previous_path).read_text(encoding="utf-8"))
+    before = {row["page"]: row for row in previous["results"]}
+    print(f"\nComparação com {previous_path} (commit {previous['meta']['commit']}):")
+    for row in results:
+        old = before.get(row["page"])
+        if old is None:
+            continue
+        print(
+            f"{row['page']:<34} | importações {old['import_ms']:7.0f} → {row['import_ms']:7.0f} ms"
+            f" | primeira execução {old['first_run_ms']:7.0f} → {row['first_run_ms']:7.0f} ms"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", nargs="+", default=[page for page, _ in PAGES])
+    parser.add_argument("--top", type=int, default=8, help="pacotes mais pesados listados por página")
+    parser.add_argument("--output", type=Path, help="arquivo JSON de saída")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+
+    menus = dict(PAGES)
+    results = []
+    for page in args.pages:
+        row = {"page": page, **import_report(page, args.top), **first_run(page, menus.get(page, "Home"))}
+        results.append(row)
+        heaviest = ", ".join(f"{item['package']} {item['ms']:.0f}" for item in row["heaviest"])
+        print(
+            f"{page:<34} | importações {row['import_ms']:7.0f} ms ({row['modules']:4d} módulos)"
+            f" | primeira execução {row['first_run_ms']:7.0f} ms | {heaviest}",
+            flush=True,
+        )
+
+    meta = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+    }
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{meta['commit']}_imports.json"
+    output.write_text(json.dumps({"meta": meta, "results": results}, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados gravados em {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Benchmark das etapas de cálculo das páginas de análise.
+
+Gera (uma vez) datasets sintéticos de 300 mil, 3 milhões e 30 milhões de
+linhas e executa, sem navegador, as mesmas funções que as páginas chamam:
+carregamento, filtros e cubo da aba 4, tabelas da aba 3, ingestão
+incremental, momentos e testes de hipótese. Para cada etapa são registrados o tempo (mínimo e mediana de
+algumas repetições) e o pico de memória alocada, medido com tracemalloc em
+uma execução separada para não distorcer os tempos.
+
+Uso (na raiz do repositório):
+
+    python -m benchmarks.run --sizes 300k 3M
+    python -m benchmarks.run --sizes 30M --repeat 1
+    python -m benchmarks.run --executor serial
+    python -m benchmarks.run --compare benchmarks/results/<anterior>.json
+
+Os resultados são gravados em benchmarks/results/ como JSON.
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analytics.binning import box_stats, density_grid, grouped_box_stats, histogram, stratified_sample
+from analytics.categories import category_stats
+from analytics.colstore import open_store, write_store
+from analytics.cube import AggregateCube, RowAggregates, days_left_cube
+from analytics.data import dataset_fingerprint, read_flights, read_only_frame
+from analytics.descriptive import column_modes, correlation_pairs, dispersion_table, variable_types
+from analytics.export import export_bytes
+from analytics.filters import FilterIndex, FlightFilters
+from analytics.hypothesis import run_hypothesis_tests
+from analytics.ingest import ColumnBuffers
+from analytics.moments import Moments
+from analytics.outliers import iqr_outliers
+from analytics.parallel import EXECUTOR_ENV, EXECUTOR_MODES, MAX_WORKERS
+from analytics.partitioned import open_dataset, pyarrow_available, read_filtered, write_dataset
+from analytics.result_cache import ResultCache, SQLiteBackend
+from analytics.selection import selection_insights, summarize_selection
+from analytics.sketches import TDigest
+from benchmarks.synthetic import generate_flights, write_csv
+
+SIZES = {"300k": 300_000, "3M": 3_000_000, "30M": 30_000_000}
+
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+
+NUMERIC_COLUMNS = ["duration", "days_left", "price"]
+
+# Seleção típica da aba 4: parte das companhias e uma faixa de preço
+TYPICAL_FILTERS = FlightFilters.build(
+    categories={"airline": ["Vistara", "Air_India", "Indigo"], "class": ["Economy"]},
+    ranges={"price": (2000, 20000)},
+)
+
+
+def dataset_paths(label, seed):
+    """
+    CSV sintético do tamanho pedido, gerado só na primeira vez
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    csv_path = DATA_DIR / f"flights_{label}_seed{seed}.csv"
+    if not csv_path.exists():
+        print(f"Gerando {csv_path.name} ({SIZES[label]:,} linhas)...", flush=True)
+        tmp_path = csv_path.with_suffix(".tmp")
+        write_csv(generate_flights(SIZES[label], seed), tmp_path)
+        tmp_path.replace(csv_path)
+    return csv_path, csv_path.with_suffix(".parquet")
+
+
+def build_stages(csv_path, parquet_path):
+    """
+    Lista de (página, etapa, função, preparação) na ordem de execução; as
+    funções recebem e atualizam um dicionário de contexto compartilhado
+    """
+    category_filters = FlightFilters(categories=TYPICAL_FILTERS.categories)
+
+    def drop_parquet(ctx):
+        parquet_path.unlink(missing_ok=True)
+
+    def split_tail(ctx):
+        # Último 1% das linhas como coleta nova sobre o cubo das demais (uma
+        # vez); colunas e índice são recriados a cada repetição, porque o
+        # append os estende no lugar
+        if "ingest" not in ctx:
+            split = len(ctx["df"]) - max(1, len(ctx["df"]) // 100)
+            base = ctx["df"].iloc[:split].reset_index(drop=True)
+            tail = ctx["df"].iloc[split:].reset_index(drop=True)
+            ctx["ingest"] = (base, AggregateCube.from_frame(base), tail)
+        base = ctx["ingest"][0]
+        ctx["ingest_columns"] = ColumnBuffers(base)
+        ctx["ingest_index"] = FilterIndex(base)
+
+    def set_ctx(key, fn):
+        def stage(ctx):
+            ctx[key] = fn(ctx)
+        return stage
+
+    dataset_dir = csv_path.with_name(f"{csv_path.stem}_dataset")
+    columns_dir = csv_path.with_name(f"{csv_path.stem}_columns")
+
+    def pickle_frame(ctx):
+        # O st.cache_data guarda o DataFrame serializado e desserializa a cada chamada
+        if "pickled" not in ctx:
+            ctx["pickled"] = pickle.dumps(ctx["df"], protocol=pickle.HIGHEST_PROTOCOL)
+
+    def drop_columns(ctx):
+        shutil.rmtree(columns_dir, ignore_errors=True)
+
+    def open_result_store(ctx):
+        if "result_cache" not in ctx:
+            path = csv_path.with_name(f"{csv_path.stem}_results.sqlite")
+            for suffix in ["", "-wal", "-shm"]:
+                Path(f"{path}{suffix}").unlink(missing_ok=True)
+            ctx["result_cache"] = ResultCache(SQLiteBackend(path))
+
+    stages = [
+        ("carregamento", "read_flights (CSV + grava Parquet)",
+         set_ctx("df", lambda ctx: read_flights(csv_path, parquet_path)), drop_parquet),
+        ("carregamento", "read_flights (Parquet)",
+         set_ctx("df", lambda ctx: read_flights(csv_path, parquet_path)), None),
+        ("carregamento", "dataset_fingerprint",
+         set_ctx("fingerprint", lambda ctx: dataset_fingerprint(ctx["df"])), None),
+        ("carregamento", "load_data por rerun: cópia (cache_data)",
+         set_ctx("copy", lambda ctx: pickle.loads(ctx["pickled"])), pickle_frame),
+        ("carregamento", "load_data compartilhado: congela (1x)",
+         set_ctx("shared", lambda ctx: read_only_frame(ctx["df"])), None),
+        ("carregamento", "colunas mapeadas: grava .npy",
+         set_ctx("columns", lambda ctx: write_store(ctx["df"], columns_dir, ctx["fingerprint"])), drop_columns),
+        ("carregamento", "colunas mapeadas: abre (mmap)",
+         set_ctx("mapped", lambda ctx: open_store(columns_dir)), None),
+        ("análise de dados / aba 1", "tipos de variáveis",
+         set_ctx("types", lambda ctx: variable_types(ctx["df"])), None),
+        ("análise de dados / aba 2", "momentos, describe e correlação",
+         set_ctx("moments", lambda ctx: (
+             dispersion_table({col: Moments.from_values(ctx["df"][col].to_numpy()) for col in NUMERIC_COLUMNS}),
+             ctx["df"][NUMERIC_COLUMNS].describe(),
+             correlation_pairs(ctx["df"][NUMERIC_COLUMNS].corr()),
+             column_modes(ctx["df"], NUMERIC_COLUMNS),
+         )), None),
+        ("análise de dados / aba 3", "cubo de agregados",
+         set_ctx("cube", lambda ctx: AggregateCube.from_frame(ctx["df"])), None),
+        ("análise de dados / aba 4", "cubo por antecedência",
+         set_ctx("days_cube", lambda ctx: days_left_cube(ctx["df"])), None),
+        ("análise de dados / aba 3", "ingestão incremental (+1% das linhas)",
+         set_ctx("appended", lambda ctx: (
+             ctx["ingest_index"].append(ctx["ingest_columns"].append(ctx["ingest"][2])),
+             ctx["ingest"][1].append(ctx["ingest"][2]),
+         )), split_tail),
+        ("análise de dados / aba 3", "tabelas por categoria",
+         set_ctx("tables", lambda ctx: {
+             by: category_stats(ctx["cube"], by) for by in ["airline", "class", "stops"]
+         }), None),
+        ("análise de dados / aba 3", "outliers (IQR)",
+         set_ctx("outliers", lambda ctx: iqr_outliers(ctx["df"], NUMERIC_COLUMNS)), None),
+        ("análise de dados / aba 3", "sketches t-digest (constrói)",
+         set_ctx("sketches", lambda ctx: {
+             col: TDigest.from_values(ctx["df"][col].to_numpy()) for col in NUMERIC_COLUMNS
+         }), None),
+        ("análise de dados / aba 3", "sketches t-digest (+1% das linhas)",
+         set_ctx("merged_sketches", lambda ctx: {
+             col: sketch.merge(TDigest.from_values(ctx["ingest"][2][col].to_numpy()))
+             for col, sketch in ctx["sketches"].items()
+         }), None),
+        ("análise de dados / aba 3", "outliers (IQR, sketches)",
+         set_ctx("outliers", lambda ctx: iqr_outliers(
+             ctx["df"], NUMERIC_COLUMNS, sketches=ctx["sketches"], exact_counts=False)), None),
+        ("análise de dados / aba 4", "índice de filtros",
+         set_ctx("index", lambda ctx: FilterIndex(ctx["df"])), None),
+        ("análise de dados / aba 4", "aplicação dos filtros",
+         set_ctx("filtered", lambda ctx: ctx["index"].apply(ctx["df"], TYPICAL_FILTERS)), None),
+        ("análise de dados / aba 4", "resumo da seleção (cubo global)",
+         set_ctx("summary", lambda ctx: selection_insights(
+             summarize_selection(ctx["cube"], category_filters, ctx["days_cube"]))), None),
+        ("análise de dados / aba 4", "resumo da seleção (linhas filtradas)",
+         set_ctx("filtered_summary", lambda ctx: selection_insights(
+             summarize_selection(RowAggregates(ctx["filtered"]), None))), None),
+        ("análise de dados / aba 4", "box plot por companhia",
+         set_ctx("boxes", lambda ctx: grouped_box_stats(ctx["filtered"], "airline", "price")), None),
+        ("análise de dados / aba 4", "dispersão: densidade + amostra estratificada",
+         set_ctx("scatter", lambda ctx: (
+             density_grid(ctx["filtered"]["duration"].to_numpy(), ctx["filtered"]["price"].to_numpy()),
+             stratified_sample(ctx["filtered"], "airline"),
+         )), None),
+        ("análise de dados / aba 4", "exportação CSV gzip",
+         set_ctx("export", lambda ctx: len(export_bytes(ctx["filtered"], "csv.gz"))), None),
+        ("cache de resultados", "grava tabelas, outliers e box plots (SQLite)",
+         set_ctx("shared_results", lambda ctx: [
+             ctx["result_cache"].set_bytes(name, (ctx["fingerprint"],), pickle.dumps(ctx[name]))
+             for name in ["tables", "outliers", "boxes"]
+         ]), open_result_store),
+        ("cache de resultados", "lê tabelas, outliers e box plots (réplica nova)",
+         set_ctx("shared_results", lambda ctx: [
+             pickle.loads(ctx["result_cache"].get_bytes(name, (ctx["fingerprint"],)))
+             for name in ["tables", "outliers", "boxes"]
+         ]), None),
+        ("análise estatística", "histograma e box plot",
+         set_ctx("distribution", lambda ctx: (
+             histogram(ctx["df"]["price"].to_numpy(), 50),
+             box_stats(ctx["df"]["price"].to_numpy()),
+         )), None),
+        ("análise estatística", "testes de hipótese",
+         set_ctx("tests", lambda ctx: run_hypothesis_tests(ctx["df"])), None),
+    ]
+    if pyarrow_available():
+        stages += [
+            ("dataset particionado", "grava dataset (airline/source_city)",
+             set_ctx("dataset", lambda ctx: open_dataset(
+                 write_dataset(ctx["df"], dataset_dir, ctx["fingerprint"]),
+             )), None),
+            ("dataset particionado", "leitura com filtros (pushdown)",
+             set_ctx("pushdown", lambda ctx: read_filtered(ctx["dataset"], TYPICAL_FILTERS)), None),
+        ]
+    return stages
+
+
+def measure(stage, setup, ctx, repeat):
+    """
+    Tempos de `repeat` execuções e pico de memória de uma execução extra
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup(ctx)
+        gc.collect()
+        start = time.perf_counter()
+        stage(ctx)
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup(ctx)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        stage(ctx)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return times, peak
+
+
+def run_size(label, repeat, seed):
+    csv_path, parquet_path = dataset_paths(label, seed)
+    ctx = {}
+    rows = []
+    for page, name, stage, setup in build_stages(csv_path, parquet_path):
+        times, peak = measure(stage, setup, ctx, repeat)
+        row = {
+            "size": label,
+            "rows": SIZES[label],
+            "page": page,
+            "stage": name,
+            "repeat": repeat,
+            "time_min_s": min(times),
+            "time_median_s": statistics.median(times),
+            "peak_mb": peak / 1024**2,
+        }
+        rows.append(row)
+        print(f"{label:>5} | {page:<26} | {name:<36} | {row['time_min_s'] * 1000:10.1f} ms | {row['peak_mb']:9.1f} MB", flush=True)
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=BENCH_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def metadata(args):
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sizes": args.sizes,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "executor": args.executor,
+        "max_workers": MAX_WORKERS,
+    }
+
+
+def compare(results, previous_path):
+    """
+    Razão de tempo e memória em relação a um resultado salvo anteriormente
+    """
+    previous = json.loads(Path(previous_path).read_text(encoding="utf-8"))
+    before = {(r["size"], r["page"], r["stage"]): r for r in previous["results"]}
+    print(f"\nComparação com {previous_path} (commit {previous['meta']['commit']}):")
+    for row in results:
+        old = before.get((row["size"], row["page"], row["stage"]))
+        if old is None:
+            continue
+        time_ratio = row["time_min_s"] / old["time_min_s"] if old["time_min_s"] else float("nan")
+        mem_ratio = row["peak_mb"] / old["peak_mb"] if old["peak_mb"] else float("nan")
+        print(f"{row['size']:>5} | {row['stage']:<36} | tempo x{time_ratio:6.2f} | memória x{mem_ratio:6.2f}")
+
+
+def main(argv=None):
+    # Mesmo modo das páginas do dashboard
+    pd.set_option("mode.copy_on_write", True)
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["300k", "3M"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--executor", choices=EXECUTOR_MODES, default="thread",
+                        help="modo de execução dos cálculos independentes (testes, tabelas)")
+    parser.add_argument("--output", type=Path, help="arquivo JSON de saída")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+    os.environ[EXECUTOR_ENV] = args.executor
+
+    meta = metadata(args)
+    results = []
+    for label in args.sizes:
+        results.extend(run_size(label, args.repeat, args.seed))
+    # Pico de memória residente do processo inteiro (Linux: KB)
+    meta["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{stamp}_{meta['commit']}.json"
+    output.write_text(json.dumps({"meta": meta, "results": results}, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Gerador de datasets sintéticos de voos com o mesmo esquema do CSV original.
+
+As distribuições imitam as do dataset real (companhias, rotas, proporção de
+classes e paradas, preço log-normal por classe), o suficiente para que
+filtros, agrupamentos e testes tenham cardinalidades e custos parecidos.
+Os dados são gerados direto como categorias, para que 30 milhões de linhas
+caibam na memória.
+"""
+import numpy as np
+import pandas as pd
+
+AIRLINES = ["SpiceJet", "AirAsia", "Vistara", "GO_FIRST", "Indigo", "Air_India"]
+AIRLINE_CODES = ["SG", "I5", "UK", "G8", "6E", "AI"]
+AIRLINE_WEIGHTS = [0.03, 0.05, 0.43, 0.08, 0.14, 0.27]
+CITIES = ["Delhi", "Mumbai", "Bangalore", "Kolkata", "Hyderabad", "Chennai"]
+TIMES = ["Early_Morning", "Morning", "Afternoon", "Evening", "Night", "Late_Night"]
+STOPS = ["zero", "one", "two_or_more"]
+STOPS_WEIGHTS = [0.12, 0.83, 0.05]
+CLASSES = ["Economy", "Business"]
+CLASSES_WEIGHTS = [0.69, 0.31]
+
+# Números de voo distintos por companhia (o dataset real tem ~1.500 voos)
+FLIGHTS_PER_AIRLINE = 250
+
+CHUNK_ROWS = 1_000_000
+
+
+def _categorical(rng, labels, n, p=None):
+    codes = rng.choice(len(labels), size=n, p=p).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
+def generate_flights(n, seed=0):
+    """
+    DataFrame sintético com `n` linhas no esquema compacto do dashboard
+    """
+    rng = np.random.default_rng(seed)
+    airline = rng.choice(len(AIRLINES), size=n, p=AIRLINE_WEIGHTS).astype(np.int16)
+    source = rng.integers(0, len(CITIES), n, dtype=np.int8)
+    # Destino sempre diferente da origem
+    destination = ((source + rng.integers(1, len(CITIES), n, dtype=np.int8)) % len(CITIES)).astype(np.int8)
+    travel_class = rng.choice(len(CLASSES), size=n, p=CLASSES_WEIGHTS).astype(np.int8)
+
+    flight_labels = [
+        f"{code}-{number}"
+        for code in AIRLINE_CODES
+        for number in range(100, 100 + FLIGHTS_PER_AIRLINE)
+    ]
+    flight_codes = airline * FLIGHTS_PER_AIRLINE + rng.integers(0, FLIGHTS_PER_AIRLINE, n, dtype=np.int16)
+
+    business = travel_class == CLASSES.index("Business")
+    price = rng.lognormal(8.5, 0.6, n) * np.where(business, 6.0, 1.0) + 1105
+
+    return pd.DataFrame({
+        "index": np.arange(n, dtype=np.int64),
+        "airline": pd.Categorical.from_codes(airline, categories=AIRLINES),
+        "flight": pd.Categorical.from_codes(flight_codes, categories=flight_labels),
+        "source_city": pd.Categorical.from_codes(source, categories=CITIES),
+        "departure_time": _categorical(rng, TIMES, n),
+        "stops": _categorical(rng, STOPS, n, STOPS_WEIGHTS),
+        "arrival_time": _categorical(rng, TIMES, n),
+        "destination_city": pd.Categorical.from_codes(destination, categories=CITIES),
+        "class": pd.Categorical.from_codes(travel_class, categories=CLASSES),
+        "duration": np.round(rng.gamma(3.0, 4.0, n) + 0.83, 2).astype(np.float32),
+        "days_left": rng.integers(1, 50, n, dtype=np.int8),
+        "price": np.minimum(price, 123_000).astype(np.int32),
+    })
+
+
+def write_csv(df, path, chunk_rows=CHUNK_ROWS):
+    """
+    Grava o CSV em blocos, para não montar o texto inteiro em memória
+    """
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        for start in range(0, len(df), chunk_rows):
+            df.iloc[start:start + chunk_rows].to_csv(out, index=False, header=start == 0)
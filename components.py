@@ -0,0 +1,120 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from analytics.data import result_cache
+from analytics.figure_cache import FigureCache
+from analytics.profiling import Profiler, append_log, to_jsonl
+
+# Copy-on-Write vale para o processo inteiro (pd.option_context também é
+# global, não por sessão): é ativado aqui, na primeira importação deste
+# módulo, antes de qualquer sessão usar o DataFrame compartilhado. As
+# páginas de análise importam este módulo e não mexem mais na opção.
+pd.set_option("mode.copy_on_write", True)
+
+# Execuções medidas mantidas na sessão para exportação
+PROFILE_HISTORY_LIMIT = 2000
+
+
+def server_side_plots_toggle():
+    # Quando ativo, histogramas e box plots recebem só os agregados (não as ~300 mil linhas)
+    return st.sidebar.toggle(
+        "⚡ Agregar gráficos no servidor",
+        value=True,
+        key="server_side_plots",
+        help="Calcula contagens e quartis no servidor e envia apenas os agregados ao navegador",
+    )
+
+
+def lazy_tabs(labels, key):
+    """
+    Seletor de abas que executa só a aba ativa: diferente de st.tabs, que roda
+    o corpo de todas as abas a cada interação
+    """
+    return st.radio("Seção", labels, horizontal=True, key=key, label_visibility="collapsed")
+
+
+def lazy_expander(label, key, expanded=False):
+    """
+    Substituto do st.expander cujo conteúdo só é calculado quando aberto
+    """
+    return st.toggle(label, value=expanded, key=key)
+
+
+def start_profiler(page):
+    """
+    Medidor da execução atual, ligado quando o painel de desempenho está ativo
+    (ou por padrão com DASHBOARD_DEBUG=1)
+    """
+    enabled = st.session_state.get("profiling_panel", os.environ.get("DASHBOARD_DEBUG") == "1")
+    return Profiler(page, enabled=enabled)
+
+
+def plotly_chart(fig, timing=None):
+    # Anota na seção medida o tamanho do gráfico enviado ao navegador
+    if timing is not None:
+        timing.record_figure(fig)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.cache_resource
+def figure_cache():
+    # Um cache de figuras por processo, compartilhado por todas as sessões e
+    # apoiado no cache de resultados entre processos
+    return FigureCache.from_env(store=result_cache())
+
+
+def cached_chart(chart_id, key, build, timing=None):
+    """
+    Exibe a figura de `chart_id` para a chave normalizada `key` (versão do
+    dataset, assinatura dos filtros, opções); `build()` só é chamado quando
+    a figura não está em cache
+    """
+    entry = figure_cache().get_or_build((chart_id, *key), build)
+    if timing is not None and timing.enabled:
+        timing.payload_bytes = entry.nbytes
+    st.plotly_chart(entry.figure, use_container_width=True)
+
+
+def profiling_panel(profiler):
+    """
+    Painel (na barra lateral) com os tempos da execução e exportação em JSON lines
+    """
+    st.sidebar.toggle(
+        "🛠️ Painel de desempenho",
+        value=os.environ.get("DASHBOARD_DEBUG") == "1",
+        key="profiling_panel",
+        help="Mede tempo, linhas e tamanho dos gráficos de cada seção da página",
+    )
+    if not profiler.enabled:
+        return
+
+    records = profiler.records()
+    history = st.session_state.setdefault("profiling_history", [])
+    history.extend(records)
+    del history[:-PROFILE_HISTORY_LIMIT]
+    append_log(records)
+
+    with st.sidebar.expander("⏱️ Tempos desta execução", expanded=True):
+        st.metric("Execução total", f"{profiler.elapsed() * 1000:.0f} ms")
+        cache_stats = figure_cache().stats()
+        st.caption(
+            f"Cache de figuras: {cache_stats['figures']} figuras, {cache_stats['bytes'] / 1024**2:.1f} MB "
+            f"({cache_stats['hits']} acertos, {cache_stats['misses']} faltas)"
+        )
+        table = pd.DataFrame({
+            "Seção": [r["section"] for r in records],
+            "Tempo (ms)": [r["ms"] for r in records],
+            "Linhas": pd.array([r["rows"] for r in records], dtype="Int64"),
+            "Gráfico (KB)": [
+                None if r["payload_bytes"] is None else r["payload_bytes"] / 1024 for r in records
+            ],
+        })
+        st.dataframe(table.round(1), use_container_width=True, hide_index=True)
+        st.download_button(
+            label="📥 Exportar medições (JSONL)",
+            data=to_jsonl(history),
+            file_name="medicoes_desempenho.jsonl",
+            mime="application/jsonl",
+        )
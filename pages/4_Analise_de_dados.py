@@ -1,10 +1,19 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from scipy import stats
 from sidebar import sidebar_menu
+from components import (
+    cached_chart, lazy_expander, lazy_tabs, profiling_panel, server_side_plots_toggle, start_profiler,
+)
+from analytics.data import (
+    load_category_tables, load_correlation_matrix, load_describe, load_export, load_filter_options,
+    load_filtered, load_fingerprint, load_grouped_box_stats, load_median, load_density,
+    load_memory_report, load_modes, load_moments, load_outliers, load_overview, load_scatter_sample,
+    load_selection_summary, load_variable_types, refresh_fingerprint,
+)
+from analytics.descriptive import correlation_pairs, dispersion_table, kurtosis_label, skewness_label
+from analytics.export import EXPORT_FORMATS
+from analytics.outliers import OUTLIER_METHODS
+from analytics.filters import FlightFilters
+from analytics.selection import selection_insights
 
 
 # Oculta o menu padrão do Streamlit multipage
@@ -21,35 +30,37 @@ hide_streamlit_style = """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
 menu_choice = sidebar_menu()
+profiler = start_profiler("Análise de Dados")
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv(r"data/airlines_flights_data.csv")
-    return df
-
-def data_analysis_page(df):
+def data_analysis_page(overview, profiler):
     st.title("📊 Análise de Dados de Voos")
     st.markdown("---")
     
-    # Criar abas dentro da análise de dados
-    tab1, tab2, tab3, tab4 = st.tabs([
+    # Criar abas dentro da análise de dados (só a aba ativa é calculada)
+    tabs = [
         "📋 Apresentação dos Dados", 
         "📈 Análise Estatística", 
         "🔍 Análise por Categorias",
         "📊 Visualizações Interativas"
-    ])
+    ]
+    active_tab = lazy_tabs(tabs, key="data_analysis_tab")
+    
+    # Variáveis numéricas analisadas nas abas 2 e 3
+    numeric_cols = ['duration', 'days_left', 'price']
+    # Versão do dataset, chave das tabelas em cache
+    fingerprint = load_fingerprint()
     
-    with tab1:
+    if active_tab == tabs[0]:
         st.header("1. Apresentação dos Dados e Tipos de Variáveis")
         
         # Informações gerais do dataset
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total de Registros", f"{len(df):,}")
+            st.metric("Total de Registros", f"{overview.rows:,}")
         with col2:
-            st.metric("Número de Variáveis", df.shape[1])
+            st.metric("Número de Variáveis", overview.columns)
         with col3:
-            st.metric("Período de Análise", f"{df['days_left'].min()} a {df['days_left'].max()} dias")
+            st.metric("Período de Análise", f"{overview.days_left[0]} a {overview.days_left[1]} dias")
         
         st.markdown("---")
         
@@ -67,35 +78,26 @@ def data_analysis_page(df):
         # Identificação dos tipos de variáveis
         st.subheader("🔍 Identificação dos Tipos de Variáveis")
         
-        # Criar DataFrame com informações das variáveis
-        var_info = []
-        for col in df.columns:
-            dtype = df[col].dtype
-            unique_count = df[col].nunique()
-            
-            if dtype == 'object':
-                var_type = "Categórica Nominal"
-                if col in ['departure_time', 'arrival_time']:
-                    var_type = "Categórica Ordinal"
-            elif dtype in ['int64', 'float64']:
-                if unique_count < 10:
-                    var_type = "Numérica Discreta"
-                else:
-                    var_type = "Numérica Contínua"
-            else:
-                var_type = "Outro"
-            
-            var_info.append({
-                'Variável': col,
-                'Tipo': var_type,
-                'Tipo de Dados': str(dtype),
-                'Valores Únicos': unique_count,
-                'Valores Ausentes': df[col].isnull().sum()
-            })
-        
-        var_df = pd.DataFrame(var_info)
+        # Tipo estatístico de cada coluna (em cache por versão do dataset)
+        var_df = load_variable_types(fingerprint)
         st.dataframe(var_df, use_container_width=True)
         
+        # Economia de memória com o esquema compacto
+        if lazy_expander("💾 Uso de Memória do Dataset", key="memory_report"):
+            with profiler.section("Relatório de memória"):
+                memory_df = load_memory_report(fingerprint)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Memória (tipos inferidos do CSV)", f"{memory_df.loc['Total', 'Antes (MB)']:.1f} MB")
+            with col2:
+                st.metric(
+                    "Memória (esquema compacto)",
+                    f"{memory_df.loc['Total', 'Depois (MB)']:.1f} MB",
+                    delta=f"-{memory_df.loc['Total', 'Redução (%)']:.1f}%",
+                    delta_color="inverse"
+                )
+            st.dataframe(memory_df, use_container_width=True)
+        
         # Principais perguntas de análise
         st.subheader("❓ Principais Perguntas de Análise")
         st.write("""
@@ -110,68 +112,53 @@ def data_analysis_page(df):
         7. **Qual é a distribuição de preços e como ela se comporta?**
         """)
     
-    with tab2:
+    if active_tab == tabs[1]:
         st.header("2. Medidas Centrais, Dispersão e Correlação")
         
-        # Análise das variáveis numéricas
-        numeric_cols = ['duration', 'days_left', 'price']
+        # Momentos de cada coluna calculados em uma única passada (em cache)
+        with profiler.section("Momentos por coluna"):
+            moments = {col: load_moments(fingerprint, col) for col in numeric_cols}
         
         st.subheader("📊 Estatísticas Descritivas")
-        st.dataframe(df[numeric_cols].describe(), use_container_width=True)
+        with profiler.section("Estatísticas descritivas", rows=overview.rows):
+            st.dataframe(load_describe(fingerprint, tuple(numeric_cols)), use_container_width=True)
         
         # Medidas de tendência central
         st.subheader("📍 Medidas de Tendência Central")
         
         for col in numeric_cols:
-            with st.expander(f"Análise de {col.upper()}", expanded=False):
+            if lazy_expander(f"Análise de {col.upper()}", key=f"central_tendency_{col}"):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    mean_val = df[col].mean()
-                    median_val = df[col].median()
-                    mode_val = df[col].mode().iloc[0] if len(df[col].mode()) > 0 else "N/A"
+                    mean_val = moments[col].mean
+                    # Mediana do sketch t-digest mantido junto ao cache dos dados
+                    median_val = load_median(fingerprint, col, approximate=True)
+                    mode_val = load_modes(fingerprint, tuple(numeric_cols))[col]
+                    mode_val = "N/A" if mode_val is None else mode_val
                     
                     st.write(f"**Média:** {mean_val:.2f}")
-                    st.write(f"**Mediana:** {median_val:.2f}")
+                    st.write(f"**Mediana (aprox., t-digest):** {median_val:.2f}")
                     st.write(f"**Moda:** {mode_val}")
                 
                 with col2:
                     # Análise da distribuição
-                    skewness = stats.skew(df[col])
-                    kurtosis = stats.kurtosis(df[col])
+                    skewness = moments[col].skew
+                    kurtosis = moments[col].kurtosis
                     
                     st.write(f"**Assimetria:** {skewness:.3f}")
-                    if skewness > 0.5:
-                        st.write("→ Distribuição assimétrica à direita")
-                    elif skewness < -0.5:
-                        st.write("→ Distribuição assimétrica à esquerda")
-                    else:
-                        st.write("→ Distribuição aproximadamente simétrica")
+                    st.write(f"→ {skewness_label(skewness)}")
                     
                     st.write(f"**Curtose:** {kurtosis:.3f}")
-                    if kurtosis > 0:
-                        st.write("→ Mais pontiaguda que a normal")
-                    else:
-                        st.write("→ Mais achatada que a normal")
+                    st.write(f"→ {kurtosis_label(kurtosis)}")
         
         # Medidas de dispersão
         st.subheader("📏 Medidas de Dispersão")
         
-        disp_data = []
-        for col in numeric_cols:
-            std_val = df[col].std()
-            var_val = df[col].var()
-            cv = (std_val / df[col].mean()) * 100
-            
-            disp_data.append({
-                'Variável': col,
-                'Desvio Padrão': f"{std_val:.2f}",
-                'Variância': f"{var_val:.2f}",
-                'Coef. Variação (%)': f"{cv:.2f}%",
-                'Interpretação': "Alta variabilidade" if cv > 30 else "Variabilidade moderada" if cv > 15 else "Baixa variabilidade"
-            })
-        
-        disp_df = pd.DataFrame(disp_data)
+        disp_df = dispersion_table(moments)
+        disp_df['Desvio Padrão'] = disp_df['Desvio Padrão'].map("{:.2f}".format)
+        disp_df['Variância'] = disp_df['Variância'].map("{:.2f}".format)
+        disp_df['Coef. Variação (%)'] = disp_df['Coef. Variação (%)'].map("{:.2f}%".format)
         st.dataframe(disp_df, use_container_width=True)
         
         # Matriz de correlação
@@ -180,301 +167,322 @@ def data_analysis_page(df):
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            correlation_matrix = df[numeric_cols].corr()
+            with profiler.section("Matriz de correlação", rows=overview.rows):
+                correlation_matrix = load_correlation_matrix(fingerprint, tuple(numeric_cols))
             st.dataframe(correlation_matrix.round(3), use_container_width=True)
         
         with col2:
             st.write("**Interpretação das Correlações:**")
-            for i in range(len(numeric_cols)):
-                for j in range(i+1, len(numeric_cols)):
-                    corr_val = correlation_matrix.iloc[i, j]
-                    var1, var2 = numeric_cols[i], numeric_cols[j]
-                    
-                    if abs(corr_val) > 0.7:
-                        strength = "forte"
-                    elif abs(corr_val) > 0.3:
-                        strength = "moderada"
-                    else:
-                        strength = "fraca"
-                    
-                    direction = "positiva" if corr_val > 0 else "negativa"
-                    st.write(f"• **{var1} vs {var2}:** {corr_val:.3f} - Correlação {strength} {direction}")
+            for pair in correlation_pairs(correlation_matrix):
+                st.write(
+                    f"• **{pair['x']} vs {pair['y']}:** {pair['r']:.3f} - "
+                    f"Correlação {pair['strength']} {pair['direction']}"
+                )
     
-    with tab3:
+    if active_tab == tabs[2]:
         st.header("3. Análise por Categorias")
         
+        # Tabelas saem do cubo de agregados pré-calculado, calculadas em
+        # paralelo e em cache por versão do dataset
+        with profiler.section("Tabelas por categoria"):
+            category_tables = load_category_tables(fingerprint)
+        
         # Análise por companhia aérea
         st.subheader("✈️ Análise por Companhia Aérea")
-        airline_stats = df.groupby('airline').agg({
-            'price': ['mean', 'median', 'std', 'count'],
-            'duration': ['mean', 'median'],
-            'days_left': 'mean'
-        }).round(2)
-        
-        airline_stats.columns = ['Preço Médio', 'Preço Mediano', 'Preço DP', 'Qtd Voos', 
-                                'Duração Média', 'Duração Mediana', 'Dias Antecedência']
-        st.dataframe(airline_stats, use_container_width=True)
+        st.dataframe(category_tables['airline'], use_container_width=True)
         
         # Análise por classe
         st.subheader("🎫 Análise por Classe")
-        class_stats = df.groupby('class').agg({
-            'price': ['mean', 'median', 'std', 'count'],
-            'duration': ['mean', 'median']
-        }).round(2)
-        
-        class_stats.columns = ['Preço Médio', 'Preço Mediano', 'Preço DP', 'Qtd Voos', 
-                              'Duração Média', 'Duração Mediana']
-        st.dataframe(class_stats, use_container_width=True)
+        st.dataframe(category_tables['class'], use_container_width=True)
         
         # Análise por número de paradas
         st.subheader("🛑 Análise por Número de Paradas")
-        stops_stats = df.groupby('stops').agg({
-            'price': ['mean', 'median', 'std', 'count'],
-            'duration': ['mean', 'median']
-        }).round(2)
-        
-        stops_stats.columns = ['Preço Médio', 'Preço Mediano', 'Preço DP', 'Qtd Voos', 
-                              'Duração Média', 'Duração Mediana']
-        st.dataframe(stops_stats, use_container_width=True)
+        st.dataframe(category_tables['stops'], use_container_width=True)
         
         # Identificação de outliers
         st.subheader("🎯 Identificação de Outliers")
         
-        outlier_data = []
-        for col in numeric_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-            outlier_percentage = (len(outliers) / len(df)) * 100
-            
-            outlier_data.append({
-                'Variável': col,
-                'Q1': f"{Q1:.2f}",
-                'Q3': f"{Q3:.2f}",
-                'IQR': f"{IQR:.2f}",
-                'Limite Inferior': f"{lower_bound:.2f}",
-                'Limite Superior': f"{upper_bound:.2f}",
-                'Outliers': len(outliers),
-                'Percentual': f"{outlier_percentage:.2f}%"
-            })
-        
-        outlier_df = pd.DataFrame(outlier_data)
+        # Cálculo exato por padrão; os quartis dos sketches t-digest (mantidos
+        # com o cache dos dados) ficam como opção, sinalizados como aproximados
+        outlier_method = st.selectbox(
+            "Cálculo dos quartis e contagens",
+            list(OUTLIER_METHODS),
+            format_func=lambda method: OUTLIER_METHODS[method][0],
+            key="outlier_method",
+        )
+        if OUTLIER_METHODS[outlier_method][1]:
+            st.caption(
+                "Quartis aproximados pelos sketches t-digest: podem diferir dos "
+                "percentis exatos das estatísticas descritivas"
+            )
+        with profiler.section("Outliers (IQR)", rows=overview.rows):
+            outlier_df = load_outliers(fingerprint, tuple(numeric_cols), outlier_method)
+        for col in ['Q1', 'Q3', 'IQR', 'Limite Inferior', 'Limite Superior']:
+            outlier_df[col] = outlier_df[col].map("{:.2f}".format)
+        outlier_df['Percentual'] = outlier_df['Percentual'].map("{:.2f}%".format)
         st.dataframe(outlier_df, use_container_width=True)
     
-    with tab4:
+    if active_tab == tabs[3]:
+        # Plotly só é importado quando a aba de gráficos é aberta
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        from analytics.figures import box_figure, density_figure
+
         st.header("4. Visualizações Interativas")
         
         # Sidebar para filtros (mantido do projeto original)
         st.sidebar.header("🔍 Filtros")
 
+        # Valores e limites dos filtros (índice em memória ou metadados do dataset particionado)
+        with profiler.section("Opções dos filtros"):
+            filter_options = load_filter_options(fingerprint)
+
         # Filtro por companhia aérea
         airlines = st.sidebar.multiselect(
             "Selecione as Companhias Aéreas:",
-            options=df['airline'].unique(),
-            default=df['airline'].unique()
+            options=filter_options.values('airline'),
+            default=filter_options.values('airline')
         )
 
         # Filtro por cidade de origem
         source_cities = st.sidebar.multiselect(
             "Selecione as Cidades de Origem:",
-            options=df['source_city'].unique(),
-            default=df['source_city'].unique()
+            options=filter_options.values('source_city'),
+            default=filter_options.values('source_city')
         )
 
         # Filtro por cidade de destino
         destination_cities = st.sidebar.multiselect(
             "Selecione as Cidades de Destino:",
-            options=df['destination_city'].unique(),
-            default=df['destination_city'].unique()
+            options=filter_options.values('destination_city'),
+            default=filter_options.values('destination_city')
         )
 
         # Filtro por classe
         classes = st.sidebar.multiselect(
             "Selecione as Classes:",
-            options=df['class'].unique(),
-            default=df['class'].unique()
+            options=filter_options.values('class'),
+            default=filter_options.values('class')
         )
 
         # Filtro por número de paradas
         stops = st.sidebar.multiselect(
             "Selecione o Número de Paradas:",
-            options=df['stops'].unique(),
-            default=df['stops'].unique()
+            options=filter_options.values('stops'),
+            default=filter_options.values('stops')
         )
 
         # Filtro por faixa de preço
+        price_min, price_max = filter_options.bounds('price')
         price_range = st.sidebar.slider(
             "Faixa de Preço:",
-            min_value=int(df['price'].min()),
-            max_value=int(df['price'].max()),
-            value=(int(df['price'].min()), int(df['price'].max()))
+            min_value=int(price_min),
+            max_value=int(price_max),
+            value=(int(price_min), int(price_max))
         )
 
         # Filtro por duração do voo
+        duration_min, duration_max = filter_options.bounds('duration')
         duration_range = st.sidebar.slider(
             "Duração do Voo (horas):",
-            min_value=float(df['duration'].min()),
-            max_value=float(df['duration'].max()),
-            value=(float(df['duration'].min()), float(df['duration'].max()))
+            min_value=float(duration_min),
+            max_value=float(duration_max),
+            value=(float(duration_min), float(duration_max))
         )
 
         # Aplicar filtros
-        filtered_df = df[
-            (df['airline'].isin(airlines)) &
-            (df['source_city'].isin(source_cities)) &
-            (df['destination_city'].isin(destination_cities)) &
-            (df['class'].isin(classes)) &
-            (df['stops'].isin(stops)) &
-            (df['price'] >= price_range[0]) &
-            (df['price'] <= price_range[1]) &
-            (df['duration'] >= duration_range[0]) &
-            (df['duration'] <= duration_range[1])
-        ]
+        filters = FlightFilters.build(
+            categories={
+                'airline': airlines,
+                'source_city': source_cities,
+                'destination_city': destination_cities,
+                'class': classes,
+                'stops': stops,
+            },
+            ranges={'price': price_range, 'duration': duration_range}
+        )
+        with profiler.section("Aplicação dos filtros", rows=overview.rows):
+            filtered_df = load_filtered(fingerprint, filters)
+
+        # Agregados da seleção obtidos do cubo (sem reagrupar linhas brutas)
+        with profiler.section("Agregados do cubo (filtros)"):
+            summary = load_selection_summary(fingerprint, filters)
+            overall = summary.overall
 
         # Exibir métricas principais
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total de Voos", len(filtered_df))
+            st.metric("Total de Voos", int(overall['count']))
         with col2:
-            st.metric("Preço Médio", f"R$ {filtered_df['price'].mean():.2f}")
+            st.metric("Preço Médio", f"R$ {overall['price_mean']:.2f}")
         with col3:
-            st.metric("Duração Média", f"{filtered_df['duration'].mean():.2f}h")
+            st.metric("Duração Média", f"{overall['duration_mean']:.2f}h")
         with col4:
-            st.metric("Companhias Aéreas", filtered_df['airline'].nunique())
+            st.metric("Companhias Aéreas", len(summary.airlines))
         st.markdown("---")
 
-        # Gráficos (mantidos do projeto original)
+        # Gráficos (mantidos do projeto original). As figuras ficam em cache
+        # por versão do dataset e assinatura dos filtros: interações que não
+        # mudam a seleção não remontam nem revalidam os gráficos
+        server_side_plots = server_side_plots_toggle()
+        chart_key = (fingerprint, filters.signature())
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("📊 Distribuição de Preços por Companhia Aérea")
-            fig_price = px.box(
-                filtered_df, 
-                x='airline', 
-                y='price',
-                title="Distribuição de Preços por Companhia Aérea",
-                color='airline'
-            )
-            fig_price.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_price, use_container_width=True)
+            with profiler.section("Gráfico: preços por companhia", rows=len(filtered_df)) as timing:
+                def build_price():
+                    if server_side_plots:
+                        fig_price = box_figure(
+                            load_grouped_box_stats(fingerprint, filters, 'airline', 'price'),
+                            title="Distribuição de Preços por Companhia Aérea",
+                            x_title="airline",
+                            y_title="price",
+                            color=True
+                        )
+                    else:
+                        fig_price = px.box(
+                            filtered_df, 
+                            x='airline', 
+                            y='price',
+                            title="Distribuição de Preços por Companhia Aérea",
+                            color='airline'
+                        )
+                    fig_price.update_layout(xaxis_tickangle=-45)
+                    return fig_price
+                cached_chart("price_by_airline", (*chart_key, server_side_plots), build_price, timing)
 
         with col2:
             st.subheader("⏱️ Duração Média por Rota")
-            route_duration = filtered_df.groupby(['source_city', 'destination_city'])['duration'].mean().reset_index()
-            route_duration['route'] = route_duration['source_city'] + ' → ' + route_duration['destination_city']
-            
-            fig_duration = px.bar(
-                route_duration.head(10), 
-                x='route', 
-                y='duration',
-                title="Top 10 Rotas por Duração Média",
-                color='duration',
-                color_continuous_scale='viridis'
-            )
-            fig_duration.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_duration, use_container_width=True)
+            with profiler.section("Gráfico: duração por rota") as timing:
+                def build_duration():
+                    route_duration = summary.routes.rename(columns={'duration_mean': 'duration'})
+                
+                    fig_duration = px.bar(
+                        route_duration.head(10), 
+                        x='route', 
+                        y='duration',
+                        title="Top 10 Rotas por Duração Média",
+                        color='duration',
+                        color_continuous_scale='viridis'
+                    )
+                    fig_duration.update_layout(xaxis_tickangle=-45)
+                    return fig_duration
+                cached_chart("duration_by_route", chart_key, build_duration, timing)
 
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("🕐 Voos por Horário de Partida")
-            departure_counts = filtered_df['departure_time'].value_counts()
-            
-            fig_departure = px.pie(
-                values=departure_counts.values,
-                names=departure_counts.index,
-                title="Distribuição de Voos por Horário de Partida"
-            )
-            st.plotly_chart(fig_departure, use_container_width=True)
+            with profiler.section("Gráfico: horários de partida") as timing:
+                def build_departure():
+                    departure_counts = summary.departures['count']
+                
+                    return px.pie(
+                        values=departure_counts.values,
+                        names=departure_counts.index,
+                        title="Distribuição de Voos por Horário de Partida"
+                    )
+                cached_chart("departure_times", chart_key, build_departure, timing)
 
         with col2:
             st.subheader("💰 Relação Preço vs Duração")
-            fig_scatter = px.scatter(
-                filtered_df.sample(min(1000, len(filtered_df))), 
-                x='duration', 
-                y='price',
-                color='airline',
-                size='days_left',
-                title="Relação entre Preço e Duração do Voo",
-                hover_data=['source_city', 'destination_city']
-            )
-            st.plotly_chart(fig_scatter, use_container_width=True)
+            with profiler.section("Gráfico: preço vs duração", rows=len(filtered_df)) as timing:
+                def build_scatter():
+                    # Amostra estratificada por companhia com semente fixa: o gráfico
+                    # não muda entre reruns com os mesmos filtros
+                    scatter_sample = load_scatter_sample(
+                        fingerprint, filters, 'airline',
+                        ('duration', 'price', 'airline', 'days_left', 'source_city', 'destination_city'),
+                    )
+                    if server_side_plots:
+                        return density_figure(
+                            load_density(fingerprint, filters, 'duration', 'price'),
+                            title="Relação entre Preço e Duração do Voo",
+                            x_title="duration",
+                            y_title="price",
+                            sample=scatter_sample,
+                            x='duration',
+                            y='price',
+                            color='airline',
+                            hover=('source_city', 'destination_city'),
+                        )
+                    return px.scatter(
+                        scatter_sample, 
+                        x='duration', 
+                        y='price',
+                        color='airline',
+                        size='days_left',
+                        title="Relação entre Preço e Duração do Voo",
+                        hover_data=['source_city', 'destination_city']
+                    )
+                cached_chart("price_vs_duration", (*chart_key, server_side_plots), build_scatter, timing)
 
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("📈 Preço Médio por Dias Restantes")
-            price_by_days = filtered_df.groupby('days_left')['price'].mean().reset_index()
-            
-            fig_days = px.line(
-                price_by_days, 
-                x='days_left', 
-                y='price',
-                title="Variação do Preço Médio por Dias Restantes para o Voo",
-                markers=True
-            )
-            st.plotly_chart(fig_days, use_container_width=True)
+            with profiler.section("Gráfico: preço por dias restantes") as timing:
+                def build_days():
+                    price_by_days = summary.days_left['price_mean'].rename('price').reset_index()
+                
+                    return px.line(
+                        price_by_days, 
+                        x='days_left', 
+                        y='price',
+                        title="Variação do Preço Médio por Dias Restantes para o Voo",
+                        markers=True
+                    )
+                cached_chart("price_by_days_left", chart_key, build_days, timing)
 
         with col2:
             st.subheader("🛑 Análise de Paradas")
-            stops_analysis = filtered_df.groupby('stops').agg({
-                'price': 'mean',
-                'duration': 'mean',
-                'flight': 'count'
-            }).reset_index()
-            stops_analysis.columns = ['stops', 'preço_médio', 'duração_média', 'quantidade_voos']
-            
-            fig_stops = make_subplots(
-                rows=1, cols=2,
-                subplot_titles=('Preço Médio por Paradas', 'Duração Média por Paradas'),
-                specs=[[{'secondary_y': False}, {'secondary_y': False}]]
-            )
-            
-            fig_stops.add_trace(
-                go.Bar(x=stops_analysis['stops'], y=stops_analysis['preço_médio'], name='Preço Médio'),
-                row=1, col=1
-            )
-            
-            fig_stops.add_trace(
-                go.Bar(x=stops_analysis['stops'], y=stops_analysis['duração_média'], name='Duração Média'),
-                row=1, col=2
-            )
-            
-            fig_stops.update_layout(showlegend=False)
-            st.plotly_chart(fig_stops, use_container_width=True)
+            with profiler.section("Gráfico: análise de paradas") as timing:
+                def build_stops():
+                    stops_analysis = summary.stops[['price_mean', 'duration_mean', 'count']].reset_index()
+                    stops_analysis.columns = ['stops', 'preço_médio', 'duração_média', 'quantidade_voos']
+                
+                    fig_stops = make_subplots(
+                        rows=1, cols=2,
+                        subplot_titles=('Preço Médio por Paradas', 'Duração Média por Paradas'),
+                        specs=[[{'secondary_y': False}, {'secondary_y': False}]]
+                    )
+                
+                    fig_stops.add_trace(
+                        go.Bar(x=stops_analysis['stops'], y=stops_analysis['preço_médio'], name='Preço Médio'),
+                        row=1, col=1
+                    )
+                
+                    fig_stops.add_trace(
+                        go.Bar(x=stops_analysis['stops'], y=stops_analysis['duração_média'], name='Duração Média'),
+                        row=1, col=2
+                    )
+                
+                    fig_stops.update_layout(showlegend=False)
+                    return fig_stops
+                cached_chart("stops_analysis", chart_key, build_stops, timing)
 
         st.subheader("🗺️ Mapa de Rotas")
 
         st.markdown("---")
         st.subheader("🔍 Insights dos Dados")
 
+        insights = selection_insights(summary)
         insights_col1, insights_col2 = st.columns(2)
         with insights_col1:
             st.markdown("### 📊 Estatísticas Gerais")
-            most_expensive_airline = filtered_df.groupby('airline')['price'].mean().idxmax()
-            most_expensive_price = filtered_df.groupby('airline')['price'].mean().max()
-            most_popular_route = filtered_df.groupby(['source_city', 'destination_city']).size().idxmax()
-            st.write(f"**Companhia aérea mais cara:** {most_expensive_airline} (R$ {most_expensive_price:.2f})")
-            st.write(f"**Rota mais popular:** {most_popular_route[0]} → {most_popular_route[1]}")
-            best_time = filtered_df.groupby('departure_time')['price'].mean().idxmin()
-            best_price = filtered_df.groupby('departure_time')['price'].mean().min()
-            st.write(f"**Melhor horário (menor preço):** {best_time} (R$ {best_price:.2f})")
+            st.write(f"**Companhia aérea mais cara:** {insights.most_expensive_airline} (R$ {insights.most_expensive_price:.2f})")
+            st.write(f"**Rota mais popular:** {insights.popular_route[0]} → {insights.popular_route[1]}")
+            st.write(f"**Melhor horário (menor preço):** {insights.best_departure_time} (R$ {insights.best_departure_price:.2f})")
 
         with insights_col2:
             st.markdown("### 💡 Recomendações")
-            correlation = filtered_df['days_left'].corr(filtered_df['price'])
-            if correlation > 0.1:
+            if insights.price_trend == "sobe":
                 st.write("📈 **Compre com antecedência:** Preços tendem a aumentar próximo à data do voo")
-            elif correlation < -0.1:
+            elif insights.price_trend == "cai":
                 st.write("📉 **Compre próximo à data:** Preços tendem a diminuir próximo à data do voo")
             else:
                 st.write("📊 **Preços estáveis:** Não há correlação forte entre antecedência e preço")
             
-            zero_stops_avg = filtered_df[filtered_df['stops'] == 'zero']['price'].mean()
-            one_stop_avg = filtered_df[filtered_df['stops'] == 'one']['price'].mean() if 'one' in filtered_df['stops'].values else 0
-            
-            if zero_stops_avg < one_stop_avg:
+            if insights.direct_cheaper:
                 st.write("✈️ **Voos diretos são mais baratos** em média")
             else:
                 st.write("🔄 **Voos com paradas podem ser mais econômicos**")
@@ -484,17 +492,39 @@ def data_analysis_page(df):
         st.subheader("📋 Dados Filtrados")
         st.dataframe(filtered_df.head(100), use_container_width=True)
 
-        # Opção para download dos dados filtrados (mantida do projeto original)
-        csv = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Baixar dados filtrados (CSV)",
-            data=csv,
-            file_name='dados_voos_filtrados.csv',
-            mime='text/csv'
-        )
+        # Download dos dados filtrados: o arquivo só é gerado quando pedido
+        # e fica em cache por seleção de filtros e formato
+        export_col, prepare_col = st.columns([3, 1])
+        with export_col:
+            export_format = st.selectbox(
+                "Formato do arquivo",
+                list(EXPORT_FORMATS),
+                format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+                key="export_format",
+            )
+        export_request = (filters.signature(), export_format)
+        with prepare_col:
+            st.write("")
+            if st.button("⚙️ Preparar arquivo", key="prepare_export"):
+                st.session_state["export_request"] = export_request
+
+        if st.session_state.get("export_request") == export_request:
+            label, mime, extension = EXPORT_FORMATS[export_format]
+            with st.spinner("Gerando arquivo..."):
+                with profiler.section("Exportação do arquivo", rows=len(filtered_df)):
+                    data = load_export(fingerprint, filters, export_format)
+            st.download_button(
+                label=f"📥 Baixar dados filtrados ({label})",
+                data=data,
+                file_name=f"dados_voos_filtrados{extension}",
+                mime=mime,
+            )
 
-df = load_data()
-data_analysis_page(df)
+with profiler.section("Carregamento dos dados") as timing:
+    overview = load_overview(refresh_fingerprint())
+    timing.rows = overview.rows
+data_analysis_page(overview, profiler)
+profiling_panel(profiler)
 
 if menu_choice == "Home":
     st.switch_page("Home.py")
@@ -1,14 +1,19 @@
 
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy import stats
-from scipy.stats import t, norm, chi2_contingency
 import warnings
 warnings.filterwarnings("ignore")
 from sidebar import sidebar_menu
+from components import (
+    lazy_expander, lazy_tabs, plotly_chart, profiling_panel, server_side_plots_toggle, start_profiler,
+)
+from analytics.data import (
+    data_for, load_box_stats, load_chi_square, load_density, load_fingerprint, load_histogram,
+    load_hypothesis_results, load_median, load_moments, load_overview, load_scatter_sample,
+    refresh_fingerprint,
+)
+from analytics.contingency import parse_edges
+from analytics.moments import proportion_interval, z_interval
 
 
 # Oculta o menu padrão do Streamlit multipage
@@ -25,31 +30,41 @@ hide_streamlit_style = """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
 menu_choice = sidebar_menu()
+profiler = start_profiler("Dashboard")
 
-# Função para carregar os dados 
-@st.cache_data
-def load_data():
-    df = pd.read_csv(r"data/airlines_flights_data.csv")
-    return df
+with profiler.section("Carregamento dos dados") as timing:
+    overview = load_overview(refresh_fingerprint())
+    timing.rows = overview.rows
 
-df = load_data()
-
-def statistical_analysis_page(df):
+def statistical_analysis_page(overview, profiler):
     """
     Aba dedicada à análise estatística com intervalos de confiança e testes de hipótese
     """
     st.header("📊 Análise Estatística Avançada")
     st.markdown("---")
     
-    # Criar sub-abas
-    subtab1, subtab2, subtab3, subtab4 = st.tabs([
+    fingerprint = load_fingerprint()
+    
+    # Momentos do preço calculados em uma única passada (em cache)
+    with profiler.section("Momentos do preço", rows=overview.rows):
+        price_moments = load_moments(fingerprint, "price")
+        price_median = load_median(fingerprint, "price")
+        direct_moments = load_moments(fingerprint, "price", ("stops", "==", "zero"))
+    
+    # Criar sub-abas (só a sub-aba ativa é calculada)
+    subtabs = [
         "🎯 Parâmetro Escolhido",
         "📏 Intervalos de Confiança", 
         "🧪 Testes de Hipótese",
         "📋 Resumo e Conclusões"
-    ])
+    ]
+    active_subtab = lazy_tabs(subtabs, key="statistical_analysis_tab")
     
-    with subtab1:
+    if active_subtab == subtabs[0]:
+        # Plotly é importado só nas abas que desenham gráficos
+        import plotly.express as px
+        from analytics.figures import box_figure, histogram_figure
+
         st.subheader("1. Parâmetro Escolhido para Análise: PREÇO DOS VOOS")
         
         col1, col2 = st.columns([2, 1])
@@ -75,60 +90,75 @@ def statistical_analysis_page(df):
         
         with col2:
             # Estatísticas básicas do preço
-            st.metric("Preço Médio", f"R$ {df['price'].mean():.2f}")
-            st.metric("Preço Mediano", f"R$ {df['price'].median():.2f}")
-            st.metric("Desvio Padrão", f"R$ {df['price'].std():.2f}")
-            st.metric("Coef. Variação", f"{(df['price'].std()/df['price'].mean()*100):.1f}%")
+            st.metric("Preço Médio", f"R$ {price_moments.mean:.2f}")
+            st.metric("Preço Mediano", f"R$ {price_median:.2f}")
+            st.metric("Desvio Padrão", f"R$ {price_moments.std:.2f}")
+            st.metric("Coef. Variação", f"{price_moments.cv:.1f}%")
         
         # Visualização da distribuição dos preços
         st.subheader("📊 Distribuição dos Preços")
         
+        server_side_plots = server_side_plots_toggle()
         col1, col2 = st.columns(2)
         
         with col1:
             # Histograma
-            fig_hist = px.histogram(
-                df, 
-                x="price", 
-                nbins=50,
-                title="Distribuição dos Preços dos Voos",
-                labels={"price": "Preço (R$)", "count": "Frequência"}
-            )
-            fig_hist.add_vline(x=df["price"].mean(), line_dash="dash", line_color="red", 
-                              annotation_text=f"Média: R$ {df['price'].mean():.0f}")
-            fig_hist.add_vline(x=df['price'].median(), line_dash="dash", line_color="green", 
-                              annotation_text=f"Mediana: R$ {df['price'].median():.0f}")
-            st.plotly_chart(fig_hist, use_container_width=True)
+            with profiler.section("Gráfico: histograma", rows=overview.rows) as timing:
+                if server_side_plots:
+                    fig_hist = histogram_figure(
+                        load_histogram(fingerprint, "price", 50),
+                        title="Distribuição dos Preços dos Voos",
+                        x_title="Preço (R$)"
+                    )
+                else:
+                    fig_hist = px.histogram(
+                        data_for(fingerprint, ("price",)),
+                        x="price", 
+                        nbins=50,
+                        title="Distribuição dos Preços dos Voos",
+                        labels={"price": "Preço (R$)", "count": "Frequência"}
+                    )
+                fig_hist.add_vline(x=price_moments.mean, line_dash="dash", line_color="red", 
+                                  annotation_text=f"Média: R$ {price_moments.mean:.0f}")
+                fig_hist.add_vline(x=price_median, line_dash="dash", line_color="green", 
+                                  annotation_text=f"Mediana: R$ {price_median:.0f}")
+                plotly_chart(fig_hist, timing)
         
         with col2:
             # Box plot
-            fig_box = px.box(
-                df, 
-                y="price",
-                title="Box Plot dos Preços",
-                labels={"price": "Preço (R$)"}
-            )
-            st.plotly_chart(fig_box, use_container_width=True)
+            with profiler.section("Gráfico: box plot", rows=overview.rows) as timing:
+                if server_side_plots:
+                    fig_box = box_figure(
+                        {"Preço": load_box_stats(fingerprint, "price")},
+                        title="Box Plot dos Preços",
+                        y_title="Preço (R$)"
+                    )
+                else:
+                    fig_box = px.box(
+                        data_for(fingerprint, ("price",)),
+                        y="price",
+                        title="Box Plot dos Preços",
+                        labels={"price": "Preço (R$)"}
+                    )
+                plotly_chart(fig_box, timing)
     
-    with subtab2:
+    if active_subtab == subtabs[1]:
         st.subheader("2. Intervalos de Confiança")
         
         # IC para a média geral dos preços
         st.markdown("### 📏 Intervalo de Confiança para a Média Geral dos Preços")
         
-        n = len(df)
-        mean_price = df["price"].mean()
-        std_price = df["price"].std()
-        se_price = std_price / np.sqrt(n)
+        n = price_moments.n
+        mean_price = price_moments.mean
+        std_price = price_moments.std
         
-        # IC 95% para a média
+        # IC 95% para a média (derivado dos momentos em cache)
         confidence_level = st.slider("Nível de Confiança (%)", 90, 99, 95) / 100
-        alpha = 1 - confidence_level
-        z_critical = norm.ppf(1 - alpha/2)
-        
-        margin_error = z_critical * se_price
-        ci_lower = mean_price - margin_error
-        ci_upper = mean_price + margin_error
+        mean_ci = z_interval(price_moments, confidence_level)
+        se_price = mean_ci.se
+        z_critical = mean_ci.critical
+        margin_error = mean_ci.margin
+        ci_lower, ci_upper = mean_ci.lower, mean_ci.upper
         
         col1, col2 = st.columns(2)
         
@@ -152,42 +182,45 @@ def statistical_analysis_page(df):
             """)
         
         # Visualização do IC
-        fig_ic = go.Figure()
+        with profiler.section("Gráfico: intervalo de confiança") as timing:
+            import plotly.graph_objects as go
+            from scipy.stats import norm
+
+            fig_ic = go.Figure()
         
-        # Distribuição normal
-        x = np.linspace(mean_price - 4*se_price, mean_price + 4*se_price, 1000)
-        y = norm.pdf(x, mean_price, se_price)
+            # Distribuição normal
+            x = np.linspace(mean_price - 4*se_price, mean_price + 4*se_price, 1000)
+            y = norm.pdf(x, mean_price, se_price)
         
-        fig_ic.add_trace(go.Scatter(x=x, y=y, mode="lines", name="Distribuição da Média"))
-        fig_ic.add_vline(x=ci_lower, line_dash="dash", line_color="red", annotation_text=f"IC Inferior: {ci_lower:.2f}")
-        fig_ic.add_vline(x=ci_upper, line_dash="dash", line_color="red", annotation_text=f"IC Superior: {ci_upper:.2f}")
-        fig_ic.add_vline(x=mean_price, line_color="blue", annotation_text=f"Média: {mean_price:.2f}")
+            fig_ic.add_trace(go.Scatter(x=x, y=y, mode="lines", name="Distribuição da Média"))
+            fig_ic.add_vline(x=ci_lower, line_dash="dash", line_color="red", annotation_text=f"IC Inferior: {ci_lower:.2f}")
+            fig_ic.add_vline(x=ci_upper, line_dash="dash", line_color="red", annotation_text=f"IC Superior: {ci_upper:.2f}")
+            fig_ic.add_vline(x=mean_price, line_color="blue", annotation_text=f"Média: {mean_price:.2f}")
         
-        fig_ic.update_layout(
-            title=f"Intervalo de Confiança {confidence_level*100:.0f}% para a Média dos Preços",
-            xaxis_title="Preço (R$)",
-            yaxis_title="Densidade"
-        )
+            fig_ic.update_layout(
+                title=f"Intervalo de Confiança {confidence_level*100:.0f}% para a Média dos Preços",
+                xaxis_title="Preço (R$)",
+                yaxis_title="Densidade"
+            )
         
-        st.plotly_chart(fig_ic, use_container_width=True)
+            plotly_chart(fig_ic, timing)
         
         # IC para proporção de voos diretos
         st.markdown("### 📏 Intervalo de Confiança para Proporção de Voos Diretos")
         
-        direct_flights = df[df["stops"] == "zero"]
-        p_direct = len(direct_flights) / len(df)
-        
-        se_prop = np.sqrt(p_direct * (1 - p_direct) / n)
-        margin_error_prop = z_critical * se_prop
-        ci_prop_lower = p_direct - margin_error_prop
-        ci_prop_upper = p_direct + margin_error_prop
+        n_direct = direct_moments.n
+        prop_ci = proportion_interval(n_direct, n, confidence_level)
+        p_direct = prop_ci.estimate
+        se_prop = prop_ci.se
+        margin_error_prop = prop_ci.margin
+        ci_prop_lower, ci_prop_upper = prop_ci.lower, prop_ci.upper
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.write("**Parâmetros da Análise:**")
             st.write(f"• Total de voos: {n:,}")
-            st.write(f"• Voos diretos: {len(direct_flights):,}")
+            st.write(f"• Voos diretos: {n_direct:,}")
             st.write(f"• Proporção amostral: {p_direct:.4f}")
             st.write(f"• Erro padrão: {se_prop:.4f}")
             st.write(f"• Margem de erro: {margin_error_prop:.4f}")
@@ -204,13 +237,21 @@ def statistical_analysis_page(df):
             Com {confidence_level*100:.0f}% de confiança, a proporção de voos diretos está entre {ci_prop_lower*100:.2f}% e {ci_prop_upper*100:.2f}%
             """)
     
-    with subtab3:
+    if active_subtab == subtabs[2]:
+        import plotly.express as px
+        from analytics.figures import density_figure
+
         st.subheader("3. Testes de Hipótese")
         
+        # Testes calculados uma única vez (em cache) e lidos pelas abas 3 e 4;
+        # o slider de confiança só afeta os intervalos de confiança
+        with profiler.section("Testes de hipótese", rows=overview.rows):
+            results = load_hypothesis_results(fingerprint)
+        
         # Teste 1: ANOVA - Diferença entre companhias
         st.markdown("### 🧪 Teste 1: ANOVA - Diferença de Preços entre Companhias Aéreas")
         
-        with st.expander("Ver detalhes do teste", expanded=True):
+        if lazy_expander("Ver detalhes do teste", key="test_details_anova", expanded=True):
             st.write("""
             **Hipóteses:**
             - H₀: μ₁ = μ₂ = μ₃ = μ₄ = μ₅ = μ₆ (todas as companhias têm preço médio igual)
@@ -218,19 +259,19 @@ def statistical_analysis_page(df):
             - Nível de significância: α = 0.05
             """)
             
-            # Realizar ANOVA
-            airlines = df["airline"].unique()
-            price_groups = [df[df["airline"] == airline]["price"] for airline in airlines]
-            f_stat, p_value_anova = stats.f_oneway(*price_groups)
+            # Resultado da ANOVA
+            anova = results.anova
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.write("**Resultados do Teste:**")
-                st.write(f"• Estatística F: {f_stat:.3f}")
-                st.write(f"• Valor-p: {p_value_anova:.2e}")
+                st.write(f"• Estatística F: {anova.f_stat:.3f}")
+                st.write(f"• Valor-p: {anova.p_value:.2e}")
+                st.write(f"• Welch (variâncias desiguais): F = {anova.welch_f:.3f}, valor-p = {anova.welch_p:.2e}")
+                st.write(f"• Kruskal-Wallis (postos): H = {anova.kruskal_h:.3f}, valor-p = {anova.kruskal_p:.2e}")
                 
-                if p_value_anova < 0.05:
+                if results.rejects(anova.p_value):
                     st.success("**Decisão:** Rejeitar H₀")
                     st.success("**Conclusão:** Existe diferença significativa entre os preços médios das companhias aéreas")
                 else:
@@ -239,14 +280,13 @@ def statistical_analysis_page(df):
             
             with col2:
                 # Estatísticas por companhia
-                airline_stats = df.groupby("airline")["price"].agg(["count", "mean", "std"]).round(2)
                 st.write("**Estatísticas por Companhia:**")
-                st.dataframe(airline_stats)
+                st.dataframe(anova.group_stats)
         
         # Teste 2: Teste t - Voos diretos vs com paradas
         st.markdown("### 🧪 Teste 2: Teste t - Voos Diretos vs Voos com Paradas")
         
-        with st.expander("Ver detalhes do teste", expanded=True):
+        if lazy_expander("Ver detalhes do teste", key="test_details_ttest", expanded=True):
             st.write("""
             **Hipóteses:**
             - H₀: μ_diretos = μ_com_paradas (preços médios são iguais)
@@ -254,26 +294,19 @@ def statistical_analysis_page(df):
             - Nível de significância: α = 0.05
             """)
             
-            direct_prices = df[df["stops"] == "zero"]["price"]
-            indirect_prices = df[df["stops"] != "zero"]["price"]
-            
-            # Teste de igualdade de variâncias
-            levene_stat, levene_p = stats.levene(direct_prices, indirect_prices)
-            equal_var = levene_p > 0.05
-            
-            # Teste t
-            t_stat, p_value_t = stats.ttest_ind(direct_prices, indirect_prices, equal_var=equal_var)
+            # Resultado do teste de Levene + teste t
+            ttest = results.ttest
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.write("**Resultados do Teste:**")
-                st.write(f"• Teste de Levene (variâncias): {levene_stat:.3f} (p = {levene_p:.3f})")
-                st.write(f"• Variâncias iguais: {'Sim' if equal_var else 'Não'}")
-                st.write(f"• Estatística t: {t_stat:.3f}")
-                st.write(f"• Valor-p: {p_value_t:.2e}")
+                st.write(f"• Teste de Levene (variâncias): {ttest.levene_stat:.3f} (p = {ttest.levene_p:.3f})")
+                st.write(f"• Variâncias iguais: {'Sim' if ttest.equal_var else 'Não'}")
+                st.write(f"• Estatística t: {ttest.t_stat:.3f}")
+                st.write(f"• Valor-p: {ttest.p_value:.2e}")
                 
-                if p_value_t < 0.05:
+                if results.rejects(ttest.p_value):
                     st.success("**Decisão:** Rejeitar H₀")
                     st.success("**Conclusão:** Existe diferença significativa entre preços de voos diretos e com paradas")
                 else:
@@ -283,25 +316,20 @@ def statistical_analysis_page(df):
             with col2:
                 st.write("**Estatísticas Descritivas:**")
                 st.write(f"• **Voos diretos:**")
-                st.write(f"  - Média: R$ {direct_prices.mean():.2f}")
-                st.write(f"  - DP: R$ {direct_prices.std():.2f}")
-                st.write(f"  - n: {len(direct_prices):,}")
+                st.write(f"  - Média: R$ {ttest.direct_stats['mean']:.2f}")
+                st.write(f"  - DP: R$ {ttest.direct_stats['std']:.2f}")
+                st.write(f"  - n: {ttest.direct_stats['n']:,}")
                 st.write(f"• **Voos com paradas:**")
-                st.write(f"  - Média: R$ {indirect_prices.mean():.2f}")
-                st.write(f"  - DP: R$ {indirect_prices.std():.2f}")
-                st.write(f"  - n: {len(indirect_prices):,}")
+                st.write(f"  - Média: R$ {ttest.indirect_stats['mean']:.2f}")
+                st.write(f"  - DP: R$ {ttest.indirect_stats['std']:.2f}")
+                st.write(f"  - n: {ttest.indirect_stats['n']:,}")
         
         # Teste 3: Qui-quadrado - Classe vs Faixa de preço
         st.markdown("### 🧪 Teste 3: Qui-quadrado - Associação entre Classe e Faixa de Preço")
         
-        with st.expander("Ver detalhes do teste", expanded=True):
-            # Criar faixas de preço
-            df_temp = df.copy()
-            df_temp["price_range"] = pd.cut(df_temp["price"], 
-                                          bins=[0, 5000, 15000, 50000, float("inf")], 
-                                          labels=["Baixo", "Médio", "Alto", "Premium"])
-            
-            contingency_table = pd.crosstab(df_temp["class"], df_temp["price_range"])
+        if lazy_expander("Ver detalhes do teste", key="test_details_chi2", expanded=True):
+            # Tabela de contingência classe × faixa de preço
+            chi2 = results.chi2
             
             st.write("""
             **Hipóteses:**
@@ -314,30 +342,60 @@ def statistical_analysis_page(df):
             
             with col1:
                 st.write("**Tabela de Contingência:**")
-                st.dataframe(contingency_table)
+                st.dataframe(chi2.contingency_table)
             
             with col2:
                 # Teste qui-quadrado
-                chi2_stat, p_value_chi2, dof, expected = chi2_contingency(contingency_table)
-                
                 st.write("**Resultados do Teste:**")
-                st.write(f"• Estatística Qui-quadrado: {chi2_stat:.3f}")
-                st.write(f"• Graus de liberdade: {dof}")
-                st.write(f"• Valor-p: {p_value_chi2:.2e}")
+                st.write(f"• Estatística Qui-quadrado: {chi2.chi2_stat:.3f}")
+                st.write(f"• Graus de liberdade: {chi2.dof}")
+                st.write(f"• Valor-p: {chi2.p_value:.2e}")
                 
-                if p_value_chi2 < 0.05:
+                if results.rejects(chi2.p_value):
                     st.success("**Decisão:** Rejeitar H₀")
                     st.success("**Conclusão:** Existe associação significativa entre classe do voo e faixa de preço")
                 else:
                     st.warning("**Decisão:** Não rejeitar H₀")
                     st.warning("**Conclusão:** Não há evidência de associação significativa")
         
+        # Mesmo teste com outra categoria e outras faixas de preço
+        if lazy_expander("⚙️ Personalizar categoria e faixas de preço", key="chi2_custom"):
+            col1, col2 = st.columns(2)
+            with col1:
+                row_col = st.selectbox(
+                    "Categoria:",
+                    ['class', 'airline', 'stops', 'source_city', 'destination_city', 'departure_time', 'arrival_time'],
+                    key="chi2_row_col"
+                )
+            with col2:
+                edges_text = st.text_input(
+                    "Limites das faixas de preço (R$):",
+                    value="0, 5000, 15000, 50000, inf",
+                    key="chi2_edges"
+                )
+            
+            try:
+                custom_chi2 = load_chi_square(fingerprint, row_col, parse_edges(edges_text))
+            except ValueError as exc:
+                st.error(f"Não foi possível calcular o teste: {exc}")
+            else:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.dataframe(custom_chi2.contingency_table)
+                with col2:
+                    st.write(f"• Estatística Qui-quadrado: {custom_chi2.chi2_stat:.3f}")
+                    st.write(f"• Graus de liberdade: {custom_chi2.dof}")
+                    st.write(f"• Valor-p: {custom_chi2.p_value:.2e}")
+                    if results.rejects(custom_chi2.p_value):
+                        st.success(f"**Decisão:** Rejeitar H₀ — há associação entre {row_col} e faixa de preço")
+                    else:
+                        st.warning(f"**Decisão:** Não rejeitar H₀ — sem evidência de associação entre {row_col} e faixa de preço")
+        
         # Teste 4: Correlação
         st.markdown("### 🧪 Teste 4: Correlação - Duração vs Preço")
         
-        with st.expander("Ver detalhes do teste", expanded=True):
-            correlation_coef = df["duration"].corr(df["price"])
-            n_corr = len(df)
+        if lazy_expander("Ver detalhes do teste", key="test_details_correlation", expanded=True):
+            correlation = results.correlation
             
             st.write("""
             **Hipóteses:**
@@ -346,22 +404,18 @@ def statistical_analysis_page(df):
             - Nível de significância: α = 0.05
             """)
             
-            # Teste de significância da correlação
-            t_corr = correlation_coef * np.sqrt((n_corr - 2) / (1 - correlation_coef**2))
-            p_value_corr = 2 * (1 - stats.t.cdf(abs(t_corr), n_corr - 2))
-            
             col1, col2 = st.columns(2)
             
             with col1:
                 st.write("**Resultados do Teste:**")
-                st.write(f"• Coeficiente de correlação: {correlation_coef:.4f}")
-                st.write(f"• Estatística t: {t_corr:.3f}")
-                st.write(f"• Valor-p: {p_value_corr:.2e}")
+                st.write(f"• Coeficiente de correlação: {correlation.r:.4f}")
+                st.write(f"• Estatística t: {correlation.t_stat:.3f}")
+                st.write(f"• Valor-p: {correlation.p_value:.2e}")
                 
-                if p_value_corr < 0.05:
+                if results.rejects(correlation.p_value):
                     st.success("**Decisão:** Rejeitar H₀")
                     st.success("**Conclusão:** Existe correlação linear significativa")
-                    if correlation_coef > 0:
+                    if correlation.r > 0:
                         st.info("A correlação é **POSITIVA**: quanto maior a duração, maior tende a ser o preço")
                     else:
                         st.info("A correlação é **NEGATIVA**: quanto maior a duração, menor tende a ser o preço")
@@ -371,60 +425,47 @@ def statistical_analysis_page(df):
             
             with col2:
                 # Gráfico de dispersão
-                fig_corr = px.scatter(
-                    df.sample(1000), 
-                    x="duration", 
-                    y="price",
-                    title=f"Correlação: Duração vs Preço (r = {correlation_coef:.4f})",
-                    labels={"duration": "Duração (horas)", "price": "Preço (R$)"}
-                )
-                st.plotly_chart(fig_corr, use_container_width=True)
+                with profiler.section("Gráfico: correlação", rows=overview.rows) as timing:
+                    # Amostra estratificada por companhia e semente fixa (estável entre reruns)
+                    corr_sample = load_scatter_sample(fingerprint, None, "airline", ("duration", "price"))
+                    if server_side_plots_toggle():
+                        fig_corr = density_figure(
+                            load_density(fingerprint, None, "duration", "price"),
+                            title=f"Correlação: Duração vs Preço (r = {correlation.r:.4f})",
+                            x_title="Duração (horas)",
+                            y_title="Preço (R$)",
+                            sample=corr_sample,
+                            x="duration",
+                            y="price",
+                        )
+                    else:
+                        fig_corr = px.scatter(
+                            corr_sample, 
+                            x="duration", 
+                            y="price",
+                            title=f"Correlação: Duração vs Preço (r = {correlation.r:.4f})",
+                            labels={"duration": "Duração (horas)", "price": "Preço (R$)"}
+                        )
+                    plotly_chart(fig_corr, timing)
     
-    with subtab4:
+    if active_subtab == subtabs[3]:
         st.subheader("4. Resumo dos Resultados e Interpretações")
+        with profiler.section("Testes de hipótese (resumo)"):
+            results = load_hypothesis_results(fingerprint)
+        
+        # Intervalos de 95% a partir dos mesmos momentos em cache
+        mean_ci = z_interval(price_moments, 0.95)
+        ci_lower, ci_upper = mean_ci.lower, mean_ci.upper
+        
+        prop_ci = proportion_interval(direct_moments.n, price_moments.n, 0.95)
+        ci_prop_lower, ci_prop_upper = prop_ci.lower, prop_ci.upper
         
-        # Recalcular valores para o resumo
-        n = len(df)
-        mean_price = df["price"].mean()
-        std_price = df["price"].std()
-        se_price = std_price / np.sqrt(n)
-        z_critical = norm.ppf(0.975)  # 95% IC
-        margin_error = z_critical * se_price
-        ci_lower = mean_price - margin_error
-        ci_upper = mean_price + margin_error
-        
-        direct_flights = df[df["stops"] == "zero"]
-        p_direct = len(direct_flights) / len(df)
-        se_prop = np.sqrt(p_direct * (1 - p_direct) / n)
-        margin_error_prop = z_critical * se_prop
-        ci_prop_lower = p_direct - margin_error_prop
-        ci_prop_upper = p_direct + margin_error_prop
-        
-        # ANOVA
-        airlines = df["airline"].unique()
-        price_groups = [df[df["airline"] == airline]["price"] for airline in airlines]
-        f_stat, p_value_anova = stats.f_oneway(*price_groups)
-        
-        # Teste t
-        direct_prices = df[df["stops"] == "zero"]["price"]
-        indirect_prices = df[df["stops"] != "zero"]["price"]
-        levene_stat, levene_p = stats.levene(direct_prices, indirect_prices)
-        equal_var = levene_p > 0.05
-        t_stat, p_value_t = stats.ttest_ind(direct_prices, indirect_prices, equal_var=equal_var)
-        
-        # Qui-quadrado
-        df_temp = df.copy()
-        df_temp["price_range"] = pd.cut(df_temp["price"], 
-                                      bins=[0, 5000, 15000, 50000, float("inf")], 
-                                      labels=["Baixo", "Médio", "Alto", "Premium"])
-        contingency_table = pd.crosstab(df_temp["class"], df_temp["price_range"])
-        chi2_stat, p_value_chi2, dof, expected = chi2_contingency(contingency_table)
-        
-        # Correlação
-        correlation_coef = df["duration"].corr(df["price"])
-        n_corr = len(df)
-        t_corr = correlation_coef * np.sqrt((n_corr - 2) / (1 - correlation_coef**2))
-        p_value_corr = 2 * (1 - stats.t.cdf(abs(t_corr), n_corr - 2))
+        # Testes de hipótese (mesmos resultados em cache da aba anterior)
+        p_value_anova = results.anova.p_value
+        p_value_t = results.ttest.p_value
+        p_value_chi2 = results.chi2.p_value
+        correlation_coef = results.correlation.r
+        p_value_corr = results.correlation.p_value
         
         st.markdown("""
         A análise estatística avançada do preço dos voos revelou insights importantes:
@@ -443,7 +484,8 @@ def statistical_analysis_page(df):
         Os resultados estatísticos fornecem uma base sólida para entender os fatores que influenciam o preço dos voos. A variabilidade entre companhias, o impacto das paradas e da classe, e a correlação com a duração são aspectos cruciais para a tomada de decisão de viajantes e para a otimização de estratégias de precificação por parte das companhias aéreas.
         """)
 
-statistical_analysis_page(df)
+statistical_analysis_page(overview, profiler)
+profiling_panel(profiler)
 
 if menu_choice == "Home":
     st.switch_page("Home.py")
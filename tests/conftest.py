@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.data import apply_schema
+
+AIRLINES = ["Air_India", "AirAsia", "GO_FIRST", "Indigo", "SpiceJet", "Vistara"]
+CITIES = ["Bangalore", "Chennai", "Delhi", "Hyderabad", "Kolkata", "Mumbai"]
+TIMES = ["Afternoon", "Early_Morning", "Evening", "Late_Night", "Morning", "Night"]
+
+
+def make_flights(n, seed=0):
+    """
+    Voos sintéticos com as colunas e o esquema compacto do dataset real
+    """
+    rng = np.random.default_rng(seed)
+    flight_class = rng.choice(["Economy", "Business"], n, p=[0.7, 0.3])
+    price = rng.lognormal(8.5, 0.6, n) * np.where(flight_class == "Business", 6, 1)
+    return apply_schema(pd.DataFrame({
+        "airline": rng.choice(AIRLINES, n),
+        "flight": [f"AI-{i % 900 + 100}" for i in range(n)],
+        "source_city": rng.choice(CITIES, n),
+        "departure_time": rng.choice(TIMES, n),
+        "stops": rng.choice(["zero", "one", "two_or_more"], n, p=[0.2, 0.7, 0.1]),
+        "arrival_time": rng.choice(TIMES, n),
+        "destination_city": rng.choice(CITIES, n),
+        "class": flight_class,
+        "duration": rng.uniform(1, 40, n).round(2),
+        "days_left": rng.integers(1, 50, n),
+        "price": price.round().astype(np.int64),
+    }))
+
+
+@pytest.fixture
+def flights():
+    return make_flights(5_000)
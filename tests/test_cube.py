@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.cube import AggregateCube, RowAggregates, days_left_cube
+from analytics.filters import FlightFilters
+from conftest import make_flights
+
+BY = ["airline", "class"]
+
+
+def _groupby_stats(df, by):
+    grouped = df.assign(
+        price=df["price"].astype(np.float64), duration=df["duration"].astype(np.float64),
+    ).groupby(by, observed=True)
+    expected = pd.DataFrame({"count": grouped.size()})
+    for m in ["price", "duration"]:
+        expected[f"{m}_mean"] = grouped[m].mean()
+        expected[f"{m}_std"] = grouped[m].std()
+        expected[f"{m}_min"] = grouped[m].min()
+        expected[f"{m}_max"] = grouped[m].max()
+    expected["days_left_mean"] = grouped["days_left"].mean()
+    return expected
+
+
+def _assert_rollup(result, df, by):
+    expected = _groupby_stats(df, by)
+    result = result.loc[expected.index, expected.columns]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False, rtol=1e-9)
+
+
+def test_rollup_matches_groupby(flights):
+    cube = AggregateCube.from_frame(flights)
+    _assert_rollup(cube.rollup(BY), flights, BY)
+    _assert_rollup(cube.rollup("departure_time"), flights, ["departure_time"])
+
+
+def test_rollup_with_category_filters(flights):
+    cube = AggregateCube.from_frame(flights)
+    filters = FlightFilters.build(categories={"airline": ["Vistara", "Indigo"], "stops": ["one"]})
+    subset = flights[flights["airline"].isin(["Vistara", "Indigo"]) & (flights["stops"] == "one")]
+    _assert_rollup(cube.rollup("source_city", filters), subset, ["source_city"])
+    with pytest.raises(ValueError):
+        cube.rollup("airline", FlightFilters.build(ranges={"price": (0, 5_000)}))
+
+
+def test_merge_matches_cube_of_concatenation(flights):
+    cube = AggregateCube.from_frame(flights)
+    extra = make_flights(700, seed=9)
+    # Categoria ainda inexistente no cubo: vira célula nova no merge
+    extra["airline"] = extra["airline"].cat.add_categories(["Akasa"])
+    extra.loc[extra.index[:50], "airline"] = "Akasa"
+    merged = cube.merge(AggregateCube.from_frame(extra, sketch_edges=cube.edges))
+    both = pd.concat([flights, extra], ignore_index=True).astype({"airline": "category"})
+    _assert_rollup(merged.rollup(BY), both, BY)
+    assert merged.rollup([])["count"].iloc[0] == len(both)
+    _assert_rollup(cube.append(extra).rollup("airline"), both, ["airline"])
+
+
+def test_merge_rejects_different_buckets(flights):
+    cube = AggregateCube.from_frame(flights)
+    with pytest.raises(ValueError):
+        cube.merge(AggregateCube.from_frame(make_flights(100, seed=4)))
+
+
+def test_median_close_to_exact(flights):
+    cube = AggregateCube.from_frame(flights)
+    median = cube.median("price", "class")
+    expected = flights.groupby("class", observed=True)["price"].median()
+    assert median.loc[expected.index].to_numpy() == pytest.approx(expected.to_numpy(), rel=0.03)
+
+
+def test_days_left_cube_and_row_aggregates_match_groupby(flights):
+    _assert_rollup(days_left_cube(flights).rollup("days_left"), flights, ["days_left"])
+    subset = flights[flights["price"].between(2_000, 9_000)]
+    rows = RowAggregates(subset)
+    _assert_rollup(rows.rollup(BY), subset, BY)
+    expected = np.corrcoef(subset["days_left"], subset["price"])[0, 1]
+    assert rows.correlation("days_left", "price") == pytest.approx(expected)
+    cube_r = AggregateCube.from_frame(flights).correlation("days_left", "price")
+    assert cube_r == pytest.approx(np.corrcoef(flights["days_left"], flights["price"])[0, 1])
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.filters import FilterIndex, FlightFilters
+from conftest import make_flights
+
+SELECTIONS = [
+    FlightFilters.build(),
+    FlightFilters.build(categories={"airline": ["Vistara", "Indigo"]}),
+    FlightFilters.build(categories={"class": ["Business"], "stops": ["zero", "two_or_more"]}),
+    FlightFilters.build(ranges={"price": (3_000, 12_000)}),
+    FlightFilters.build(ranges={"duration": (2.5, 2.5)}),
+    FlightFilters.build(
+        categories={"source_city": ["Delhi"], "airline": ["Air_India", "GO_FIRST", "SpiceJet"]},
+        ranges={"price": (0, 8_000), "duration": (5.0, 30.0)},
+    ),
+    FlightFilters.build(categories={"airline": ["Companhia inexistente"]}),
+]
+
+
+def _pandas_mask(df, filters):
+    mask = pd.Series(True, index=df.index)
+    for col, values in filters.categories:
+        mask &= df[col].isin(values)
+    for col, (low, high) in filters.ranges:
+        mask &= df[col].between(low, high)
+    return mask.to_numpy()
+
+
+def _assert_same_rows(index, df, filters):
+    mask = index.mask(filters)
+    expected = _pandas_mask(df, filters)
+    if mask is None:
+        assert expected.all()
+    else:
+        np.testing.assert_array_equal(mask, expected)
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_mask_matches_pandas_filters(flights, filters):
+    _assert_same_rows(FilterIndex(flights), flights, filters)
+
+
+@pytest.mark.parametrize("filters", SELECTIONS)
+def test_append_matches_index_of_concatenation(flights, filters):
+    index = FilterIndex(flights)
+    df = flights
+    # Lotes pequenos ficam na cauda; o último passa de 1/TAIL_RATIO e reordena
+    for seed, size in [(1, 3), (2, 101), (3, 7), (4, 1_500)]:
+        df = pd.concat([df, make_flights(size, seed)], ignore_index=True)
+        index = index.append(df)
+        _assert_same_rows(index, df, filters)
+
+
+def test_branching_appends_do_not_share_bits(flights):
+    # Duas atualizações a partir do mesmo índice (ex.: duas versões em cache)
+    base = FilterIndex(flights)
+    left = pd.concat([flights, make_flights(9, 10)], ignore_index=True)
+    right = pd.concat([flights, make_flights(9, 11)], ignore_index=True)
+    left_index, right_index = base.append(left), base.append(right)
+    filters = FlightFilters.build(categories={"airline": ["Vistara"]}, ranges={"price": (0, 9_000)})
+    _assert_same_rows(left_index, left, filters)
+    _assert_same_rows(right_index, right, filters)
+    _assert_same_rows(base, flights, filters)
+
+
+def test_bounds_include_appended_rows(flights):
+    extra = make_flights(2, 5)
+    extra["price"] = np.array([1, 900_000], dtype=np.int32)
+    index = FilterIndex(flights).append(pd.concat([flights, extra], ignore_index=True))
+    assert index.bounds("price") == (1, 900_000)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from analytics.grouped import kruskal_wallis
+
+
+def _scipy_kruskal(codes, values, k):
+    return stats.kruskal(*(values[codes == code] for code in range(k)))
+
+
+def test_kruskal_wallis_matches_scipy_with_ties():
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 4, 5_000)
+    values = rng.integers(0, 20, 5_000) + codes  # poucos valores distintos: muitos empates
+    h_stat, p_value = kruskal_wallis(codes, values, 4)
+    expected = _scipy_kruskal(codes, values, 4)
+    assert h_stat == pytest.approx(expected.statistic, rel=1e-9)
+    assert p_value == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-300)
+
+
+def test_kruskal_wallis_ignores_missing_codes():
+    codes = np.array([0, 0, -1, 1, 1, 2, 2, -1])
+    values = np.array([1.0, 2.0, 100.0, 2.0, 3.0, 3.0, 3.0, -5.0])
+    h_stat, _ = kruskal_wallis(codes, values, 3)
+    valid = codes >= 0
+    assert h_stat == pytest.approx(_scipy_kruskal(codes[valid], values[valid], 3).statistic)
+
+
+def test_kruskal_wallis_large_tie_counts_do_not_overflow():
+    # 2,2 milhões de empates num só valor: ties ** 3 passaria do int64
+    rng = np.random.default_rng(1)
+    values = np.concatenate([np.zeros(2_200_000), rng.integers(1, 50, 300_000)])
+    codes = rng.integers(0, 3, len(values))
+    h_stat, p_value = kruskal_wallis(codes, values, 3)
+    expected = _scipy_kruskal(codes, values, 3)
+    assert h_stat >= 0
+    assert h_stat == pytest.approx(expected.statistic, rel=1e-6)
+    assert p_value == pytest.approx(expected.pvalue, rel=1e-6)
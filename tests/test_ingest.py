@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from analytics.ingest import ColumnBuffers, SourceRewritten, read_new_rows, read_snapshot
+
+HEADER = b"airline,price\n"
+
+
+def _write(path, data, mode="wb"):
+    with open(path, mode) as fh:
+        fh.write(data)
+
+
+def test_partial_last_line_waits_for_the_next_refresh(tmp_path):
+    csv = tmp_path / "flights.csv"
+    _write(csv, HEADER + b"Vistara,100\nIndigo,2")
+    df, state = read_snapshot(csv)
+    assert df["price"].tolist() == [100]
+
+    new, state = read_new_rows(csv, state)
+    assert new is None
+
+    # A linha termina de ser escrita e outra começa
+    _write(csv, b"00\nGO_FIRST,3", mode="ab")
+    new, state = read_new_rows(csv, state)
+    assert new.to_dict("list") == {"airline": ["Indigo"], "price": [200]}
+
+    _write(csv, b"00\n", mode="ab")
+    new, state = read_new_rows(csv, state)
+    assert new.to_dict("list") == {"airline": ["GO_FIRST"], "price": [300]}
+    assert state.csv_rows == 3
+
+
+def test_new_partitions_are_read_once(tmp_path):
+    csv = tmp_path / "flights.csv"
+    _write(csv, HEADER + b"Vistara,100\n")
+    parts = tmp_path / "parts"
+    parts.mkdir()
+    _, state = read_snapshot(csv, parts)
+    _write(parts / "flights_001.csv", HEADER + b"AirAsia,50\n")
+    new, state = read_new_rows(csv, state, parts)
+    assert new["airline"].tolist() == ["AirAsia"]
+    assert read_new_rows(csv, state, parts)[0] is None
+
+
+@pytest.mark.parametrize("rewrite", [
+    HEADER + b"Vistara,999\n",   # trecho já lido alterado, mesmo tamanho
+    HEADER,                      # arquivo truncado
+])
+def test_rewritten_source_is_detected(tmp_path, rewrite):
+    csv = tmp_path / "flights.csv"
+    _write(csv, HEADER + b"Vistara,100\n")
+    _, state = read_snapshot(csv)
+    _write(csv, rewrite)
+    with pytest.raises(SourceRewritten):
+        read_new_rows(csv, state)
+
+
+def test_column_buffers_append_matches_concat(flights):
+    buffers = ColumnBuffers(flights.iloc[:10])
+    before = buffers.frame()
+    delta = flights.iloc[10:].copy()
+    # Categoria nova numa coluna categórica força a recodificação das linhas antigas
+    delta["airline"] = delta["airline"].cat.add_categories(["Akasa"])
+    delta.iloc[0, delta.columns.get_loc("airline")] = "Akasa"
+    result = buffers.append(delta)
+
+    expected = pd.concat([flights.iloc[:10].astype({"airline": str}), delta.astype({"airline": str})])
+    pd.testing.assert_frame_equal(
+        result.astype({"airline": str}), expected.reset_index(drop=True), check_categorical=False,
+    )
+    # O DataFrame publicado antes não muda
+    pd.testing.assert_frame_equal(before, flights.iloc[:10].reset_index(drop=True))
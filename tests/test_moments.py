@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from analytics.moments import CoMoments, Moments
+
+
+def test_moments_match_numpy_and_scipy():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(8, 0.7, 200_000)
+    m = Moments.from_values(values, block_size=4096)
+    assert m.n == len(values)
+    assert m.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert m.var == pytest.approx(np.var(values, ddof=1), rel=1e-10)
+    assert m.skew == pytest.approx(stats.skew(values), rel=1e-9)
+    assert m.kurtosis == pytest.approx(stats.kurtosis(values), rel=1e-9)
+    assert (m.min, m.max) == (values.min(), values.max())
+
+
+def test_merge_equals_moments_of_concatenation():
+    rng = np.random.default_rng(1)
+    # Partes de tamanhos e médias bem diferentes exercitam os termos de correção
+    a = rng.normal(1e4, 5, 37)
+    b = rng.normal(-3, 200, 50_001)
+    merged = Moments.from_values(a).merge(Moments.from_values(b))
+    both = np.concatenate([a, b])
+    assert merged.n == len(both)
+    assert merged.mean == pytest.approx(both.mean(), rel=1e-12)
+    assert merged.var == pytest.approx(np.var(both, ddof=1), rel=1e-10)
+    assert merged.skew == pytest.approx(stats.skew(both), rel=1e-8)
+    assert merged.kurtosis == pytest.approx(stats.kurtosis(both), rel=1e-8)
+
+
+def test_merge_with_empty_is_identity():
+    m = Moments.from_values([1.0, 2.0, 4.0])
+    assert m.merge(Moments()) == m
+    assert Moments().merge(m) == m
+    assert np.isnan(Moments.from_values([3.0]).var)
+
+
+def test_comoments_merge_matches_corrcoef():
+    rng = np.random.default_rng(2)
+    x = rng.integers(1, 50, 30_000).astype(np.float64)
+    y = 1000 - 12 * x + rng.normal(0, 80, len(x))
+    merged = CoMoments.from_values(x[:7], y[:7]).merge(CoMoments.from_values(x[7:], y[7:], block_size=1000))
+    assert merged.r == pytest.approx(np.corrcoef(x, y)[0, 1], rel=1e-10)
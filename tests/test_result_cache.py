@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import result_cache
+from analytics.result_cache import KEY_PREFIX, RedisBackend, RedisError, ResultCache
+
+
+def _encode(value):
+    # Respostas no formato RESP
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _parse_commands(payload):
+    commands, pos = [], 0
+    while pos < len(payload):
+        end = payload.index(b"\r\n", pos)
+        count, pos = int(payload[pos + 1:end]), end + 2
+        args = []
+        for _ in range(count):
+            end = payload.index(b"\r\n", pos)
+            length = int(payload[pos + 1:end])
+            args.append(payload[end + 2:end + 2 + length])
+            pos = end + 4 + length
+        commands.append(args)
+    return commands
+
+
+class FakeRedis:
+    """
+    Servidor em memória que responde aos comandos usados pelo RedisBackend
+    """
+
+    def __init__(self, password=None):
+        self.data = {}
+        self.password = password
+        self.commands = []
+        self.connections = 0
+
+    def reply(self, args):
+        name = args[0].upper()
+        self.commands.append([name, *args[1:]])
+        if name == b"AUTH":
+            return b"+OK\r\n" if args[1].decode() == self.password else b"-WRONGPASS invalid password\r\n"
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            return _encode(self.data.get(args[1]))
+        if name == b"SET":
+            self.data[args[1]] = args[2]
+            return b"+OK\r\n"
+        if name == b"SCAN":
+            pattern = args[3].rstrip(b"*")
+            return _encode([b"0", [key for key in self.data if key.startswith(pattern)]])
+        if name == b"DEL":
+            return _encode(sum(self.data.pop(key, None) is not None for key in args[1:]))
+        return b"-ERR unknown command\r\n"
+
+
+class FakeSocket:
+    def __init__(self, server):
+        self.server = server
+        self.pending = bytearray()
+        self.closed = False
+
+    def sendall(self, payload):
+        for args in _parse_commands(payload):
+            self.pending += self.server.reply(args)
+
+    def makefile(self, mode):
+        return self
+
+    def readline(self):
+        end = self.pending.find(b"\n") + 1 or len(self.pending)
+        return self.read(end)
+
+    def read(self, size):
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = FakeRedis(password="segredo")
+
+    def connect(address, timeout=None):
+        server.connections += 1
+        server.address = address
+        return FakeSocket(server)
+
+    monkeypatch.setattr(result_cache.socket, "create_connection", connect)
+    return server
+
+
+def test_resp_round_trip(fake_redis):
+    backend = RedisBackend("redis://:segredo@cache:6380/2")
+    value = bytes(range(256)) * 3 + b"\r\n$-1\r\n"
+    backend.set("a", value, ttl=60)
+    assert backend.get("a") == value
+    assert backend.get("ausente") is None
+    assert fake_redis.address == ("cache", 6380)
+    assert fake_redis.commands[:2] == [[b"AUTH", b"segredo"], [b"SELECT", b"2"]]
+    assert fake_redis.commands[2] == [b"SET", (KEY_PREFIX + "a").encode(), value, b"EX", b"60"]
+
+    fake_redis.data[b"outra:chave"] = b"x"
+    backend.clear()
+    assert list(fake_redis.data) == [b"outra:chave"]
+    assert fake_redis.connections == 1
+
+
+def test_result_cache_over_redis(fake_redis):
+    cache = ResultCache(RedisBackend("redis://:segredo@cache:6379"), version="v1")
+    frame = pd.DataFrame({"price": np.arange(5)})
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return frame
+
+    first = cache.get_or_compute("tabela", {"n": 5}, compute)
+    second = cache.get_or_compute("tabela", {"n": 5}, compute)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def _drop_after(server, size, times=1):
+    # As próximas `times` conexões caem depois de enviar `size` bytes da resposta
+    reply = server.reply
+
+    def truncated(args):
+        data = reply(args)
+        if truncated.remaining and args[0].upper() == b"GET":
+            truncated.remaining -= 1
+            return data[:size]
+        return data
+
+    truncated.remaining = times
+    server.reply = truncated
+
+
+@pytest.mark.parametrize("size", [0, 4, 12])
+def test_connection_lost_mid_reply_reconnects_once(fake_redis, size):
+    backend = RedisBackend("redis://:segredo@cache:6379")
+    backend.set("a", b"valor do resultado", ttl=60)
+    _drop_after(fake_redis, size)
+    assert backend.get("a") == b"valor do resultado"
+    assert fake_redis.connections == 2
+
+
+def test_connection_lost_twice_raises_and_cache_misses(fake_redis):
+    backend = RedisBackend("redis://:segredo@cache:6379")
+    backend.set("a", b"valor do resultado", ttl=60)
+    _drop_after(fake_redis, 9, times=2)
+    with pytest.raises(ConnectionError):
+        backend.get("a")
+    assert backend._sock is None
+
+    _drop_after(fake_redis, 9, times=1)
+    cache = ResultCache(backend, version="v1")
+    assert cache.get_bytes("tabela", {}) is None
+
+
+def test_error_reply_raises_redis_error(fake_redis):
+    backend = RedisBackend("redis://:segredo@cache:6379")
+    backend.set("a", b"1", ttl=60)
+    with pytest.raises(RedisError, match="unknown command"):
+        backend._call("FLUSHALL")
+    # A resposta de erro foi consumida inteira: a conexão continua utilizável
+    assert backend.get("a") == b"1"
+    assert fake_redis.connections == 1
+
+
+def test_wrong_password_raises_redis_error(fake_redis):
+    backend = RedisBackend("redis://:errada@cache:6379")
+    with pytest.raises(RedisError, match="WRONGPASS"):
+        backend.get("a")
+    # A conexão recusada é fechada; a próxima chamada autentica de novo
+    assert backend._sock is None
+    with pytest.raises(RedisError, match="WRONGPASS"):
+        backend.get("a")
+    assert fake_redis.connections == 2
+    cache = ResultCache(backend, version="v1")
+    assert cache.get_or_compute("tabela", {}, lambda: 42) == 42
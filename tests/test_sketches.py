@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from analytics.sketches import TDigest
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def _rank_error(values, estimate, q):
+    # Erro medido em posição (fração das linhas), como o t-digest garante
+    return abs(np.searchsorted(np.sort(values), estimate) / len(values) - q)
+
+
+def test_quantiles_close_to_exact():
+    values = np.random.default_rng(0).lognormal(8.5, 0.8, 100_000)
+    digest = TDigest.from_values(values)
+    assert digest.n == len(values)
+    assert (digest.min, digest.max) == (values.min(), values.max())
+    for q in QUANTILES:
+        assert _rank_error(values, digest.quantile(q), q) < 0.005
+    assert digest.quantile(0.0) == values.min()
+    assert digest.quantile(1.0) == values.max()
+
+
+def test_merge_close_to_digest_of_all_values():
+    rng = np.random.default_rng(1)
+    parts = [rng.normal(100, 10, 40_000), rng.normal(300, 50, 5_000), rng.exponential(20, 15_000)]
+    merged = TDigest.from_values(parts[0])
+    for part in parts[1:]:
+        merged = merged.merge(TDigest.from_values(part))
+    values = np.concatenate(parts)
+    assert merged.n == len(values)
+    assert len(merged.means) <= merged.compression
+    for q in QUANTILES:
+        assert _rank_error(values, merged.quantile(q), q) < 0.01
+
+
+def test_rank_and_count_outside():
+    values = np.random.default_rng(2).normal(0, 1, 50_000)
+    digest = TDigest.from_values(values)
+    for x in [-2.0, -0.5, 0.0, 1.3]:
+        assert digest.rank(x) == pytest.approx((values < x).sum(), abs=0.005 * len(values))
+    assert digest.rank(values.min()) == 0
+    assert digest.rank(values.max() + 1) == len(values)
+    outside = ((values < -1.5) | (values > 1.5)).sum()
+    assert digest.count_outside(-1.5, 1.5) == pytest.approx(outside, abs=0.005 * len(values))
+
+
+def test_rank_counts_half_of_the_ties():
+    # Coluna discreta: o valor repetido fica no meio dos seus empates
+    values = np.repeat([1.0, 2.0, 3.0], [1_000, 3_000, 1_000])
+    digest = TDigest.from_values(values)
+    assert digest.rank(2.0) == pytest.approx(1_000 + 3_000 / 2, rel=0.02)
+    assert digest.rank(3.0) == pytest.approx(4_000 + 1_000 / 2, rel=0.02)
+
+
+def test_grouped_matches_one_digest_per_group():
+    rng = np.random.default_rng(3)
+    codes = rng.integers(-1, 3, 20_000)
+    values = rng.gamma(2, 50, len(codes))
+    values[::97] = np.nan
+    sketches = TDigest.grouped(codes, values, 4)
+    for g in range(3):
+        group = values[(codes == g) & ~np.isnan(values)]
+        assert sketches[g].n == len(group)
+        assert sketches[g].quantile(0.5) == pytest.approx(np.median(group), rel=0.02)
+    assert sketches[3].n == 0
+    assert np.isnan(sketches[3].quantile(0.5))
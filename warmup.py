@@ -0,0 +1,163 @@
+"""
+Aquecimento dos caches antes de o dashboard receber visitantes.
+
+Executa, sem navegador, cada aba das páginas "Análise de Dados" e
+"Dashboard" com os filtros padrão (streamlit.testing.AppTest). Isso grava o
+cache Parquet do CSV (e, conforme a configuração, o dataset particionado e as
+colunas mapeadas) e preenche o cache de resultados compartilhado
+(analytics.result_cache) com as tabelas, testes, agregados e figuras que o
+primeiro visitante pediria. Ao terminar, grava o arquivo de prontidão.
+
+O aquecimento roda em outro processo: os objetos em st.cache_resource do
+servidor (DataFrame, cubos, índices) continuam frios e são montados na
+primeira visita, a partir dos arquivos já gravados. O que chega ao servidor
+é o cache de resultados; por isso, com ele desativado, o aquecimento falha
+e a prontidão nunca é reportada.
+
+Uso (na raiz do repositório):
+
+    python warmup.py                 # aquece e grava o arquivo de prontidão
+    python warmup.py --check         # 0 se pronto, 1 caso contrário
+    python warmup.py --check --url http://localhost:8501/_stcore/health
+
+No contêiner, o aquecimento roda em segundo plano enquanto o servidor sobe e
+o HEALTHCHECK só reporta saudável quando o aquecimento terminou sem erro e o
+servidor responde.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger("warmup")
+
+ROOT = Path(__file__).resolve().parent
+READY_FILE_ENV = "DASHBOARD_READY_FILE"
+DEFAULT_READY_FILE = Path(tempfile.gettempdir()) / "dashboard.ready"
+
+# (página, item do menu lateral, chave do seletor de abas)
+PAGES = [
+    ("pages/4_Analise_de_dados.py", "Análise de Dados", "data_analysis_tab"),
+    ("pages/5_Analise_Estatistica.py", "Dashboard", "statistical_analysis_tab"),
+]
+
+
+def ready_file_path():
+    return Path(os.environ.get(READY_FILE_ENV, DEFAULT_READY_FILE))
+
+
+def warm_page(path, menu_choice, tabs_key, timeout):
+    """
+    Executa a página e cada uma das abas; devolve o tempo de cada execução
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / path), default_timeout=timeout)
+    at.session_state["menu_choice"] = menu_choice
+    start = time.perf_counter()
+    at.run()
+    _check(at, path, "(carregamento)")
+    timings = {"(carregamento)": time.perf_counter() - start}
+    for tab in at.radio(key=tabs_key).options:
+        start = time.perf_counter()
+        at.radio(key=tabs_key).set_value(tab).run()
+        _check(at, path, tab)
+        timings[tab] = time.perf_counter() - start
+    return timings
+
+
+def _check(at, path, step):
+    if at.exception:
+        raise RuntimeError(f"{path} / {step}: {at.exception[0].value}")
+
+
+def warm_up(ready_file, timeout=600):
+    ready_file.unlink(missing_ok=True)
+    os.chdir(ROOT)
+
+    from analytics.data import load_fingerprint, result_cache
+
+    if not result_cache().enabled:
+        # Sem ele nada do que é calculado aqui chega ao processo do servidor
+        raise RuntimeError("Cache de resultados desativado (DASHBOARD_RESULT_CACHE=off): aquecimento sem efeito no servidor")
+
+    start = time.perf_counter()
+    pages = {}
+    for path, menu_choice, tabs_key in PAGES:
+        timings = warm_page(path, menu_choice, tabs_key, timeout)
+        pages[path] = {tab: round(seconds, 3) for tab, seconds in timings.items()}
+        logger.info("%s aquecida em %.1f s", path, sum(timings.values()))
+
+    status = {
+        "seconds": round(time.perf_counter() - start, 3),
+        "fingerprint": load_fingerprint(),
+        "pages": pages,
+    }
+    write_status(ready_file, status)
+    return status
+
+
+def write_status(ready_file, status):
+    status = {"finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), **status}
+    # Gravação atômica: quem verifica nunca lê um arquivo pela metade
+    tmp_file = ready_file.with_name(f".{ready_file.name}.tmp")
+    tmp_file.write_text(json.dumps(status, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_file, ready_file)
+
+
+def is_ready(ready_file, url=None, timeout=2.0):
+    """
+    Pronto quando o aquecimento terminou sem erro e, se `url` for informada,
+    o servidor responde a ela
+    """
+    try:
+        status = json.loads(ready_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if "error" in status:
+        return False
+    if url is None:
+        return True
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="só verifica a prontidão (código de saída 0/1)")
+    parser.add_argument("--url", help="endereço de saúde do servidor verificado junto com --check")
+    parser.add_argument("--ready-file", type=Path, default=None, help=f"padrão: ${READY_FILE_ENV} ou {DEFAULT_READY_FILE}")
+    parser.add_argument("--timeout", type=float, default=600, help="tempo máximo por execução de página (s)")
+    args = parser.parse_args(argv)
+    ready_file = args.ready_file or ready_file_path()
+
+    if args.check:
+        return 0 if is_ready(ready_file, args.url) else 1
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    # Avisos do Streamlit sobre execução fora do servidor não interessam aqui
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+    try:
+        status = warm_up(ready_file, args.timeout)
+    except Exception as exc:
+        # O erro fica no arquivo de status e --check passa a falhar: o
+        # contêiner é reportado como não saudável
+        logger.exception("Falha no aquecimento dos caches")
+        write_status(ready_file, {"error": str(exc)})
+        return 1
+    logger.info("Caches aquecidos em %.1f s; pronto (%s)", status["seconds"], ready_file)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())